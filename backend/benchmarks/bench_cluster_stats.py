@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Run from the backend directory: python benchmarks/bench_cluster_stats.py [rows]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from train import cluster_statistics
+
+def masked_statistics(scaled_features, labels, centers):
+    """The previous implementation: one boolean mask and copy per cluster"""
+    stats = []
+    for i, center in enumerate(centers):
+        cluster_samples = scaled_features[labels == i]
+        stats.append({
+            'size': int(cluster_samples.shape[0]),
+            'std_dev': np.std(cluster_samples, axis=0).tolist(),
+            'mean': np.mean(cluster_samples, axis=0).tolist(),
+            'median': np.median(cluster_samples, axis=0).tolist(),
+            'compactness': float(np.mean(np.linalg.norm(cluster_samples - center, axis=1)))
+        })
+    return stats
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+def run_benchmark(n_rows=200_000, n_features=14, cluster_counts=(25, 100, 400)):
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(n_rows, n_features))
+    results = []
+    for n_clusters in cluster_counts:
+        centers = rng.normal(size=(n_clusters, n_features))
+        labels = rng.integers(0, n_clusters, size=n_rows)
+        expected, masked_seconds = timed(masked_statistics, features, labels, centers)
+        grouped, grouped_seconds = timed(cluster_statistics, features, labels, centers)
+        assert all(np.allclose(a['mean'], b['mean']) and a['median'] == b['median'] for a, b in zip(expected, grouped))
+        results.append({'n_clusters': n_clusters, 'masked_seconds': masked_seconds,
+                        'grouped_seconds': grouped_seconds, 'speedup': masked_seconds / grouped_seconds})
+    return results
+
+if __name__ == "__main__":
+    for row in run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000):
+        print(f"k={row['n_clusters']:4}  masked {row['masked_seconds']:6.2f}s  grouped {row['grouped_seconds']:6.2f}s  "
+              f"speedup {row['speedup']:.1f}x")
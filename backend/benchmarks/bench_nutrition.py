@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# Run from the backend directory: python benchmarks/bench_nutrition.py [rows]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from preprocess import extract_numeric, normalize_nutrition_data
+
+COLUMNS = ['calories', 'total_fat', 'cholesterol', 'sodium', 'fiber', 'protein', 'carbohydrate']
+
+def synthetic_nutrition(n_rows, decimals=1, seed=0):
+    """Nutrition table shaped like data/nutrition.csv: integer calories, unit strings elsewhere
+
+    decimals controls how many distinct strings a column has; nutrition dumps
+    round to 0.1 g, more decimals approach one distinct string per row.
+    """
+    rng = np.random.default_rng(seed)
+
+    def grams(scale, unit='g'):
+        values = np.char.mod(f'%.{decimals}f{unit}', rng.uniform(0, scale, n_rows)).astype(object)
+        values[rng.random(n_rows) < 0.01] = np.nan  # missing cells
+        values[rng.random(n_rows) < 0.005] = 'n/a'  # no number -> 0
+        return values
+
+    return pd.DataFrame({
+        'name': np.char.mod('food %d', np.arange(n_rows)),
+        'calories': rng.integers(0, 900, n_rows),
+        'total_fat': grams(40),
+        'cholesterol': grams(300, 'mg'),
+        'sodium': grams(2000, ' mg'),
+        'fiber': grams(10, ' g'),
+        'protein': grams(60),
+        'carbohydrate': grams(90)
+    })
+
+def normalize_with_apply(nutrition_df):
+    """The previous implementation: extract_numeric on every cell"""
+    for col in COLUMNS:
+        nutrition_df[col] = nutrition_df[col].apply(extract_numeric)
+    return nutrition_df
+
+def timed(func, frame):
+    started = time.perf_counter()
+    result = func(frame.copy())
+    return result, time.perf_counter() - started
+
+def run_benchmark(n_rows=1_000_000, decimals=1):
+    frame = synthetic_nutrition(n_rows, decimals)
+    expected, apply_seconds = timed(normalize_with_apply, frame)
+    result, vectorized_seconds = timed(normalize_nutrition_data, frame)
+    pd.testing.assert_frame_equal(result[COLUMNS], expected[COLUMNS])
+
+    cells = n_rows * len(COLUMNS)
+    return {
+        'rows': n_rows,
+        'distinct_strings': int(sum(frame[col].nunique() for col in COLUMNS[1:])),
+        'apply_seconds': apply_seconds,
+        'vectorized_seconds': vectorized_seconds,
+        'apply_cells_per_second': cells / apply_seconds,
+        'vectorized_cells_per_second': cells / vectorized_seconds,
+        'speedup': apply_seconds / vectorized_seconds
+    }
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # Typical rounding, then a near worst case with almost every string distinct
+    for decimals in (1, 6):
+        print(f"--- {decimals} decimal(s)")
+        results = run_benchmark(n_rows, decimals)
+        for name, value in results.items():
+            print(f"{name}: {value:,.2f}" if isinstance(value, float) else f"{name}: {value:,}")
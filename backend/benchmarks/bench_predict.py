@@ -0,0 +1,48 @@
+import os
+import sys
+import timeit
+import joblib
+import numpy as np
+import pandas as pd
+
+# Run from the backend directory: python benchmarks/bench_predict.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.predictor import CentroidPredictor
+
+def sample_features(scaler, n, seed=0):
+    """Random raw feature rows spread around the training distribution"""
+    rng = np.random.default_rng(seed)
+    return rng.normal(scaler.mean_, scaler.scale_ * 1.5 + 0.1, size=(n, len(scaler.mean_)))
+
+def best_of(func, number, repeat=5):
+    """Best time per call in microseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+def run_benchmark(batch_size=1000):
+    model = joblib.load('models/model.pkl')
+    scaler = joblib.load('models/scaler.pkl')
+    feature_names = scaler.feature_names_in_.tolist()
+    predictor = CentroidPredictor.from_sklearn(model, scaler)
+
+    rows = sample_features(scaler, batch_size)
+    one = rows[0].tolist()
+    frame = pd.DataFrame(rows, columns=feature_names)
+
+    # Same assignments as the DataFrame / scaler.transform / KMeans.predict path
+    expected = model.predict(scaler.transform(frame))
+    agreement = float((predictor.predict(rows) == expected).mean())
+
+    results = {
+        'single_sklearn_us': best_of(lambda: model.predict(scaler.transform(pd.DataFrame([one], columns=feature_names)))[0], 200),
+        'single_predictor_us': best_of(lambda: predictor.predict_one(one), 20000),
+        f'batch{batch_size}_sklearn_us': best_of(lambda: model.predict(scaler.transform(frame)), 50),
+        f'batch{batch_size}_predictor_us': best_of(lambda: predictor.predict(rows), 500),
+        'agreement': agreement
+    }
+    return results
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    for name, value in results.items():
+        print(f"{name}: {value:.3f}" if name == 'agreement' else f"{name}: {value:.1f}")
+    print(f"single speedup: {results['single_sklearn_us'] / results['single_predictor_us']:.0f}x")
@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import subprocess
+
+# Run from the backend directory: python benchmarks/cold_start.py
+# Each route is measured in a fresh interpreter, like a serverless cold start.
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BUDGET_PATH = os.path.join(os.path.dirname(__file__), 'cold_start_budget.json')
+
+PROBE = r'''
+import sys, time, json
+started = time.perf_counter()
+from src.app import app
+from src import resources
+imported = time.perf_counter()
+body = {'email': 'cold-start@example.com', 'password': 'cold-start'} if sys.argv[2] == 'POST' else None
+response = app.test_client().open(sys.argv[1], method=sys.argv[2], json=body)
+finished = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'first_request_ms': (finished - imported) * 1000,
+    'status': response.status_code,
+    'initialized': [lazy.name for lazy in vars(resources).values()
+                    if isinstance(lazy, resources.Lazy) and lazy.loaded],
+    'modules': [name for name in ('numpy', 'pandas', 'sklearn', 'joblib', 'firebase_admin') if name in sys.modules]
+}))
+'''
+
+ROUTES = [('/', 'GET'), ('/logout', 'POST'), ('/login', 'POST')]
+
+def measure(route, method):
+    """Import and first-request timings for one route in a fresh process"""
+    output = subprocess.run([sys.executable, '-c', PROBE, route, method], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def check_budget(results, budget):
+    """Budget violations as readable strings"""
+    failures = []
+    for route, result in results.items():
+        limits = budget.get(route, budget['default'])
+        for key in ('import_ms', 'first_request_ms'):
+            if result[key] > limits[key]:
+                failures.append(f"{route}: {key} {result[key]:.0f} > {limits[key]}")
+        unexpected = [name for name in result['initialized'] if name not in limits.get('allowed', [])]
+        if unexpected:
+            failures.append(f"{route}: initialized {', '.join(unexpected)}")
+        heavy = [name for name in result['modules'] if name not in limits.get('modules', [])]
+        if heavy:
+            failures.append(f"{route}: imported {', '.join(heavy)}")
+    return failures
+
+if __name__ == "__main__":
+    with open(BUDGET_PATH) as f:
+        budget = json.load(f)
+    results = {route: measure(route, method) for route, method in ROUTES}
+    for route, result in results.items():
+        print(f"{route:10} import {result['import_ms']:7.1f} ms  first request {result['first_request_ms']:7.1f} ms  "
+              f"status {result['status']}  initialized {result['initialized'] or '-'}  modules {result['modules'] or '-'}")
+    failures = check_budget(results, budget)
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    sys.exit(1 if failures else 0)
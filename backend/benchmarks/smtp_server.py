@@ -0,0 +1,120 @@
+import argparse
+import base64
+import threading
+import socketserver
+
+# Local SMTP stand-in for development and tests: accepts any login, keeps the
+# messages it receives in memory and (from the command line) prints them.
+#
+#   python -m benchmarks.smtp_server --port 1025
+#   SMTP_HOST=localhost SMTP_PORT=1025 SMTP_STARTTLS=0 flask run
+#
+# It speaks plain SMTP only (no STARTTLS), which is why SMTP_STARTTLS=0.
+
+
+class _Session(socketserver.StreamRequestHandler):
+    def reply(self, *lines):
+        *first, last = lines
+        self.wfile.write(''.join([f'{line[:3]}-{line[4:]}\r\n' for line in first] + [f'{last}\r\n']).encode())
+
+    def read_data(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b'.\r\n', b'.\n'):
+                return b''.join(lines)
+            lines.append(line[1:] if line.startswith(b'..') else line)
+
+    def handle(self):
+        self.reply('220 localhost fitgen SMTP stand-in')
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command, _, arg = line.decode('utf-8', 'replace').rstrip('\r\n').partition(' ')
+            command = command.upper()
+            if command == 'EHLO':
+                self.reply('250 localhost', '250 AUTH PLAIN', '250 8BITMIME')
+            elif command == 'HELO':
+                self.reply('250 localhost')
+            elif command == 'AUTH':
+                mechanism, _, credentials = arg.partition(' ')
+                if mechanism.upper() == 'PLAIN' and credentials:
+                    self.server.logins.append(base64.b64decode(credentials).split(b'\0')[1].decode())
+                self.reply('235 Authentication successful')
+            elif command == 'MAIL':
+                sender, recipients = arg.partition(':')[2].strip().strip('<>'), []
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                recipients.append(arg.partition(':')[2].strip().strip('<>'))
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                self.server.received(sender, recipients, self.read_data().decode('utf-8', 'replace'))
+                self.reply('250 OK')
+            elif command in ('RSET', 'NOOP'):
+                if command == 'RSET':
+                    sender, recipients = None, []
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """SMTP server on localhost that records (sender, recipients, message) tuples"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, port=0, verbose=False):
+        super().__init__(('127.0.0.1', port), _Session)
+        self.verbose = verbose
+        self.messages = []
+        self.logins = []
+        self.sessions = 0
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def process_request(self, request, client_address):
+        self.sessions += 1
+        super().process_request(request, client_address)
+
+    def received(self, sender, recipients, message):
+        self.messages.append((sender, recipients, message))
+        if self.verbose:
+            print(f"--- from {sender} to {', '.join(recipients)}\n{message}", flush=True)
+
+    def start(self):
+        """Serve from a background thread; returns self"""
+        self._thread = threading.Thread(target=self.serve_forever, name='smtp-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local SMTP stand-in that prints received messages')
+    parser.add_argument('--port', type=int, default=1025)
+    args = parser.parse_args()
+    server = LocalSMTPServer(args.port, verbose=True)
+    print(f"SMTP stand-in listening on 127.0.0.1:{server.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+import uuid
+import itertools
+from datetime import datetime, timezone
+
+# In-process stand-ins for Firestore and SMTP, so benchmarks exercise the app's
+# own code without network calls. They cover the calls src/app.py makes, not
+# the whole client APIs.
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return self._data.get(field)
+
+
+class FakeDocument:
+    def __init__(self, collection, doc_id):
+        self.collection = collection
+        self.id = doc_id
+        self.path = f'{collection.name}/{doc_id}'
+
+    def get(self, field_paths=None):
+        self.collection.db.document_reads += 1
+        return self.snapshot(field_paths)
+
+    def snapshot(self, field_paths=None):
+        data = self.collection.docs.get(self.id)
+        if data is not None and field_paths is not None:
+            data = {field: data[field] for field in field_paths if field in data}
+        return FakeSnapshot(self, data)
+
+    def set(self, data, merge=False):
+        current = self.collection.docs.get(self.id, {}) if merge else {}
+        self.collection.docs[self.id] = self.collection.db.resolve(dict(current, **data))
+
+    def update(self, data):
+        if self.id not in self.collection.docs:
+            raise KeyError(f"No document to update: {self.path}")
+        self.collection.docs[self.id].update(self.collection.db.resolve(data))
+
+    def delete(self):
+        self.collection.docs.pop(self.id, None)
+
+
+class FakeQuery:
+    def __init__(self, collection, filters=(), order=None, limit=None, fields=None, after=None):
+        self.collection = collection
+        self.filters = filters
+        self.order = order
+        self._limit = limit
+        self.fields = fields
+        self.after = after
+
+    def _with(self, **changes):
+        state = dict(filters=self.filters, order=self.order, limit=self._limit, fields=self.fields, after=self.after)
+        state.update(changes)
+        return FakeQuery(self.collection, **state)
+
+    def where(self, field, op, value):
+        if op != '==':
+            raise NotImplementedError(op)
+        return self._with(filters=self.filters + ((field, value),))
+
+    def order_by(self, field, direction='ASCENDING'):
+        return self._with(order=(field, direction))
+
+    def limit(self, count):
+        return self._with(limit=count)
+
+    def select(self, field_paths):
+        return self._with(fields=list(field_paths))
+
+    def start_after(self, snapshot):
+        return self._with(after=snapshot.id)
+
+    def stream(self):
+        docs = [(doc_id, data) for doc_id, data in self.collection.docs.items()
+                if all(data.get(field) == value for field, value in self.filters)]
+        if self.order:
+            field, direction = self.order
+            key = (lambda item: item[0]) if field == '__name__' else (lambda item: item[1].get(field))
+            docs.sort(key=key, reverse=direction == 'DESCENDING')
+        if self.after is not None:
+            ids = [doc_id for doc_id, _ in docs]
+            docs = docs[ids.index(self.after) + 1:] if self.after in ids else []
+        for doc_id, data in itertools.islice(docs, self._limit):
+            if self.fields is not None:
+                data = {field: data[field] for field in self.fields if field in data}
+            yield FakeSnapshot(FakeDocument(self.collection, doc_id), data)
+
+    def get(self):
+        return list(self.stream())
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.docs = {}
+        super().__init__(self)
+
+    def document(self, doc_id=None):
+        return FakeDocument(self, doc_id or uuid.uuid4().hex[:20])
+
+    def add(self, data):
+        reference = self.document()
+        reference.set(data)
+        return datetime.now(timezone.utc), reference
+
+
+class FakeBatch:
+    def __init__(self):
+        self.operations = []
+
+    def set(self, reference, data, merge=False):
+        self.operations.append(lambda: reference.set(data, merge))
+
+    def update(self, reference, data):
+        self.operations.append(lambda: reference.update(data))
+
+    def delete(self, reference):
+        self.operations.append(reference.delete)
+
+    def commit(self):
+        for operation in self.operations:
+            operation()
+        self.operations = []
+
+
+class FakeFirestore:
+    """Dict-backed Firestore client; SERVER_TIMESTAMP sentinels become the current time
+
+    Counts single document reads and records each get_all as (ids, field_paths),
+    so tests can check how a route reads.
+    """
+
+    def __init__(self, server_timestamp=None):
+        self.collections = {}
+        self.server_timestamp = server_timestamp
+        self.document_reads = 0
+        self.batched_reads = []
+
+    def collection(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self, name)
+        return self.collections[name]
+
+    def batch(self):
+        return FakeBatch()
+
+    def get_all(self, references, field_paths=None):
+        references = list(references)
+        self.batched_reads.append(([reference.id for reference in references], field_paths))
+        return [reference.snapshot(field_paths) for reference in references]
+
+    def resolve(self, data):
+        if self.server_timestamp is None:
+            return data
+        return {key: datetime.now(timezone.utc) if value is self.server_timestamp else value
+                for key, value in data.items()}
+
+
+class FakeSMTP:
+    """smtplib.SMTP replacement that records messages instead of sending them"""
+
+    sent = []
+
+    def __init__(self, host='', port=0, *args, **kwargs):
+        self.host = host
+        self.port = port
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.quit()
+
+    def ehlo(self, *args):
+        return 250, b'ok'
+
+    def starttls(self, *args, **kwargs):
+        return 220, b'ok'
+
+    def login(self, user, password):
+        return 235, b'ok'
+
+    def sendmail(self, from_addr, to_addrs, msg, *args, **kwargs):
+        FakeSMTP.sent.append((from_addr, to_addrs, msg))
+        return {}
+
+    def send_message(self, msg, from_addr=None, to_addrs=None, *args, **kwargs):
+        FakeSMTP.sent.append((from_addr or msg['From'], to_addrs or msg['To'], msg.as_string()))
+        return {}
+
+    def noop(self):
+        return 250, b'ok'
+
+    def quit(self):
+        return 221, b'bye'
+
+    def close(self):
+        pass
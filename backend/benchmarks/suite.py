@@ -0,0 +1,230 @@
+import os
+import sys
+import io
+import json
+import time
+import shutil
+import logging
+import smtplib
+import platform
+import argparse
+import contextlib
+import tempfile
+
+# Run from the backend directory: python benchmarks/suite.py [--update-baseline]
+#
+# Times the hot paths (preprocessing, training, prediction, plan generation and
+# the /generate route) against local data, with the Firestore client and SMTP
+# replaced by the in-process stand-ins in benchmarks/standins.py. Results are
+# compared with benchmarks/baseline.json and the script exits non-zero when a
+# benchmark is slower than baseline times the tolerance (see compare).
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))  # train.py and preprocess.py use flat imports
+sys.path.insert(0, BENCHMARK_DIR)
+
+from standins import FakeFirestore, FakeSMTP
+
+DATA_PATHS = ('data/bmi.csv', 'data/mealplans.csv', 'data/nutrition.csv', 'data/workouts.csv')
+NUTRITION_ROWS = 8789  # size of the published nutrition dataset
+PREDICT_BATCH_SIZE = 1000
+TOLERANCE = 2.0
+
+SAMPLE_FORM = {
+    'weight_in_kg': '82', 'height_in_cm': '178', 'age': '34', 'days_per_week': '4', 'sleep_hours': '7',
+    'intensity': '2', 'exercise_type': '1', 'calorie_target': '2400', 'macro_preference': 'high_protein',
+    'diet_type': 'balanced', 'equipment': 'dumbbell', 'fitness_level': '2', 'meals_per_day': '3'
+}
+
+
+def prepare_workspace(directory):
+    """Copy the local datasets into directory, synthesizing the ones missing from the checkout
+
+    train_model, the registry and the app's caches use paths relative to the
+    working directory, so running from here keeps models/ and cache/ untouched.
+    """
+    os.makedirs(os.path.join(directory, 'data'), exist_ok=True)
+    synthesized = []
+    for path in DATA_PATHS:
+        source = os.path.join(BACKEND_DIR, path)
+        target = os.path.join(directory, path)
+        if os.path.exists(source):
+            shutil.copyfile(source, target)
+        elif path.endswith('nutrition.csv'):
+            from bench_nutrition import synthetic_nutrition
+            synthetic_nutrition(NUTRITION_ROWS).to_csv(target, index=False)
+            synthesized.append(path)
+        else:
+            # Loaded by preprocess_data but not used for features
+            with open(target, 'w') as f:
+                f.write('meal_id,name\n0,placeholder\n')
+            synthesized.append(path)
+    return synthesized
+
+
+def timed(func, repeat, number=1, warmup=1):
+    """Wall time per call in ms: repeat samples, each averaging number calls, after warmup calls
+
+    Sub-millisecond paths use number > 1 so a sample is long enough to be stable.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) * 1000 / number)
+    samples.sort()
+    return {
+        'median_ms': samples[len(samples) // 2],
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'min_ms': samples[0],
+        'repeat': repeat,
+        'number': number
+    }
+
+
+def install_standins():
+    """Point the app at the Firestore and SMTP stand-ins; returns the fake database"""
+    from src import resources
+    smtplib.SMTP = FakeSMTP  # src.mailer looks it up when it connects
+    resources.firebase_app.set(object())  # get_auth() must not initialize Firebase
+    db = FakeFirestore(resources.server_timestamp())
+    resources.firestore_db.set(db)
+    return db
+
+
+def run_suite(scale=1):
+    """Run every benchmark once; scale multiplies the repeat counts"""
+    from preprocess import preprocess_data
+    from train import train_model
+
+    results = {}
+    results['preprocess_uncached'] = timed(lambda: preprocess_data(*DATA_PATHS, cache_dir=None), 3 * scale)
+    results['preprocess_cached'] = timed(lambda: preprocess_data(*DATA_PATHS), 10 * scale)
+    # Trains, saves models/ and publishes a registry version the app then serves;
+    # KMeans(verbose=1) progress output is dropped
+    with contextlib.redirect_stdout(io.StringIO()):
+        results['train_model'] = timed(train_model, 3 * scale, warmup=0)
+
+    # Keep the log file (logging is part of the request cost) but not console output
+    os.environ['FITGEN_LOG_CONSOLE'] = '0'
+    from src.app import create_app, process_form_data, generate_workout_plan, generate_nutrition_plan
+    from src.resources import get_model_registry
+    logging.getLogger('workout_app').propagate = False  # train.py configures the root logger
+    db = install_standins()
+
+    import numpy as np
+    model = get_model_registry().active()
+    rng = np.random.default_rng(0)
+    rows = rng.normal(model.scaler_mean, np.asarray(model.scaler_scale) * 1.5 + 0.1,
+                      size=(PREDICT_BATCH_SIZE, len(model.feature_names)))
+    one = rows[0].tolist()
+    results['predict_one'] = timed(lambda: model.predictor.predict_one(one), 20 * scale, number=1000, warmup=10)
+    results[f'predict_batch{PREDICT_BATCH_SIZE}'] = timed(lambda: model.predictor.predict(rows), 20 * scale, number=50, warmup=5)
+
+    user_data = process_form_data(SAMPLE_FORM)
+    results['generate_workout_plan'] = timed(lambda: generate_workout_plan(user_data), 20 * scale, number=20, warmup=3)
+    results['generate_nutrition_plan'] = timed(lambda: generate_nutrition_plan(user_data), 20 * scale, number=100, warmup=3)
+
+    client = create_app({'TESTING': True}).test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 'benchmark-user'
+
+    def generate():
+        response = client.post('/generate', json=SAMPLE_FORM)
+        if response.status_code != 200:
+            raise RuntimeError(f"/generate returned {response.status_code}: {response.get_data(as_text=True)}")
+
+    results['generate_route'] = timed(generate, 20 * scale, number=5, warmup=3)
+    results['generate_route']['plans_stored'] = len(db.collection('plans').docs)
+    return results
+
+
+def machine_info():
+    import numpy as np
+    import pandas as pd
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regressions as readable strings
+
+    A benchmark regresses when both its median and its fastest sample are
+    slower than the baseline's times tolerance, so one noisy sample on a
+    shared machine does not fail the run.
+    """
+    failures = []
+    for name, expected in baseline.get('results', {}).items():
+        if name not in results:
+            failures.append(f"{name}: missing from this run")
+            continue
+        result = results[name]
+        if all(result[key] > expected[key] * tolerance for key in ('median_ms', 'min_ms')):
+            failures.append(f"{name}: median {result['median_ms']:.3f} ms, min {result['min_ms']:.3f} ms "
+                            f"> baseline {expected['median_ms']:.3f} ms, {expected['min_ms']:.3f} ms x {tolerance}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the training and plan generation hot paths')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON to compare with or update')
+    parser.add_argument('--update-baseline', action='store_true', help='write this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, help=f'allowed slowdown ratio (default: baseline or {TOLERANCE})')
+    parser.add_argument('--scale', type=int, default=1, help='multiply the repeat counts')
+    parser.add_argument('--output', help='also write this run as JSON')
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp(prefix='fitgen-bench-')
+    previous_dir = os.getcwd()
+    try:
+        synthesized = prepare_workspace(workspace)
+        os.chdir(workspace)
+        results = run_suite(args.scale)
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    run = {'machine': machine_info(), 'synthesized_data': synthesized, 'results': results}
+    for name, result in results.items():
+        print(f"{name:28} median {result['median_ms']:10.3f} ms  p95 {result['p95_ms']:10.3f} ms  "
+              f"min {result['min_ms']:10.3f} ms  ({result['repeat']} x {result['number']} calls)")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+
+    if args.update_baseline:
+        run['tolerance'] = args.tolerance or TOLERANCE
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    if baseline.get('machine', {}).get('cpu_count') != run['machine']['cpu_count']:
+        print("Note: baseline was recorded on a different machine; compare with care")
+    failures = compare(results, baseline, args.tolerance or baseline.get('tolerance', TOLERANCE))
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,14 @@
-import pandas as pd
-import json
-import numpy as np
-
-# Read the workouts CSV
-workouts_df = pd.read_csv('data/workouts.csv')
-
-# Replace NaN values with None (which becomes null in JSON)
-workouts_df = workouts_df.replace({np.nan: None})
-
-# Convert to JSON
-workouts_json = workouts_df.to_dict('records')
-
-# Save to JSON file
-with open('../frontend/src/data/workouts.json', 'w') as f:
-    json.dump(workouts_json, f, indent=2)
-
-print(f"Converted {len(workouts_json)} workouts to JSON")
+import sys
+import logging
+from src.frontend_export import WORKOUT_SHARD_DIR, export_workouts
+
+# Run from the backend directory: python convert_workouts.py [--force]
+# Writes minified workout shards (one per equipment and level) for the frontend;
+# nothing is rewritten while data/workouts.csv is unchanged.
+logging.basicConfig(level=logging.INFO)
+
+shards = export_workouts(force='--force' in sys.argv[1:])
+if shards is None:
+    print(f"Workout shards in {WORKOUT_SHARD_DIR} are up to date")
+else:
+    print(f"Converted workouts into {len(shards)} shards ({sum(shards.values())} rows) in {WORKOUT_SHARD_DIR}")
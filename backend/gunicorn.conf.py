@@ -0,0 +1,22 @@
+import os
+from src.shared_state import build_from_artifacts
+
+# The master builds the model and workout catalog arrays once; workers import
+# src.app, see FITGEN_SHARED_STATE and memory-map the files instead of loading
+# their own copies.
+shared_state_dir = os.getenv(
+    'FITGEN_SHARED_STATE', '/dev/shm/fitgen-state' if os.path.isdir('/dev/shm') else 'shared_state'
+)
+os.environ['FITGEN_SHARED_STATE'] = shared_state_dir
+
+wsgi_app = 'wsgi:app'
+workers = int(os.getenv('WEB_CONCURRENCY', 16))
+preload_app = False
+
+
+def on_starting(server):
+    build_from_artifacts(shared_state_dir)
+
+
+def on_reload(server):
+    build_from_artifacts(shared_state_dir)
@@ -1,146 +1,93 @@
-from flask import Flask, request, redirect, url_for, session, jsonify, make_response
+# Must run before the imports below so FITGEN_PROFILE_STARTUP can time them
+from src import startup_profile
+startup_profile.install_from_env()
+
+from flask import Flask, Blueprint, request, redirect, url_for, session, jsonify, make_response
 from flask_cors import CORS
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-import joblib
 import os
-import firebase_admin
-from firebase_admin import credentials, firestore, auth
 from dotenv import load_dotenv
 from werkzeug.security import generate_password_hash, check_password_hash
 import logging
-from logging.handlers import RotatingFileHandler
-import smtplib
-from email.mime.text import MIMEText
-from flask_mail import Mail, Message
+from src.resources import (get_store, get_plan_writer, get_outbox, get_auth, server_timestamp, get_catalog, get_model_registry,
+                           user_names)
+from src.plan_codec import (PLAN_FORMAT, encode_workout_plan, hydrate_workout_plan, workout_overview,
+                            encode_nutrition_plan, hydrate_nutrition_plan, hydrate_plan)
+from src import coach_index, log_setup
+from src.storage import MissingIndexError
+from src.planner import MACRO_RATIOS, new_seed, seeded_uniforms, schedule_days, nutrition_targets
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app, supports_credentials=True, origins=['http://localhost:3000'], allow_headers=['Content-Type', 'Authorization'])
-app.config['JSON_AS_ASCII'] = False
-app.secret_key = os.getenv('SECRET_KEY', 'your_secret_key')
-
-# Configure Flask-Mail
-app.config['MAIL_SERVER'] = 'smtp.gmail.com'
-app.config['MAIL_PORT'] = 587
-app.config['MAIL_USE_TLS'] = True
-app.config['MAIL_USERNAME'] = os.getenv('SMTP_EMAIL')
-app.config['MAIL_PASSWORD'] = os.getenv('SMTP_PASSWORD')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('SMTP_EMAIL')
-mail = Mail(app)
-
-# Configure logging
-log_dir = 'logs'
-os.makedirs(log_dir, exist_ok=True)
+# Routes live on a blueprint; create_app() builds the Flask app around it.
+# Firebase, the model and the workout catalog are initialized on first use
+# (src/resources.py), so importing this module stays cheap.
+api = Blueprint('api', __name__)
+
+def create_app(config=None):
+    """Application factory"""
+    app = Flask(__name__)
+    CORS(app, supports_credentials=True, origins=['http://localhost:3000'], allow_headers=['Content-Type', 'Authorization'])
+    app.config['JSON_AS_ASCII'] = False
+    app.secret_key = os.getenv('SECRET_KEY', 'your_secret_key')
+    if config:
+        app.config.update(config)
+
+    app.register_blueprint(api)
+    startup_profile.attach(app)
+    return app
+
+# Configure logging: JSON lines written by a background listener (src/log_setup.py)
 logger = logging.getLogger('workout_app')
-logger.setLevel(logging.INFO)
-
-file_handler = RotatingFileHandler(
-    os.path.join(log_dir, 'workout_app.log'), maxBytes=1024*1024, backupCount=10
-)
-console_handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
-
-# Initialize Firebase
-cred = credentials.Certificate('hdproject-6e51c-firebase-adminsdk-4e5te-d7102a3fe3.json')
-firebase_admin.initialize_app(cred)
-db = firestore.client()
-
-# Load and preprocess datasets
-bmi_df = pd.read_csv('data/bmi.csv').dropna()
-bmi_df['Bmi'] = bmi_df['Weight'] / (bmi_df['Height'] ** 2)
-bmi_df['BmiClass'] = pd.cut(bmi_df['Bmi'], bins=[0, 18.5, 24.9, 29.9, 34.9, 39.9, np.inf],
-                            labels=['Underweight', 'Normal weight', 'Overweight', 'Obese Class 1', 'Obese Class 2', 'Obese Class 3'])
-
-nutrition_df = pd.read_csv('data/nutrition.csv')
-columns_to_normalize = ['calories', 'total_fat', 'cholesterol', 'sodium', 'fiber', 'protein']
-for col in columns_to_normalize:
-    if col in nutrition_df.columns:
-        nutrition_df[col] = pd.to_numeric(nutrition_df[col], errors='coerce')
-    else:
-        logger.warning(f"Column {col} not found in nutrition_df")
-scaler = StandardScaler()
-nutrition_df[columns_to_normalize] = scaler.fit_transform(nutrition_df[columns_to_normalize].fillna(0))
-
-# Load ML model and scaler
-model = joblib.load('models/model.pkl')
-scaler = joblib.load('models/scaler.pkl')
-logger.info(f"Scaler expected feature names: {scaler.feature_names_in_}")
-
-# Define feature names based on scaler's training data
-FEATURE_NAMES = scaler.feature_names_in_.tolist() if hasattr(scaler, 'feature_names_in_') else [
-    'weight', 'height', 'age', 'bmi', 'days_per_week', 'sleep_hours', 'calories', 
-    'protein', 'carbohydrate', 'total_fat', 'fiber', 'intensity', 'exercise_type', 'rating'
-]
-
-@app.route('/')
+log_setup.configure(logger)
+
+@api.route('/')
 def home():
     logger.info("API is running")
     return jsonify({'message': 'Workout Plan API is running'})
 
-def generate_workout_plan(user_info):
+def compact_workout_plan(user_info, seed=None):
+    """Compact workout plan for one user; the same (user_info, seed) always gives the same plan"""
+    seed = new_seed() if seed is None else seed
+    catalog = get_catalog()
+    equipment, level = catalog.resolve(user_info['equipment'], user_info['fitness_level'])
+    days_per_week = int(user_info.get('days_per_week', 5))
+    fitness_level = int(user_info.get('fitness_level', 2))
+
+    day_codes = schedule_days([days_per_week], [fitness_level], seeded_uniforms([seed]))[0]
+    return encode_workout_plan(day_codes, equipment, level, user_info.get('intensity', 'moderate'), catalog)
+
+def compact_plans_enabled():
+    """Whether new plan documents are stored compactly (FITGEN_COMPACT_PLANS)
+
+    The Next.js dashboards read plan documents straight from Firestore and
+    expect full bodies, so this stays off until they hydrate compact ones.
+    """
+    return os.getenv('FITGEN_COMPACT_PLANS', '0').lower() in ('1', 'true', 'yes')
+
+def stored_plan_bodies(compact_workout, compact_nutrition, catalog, workout_plan=None, nutrition_plan=None):
+    """Plan body fields for a new plan document: compact, or hydrated (reusing bodies already expanded)"""
+    if compact_plans_enabled():
+        return {'plan_format': PLAN_FORMAT, 'workout_plan': compact_workout, 'nutrition_plan': compact_nutrition}
+    return {
+        'workout_plan': workout_plan or hydrate_workout_plan(compact_workout, catalog),
+        'nutrition_plan': nutrition_plan or hydrate_nutrition_plan(compact_nutrition)
+    }
+
+def generate_workout_plan(user_info, seed=None):
     try:
-        workouts_df = pd.read_csv('data/workouts.csv')
-        equipment_map = {
-            'none': 'Body Only', 'bands': 'Bands', 'barbell': 'Barbell', 'dumbbell': 'Dumbbell',
-            'cable': 'Cable', 'machine': 'Machine', 'kettlebell': 'Kettlebells',
-            'medicine ball': 'Medicine Ball', 'exercise ball': 'Exercise Ball'
-        }
-        level_map = {'1': 'Beginner', '2': 'Intermediate', '3': 'Expert'}
-
-        equipment = equipment_map.get(user_info['equipment'].lower(), 'Body Only')
-        level = level_map.get(str(user_info['fitness_level']), 'Intermediate')
-        days_per_week = int(user_info.get('days_per_week', 5))
-        fitness_level = int(user_info.get('fitness_level', 2))
-
-        filtered_workouts = workouts_df[
-            (workouts_df['Equipment'].str.contains(equipment, na=False)) &
-            (workouts_df['Level'] == level)
-        ]
-        workout_groups = {
-            'Cardio': filtered_workouts[filtered_workouts['Type'] == 'Cardio'].sort_values('Rating', ascending=False),
-            'Strength': filtered_workouts[filtered_workouts['Type'] == 'Strength'].sort_values('Rating', ascending=False),
-            'Flexibility': filtered_workouts[filtered_workouts['Type'].isin(['Stretching', 'Plyometrics'])].sort_values('Rating', ascending=False)
-        }
-
-        total_days = 30
-        workout_days_per_week = min(days_per_week, 7)
-        total_workout_days = (total_days / 7) * workout_days_per_week
-        total_rest_days = total_days - total_workout_days
-        total_rest_days = min(total_rest_days + 2, total_days - 5) if fitness_level == 1 else max(total_rest_days - 2, 2) if fitness_level == 3 else total_rest_days
-
-        plan = {}
-        rest_day_indices = set(np.random.choice(range(1, 31), size=int(total_rest_days), replace=False))
-        for day in range(1, 31):
-            if day in rest_day_indices:
-                plan[str(day)] = {'type': 'Rest', 'exercises': [], 'intensity': 'low', 'notes': 'Focus on recovery'}
-            else:
-                workout_type = np.random.choice(['Cardio', 'Strength', 'Flexibility'], p=[0.4, 0.4, 0.2])
-                available_exercises = workout_groups[workout_type]
-                exercises = (
-                    [{
-                        'name': str(ex['Title']), 'desc': str(ex['Desc']), 'equipment': str(ex['Equipment']),
-                        'sets': 3, 'reps': 12 if workout_type == 'Strength' else 30, 'rating': float(ex.get('Rating', 0)),
-                        'intensity': user_info.get('intensity', 'moderate')
-                    } for ex in available_exercises.head(3).to_dict('records')] if not available_exercises.empty else
-                    [{'name': f'Basic {workout_type}', 'desc': 'Bodyweight exercise', 'equipment': 'Body Only',
-                      'sets': 3, 'reps': 12, 'rating': 0, 'intensity': user_info.get('intensity', 'moderate')}]
-                )
-                plan[str(day)] = {'type': workout_type, 'exercises': exercises, 'intensity': user_info.get('intensity', 'moderate'), 'notes': 'Focus on form'}
+        plan = hydrate_workout_plan(compact_workout_plan(user_info, seed), get_catalog())
         logger.info("Workout plan generated successfully")
         return plan
     except Exception as e:
         logger.error(f"Error generating workout plan: {str(e)}")
         raise
 
+def regenerate_workout_plan(plan_data):
+    """Rebuild the workout plan of a stored plan from its user_data and seed"""
+    return generate_workout_plan(plan_data['user_data'], plan_data['seed'])
+
 def process_form_data(form_data):
     try:
         # Define required fields based on the form
@@ -158,14 +105,8 @@ def process_form_data(form_data):
         weight_kg = float(form_data['weight_in_kg'])
         bmi = weight_kg / (height_m ** 2)
 
-        # Define macro ratios (consistent with generate_nutrition_plan)
-        macro_ratios = {
-            'balanced': {'protein': 0.3, 'carbs': 0.4, 'total_fat': 0.3},
-            'high_protein': {'protein': 0.4, 'carbs': 0.4, 'total_fat': 0.2},
-            'low_carb': {'protein': 0.5, 'carbs': 0.1, 'total_fat': 0.4},
-            'high_carb': {'protein': 0.3, 'carbs': 0.5, 'total_fat': 0.2}
-        }
-        macro_pref = macro_ratios[form_data['macro_preference']]
+        # Macro ratios shared with generate_nutrition_plan
+        macro_pref = MACRO_RATIOS[form_data['macro_preference']]
 
         # Create processed_data with all required fields
         processed_data = {
@@ -189,66 +130,70 @@ def process_form_data(form_data):
             'macro_preference': form_data['macro_preference'],  # Added
             'meals_per_day': int(form_data['meals_per_day'])    # Added
         }
-        logger.info(f"Processed form data: {processed_data}")
+        logger.info("Processed form data", extra={'payload': processed_data})
         return processed_data
     except Exception as e:
         logger.error(f"Error processing form data: {str(e)}")
         raise
 
+def compact_nutrition_plan(user_data):
+    """Compact nutrition plan (daily targets) for one user"""
+    calorie_target = float(user_data['calories'])  # Use 'calories' to match processed_data
+    targets = nutrition_targets([calorie_target], [user_data['macro_preference']], [user_data['diet_type']])
+    daily_targets = {key: float(values[0]) for key, values in targets.items()}
+    # meals_per_day is already an int from process_form_data
+    return encode_nutrition_plan(daily_targets, user_data['meals_per_day'], user_data['diet_type'], user_data['macro_preference'])
+
 def generate_nutrition_plan(user_data):
     try:
-        logger.info(f"Generating nutrition plan with user_data: {user_data}")
-        diet_type = user_data['diet_type']
-        meals_per_day = user_data['meals_per_day']  # Already an int from process_form_data
-        calorie_target = float(user_data['calories'])  # Use 'calories' to match processed_data
-        macro_pref = user_data['macro_preference']
-
-        # Define macro ratios (consistent with process_form_data)
-        macro_ratios = {
-            'balanced': {'protein': 0.3, 'carbs': 0.4, 'total_fat': 0.3},
-            'high_protein': {'protein': 0.4, 'carbs': 0.4, 'total_fat': 0.2},
-            'low_carb': {'protein': 0.5, 'carbs': 0.1, 'total_fat': 0.4},
-            'high_carb': {'protein': 0.3, 'carbs': 0.5, 'total_fat': 0.2}
-        }[macro_pref]
-
-        # Calculate macronutrient targets
-        protein_target = calorie_target * macro_ratios['protein'] / 4  # 4 kcal/g for protein
-        carb_target = calorie_target * macro_ratios['carbs'] / 4       # 4 kcal/g for carbs
-        fat_target = calorie_target * macro_ratios['total_fat'] / 9    # 9 kcal/g for fat
-        fiber_target = calorie_target * (0.016 if diet_type == 'high_carb' else 0.014)
-
-        # Distribute across meals
-        meal_names = ['Breakfast', 'Lunch', 'Dinner'][:meals_per_day] if meals_per_day <= 3 else \
-                     ['Breakfast', 'Snack 1', 'Lunch', 'Snack 2', 'Dinner'][:meals_per_day]
-        meals = {
-            name: {
-                'calories': calorie_target / meals_per_day,
-                'protein': protein_target / meals_per_day,
-                'carbs': carb_target / meals_per_day,
-                'fat': fat_target / meals_per_day,
-                'fiber': fiber_target / meals_per_day
-            } for name in meal_names
-        }
-
-        # Compile nutrition plan
-        nutrition_plan = {
-            'daily_targets': {
-                'calories': calorie_target,
-                'protein': protein_target,
-                'carbs': carb_target,
-                'fat': fat_target,
-                'fiber': fiber_target
-            },
-            'meals': meals,
-            'diet_type': diet_type,
-            'macro_split': macro_ratios
-        }
+        logger.info("Generating nutrition plan", extra={'payload': user_data})
+        nutrition_plan = hydrate_nutrition_plan(compact_nutrition_plan(user_data))
         logger.info("Nutrition plan generated successfully")
         return nutrition_plan
     except Exception as e:
         logger.error(f"Error generating nutrition plan: {str(e)}")
         raise
 
+def generate_plans_batch(form_list, seeds=None):
+    """Generate plans for many users with one predict call and array scheduling"""
+    try:
+        processed = [process_form_data(form_data) for form_data in form_list]
+        if not processed:
+            return []
+        seeds = [new_seed() for _ in processed] if seeds is None else list(seeds)
+
+        active_model = get_model_registry().active()
+        clusters = active_model.predictor.predict([[data[name] for name in active_model.feature_names] for data in processed])
+
+        day_codes = schedule_days(
+            [data['days_per_week'] for data in processed],
+            [int(data['fitness_level']) for data in processed],
+            seeded_uniforms(seeds)
+        )
+        targets = nutrition_targets(
+            [data['calories'] for data in processed],
+            [data['macro_preference'] for data in processed],
+            [data['diet_type'] for data in processed]
+        )
+
+        # Results carry compact plan bodies; hydrate_plan expands them for display
+        catalog = get_catalog()
+        results = []
+        for i, data in enumerate(processed):
+            equipment, level = catalog.resolve(data['equipment'], data['fitness_level'])
+            daily_targets = {key: float(values[i]) for key, values in targets.items()}
+            results.append({
+                'user_data': data, 'cluster': int(clusters[i]), 'model_version': active_model.version_id,
+                'seed': seeds[i], 'plan_format': PLAN_FORMAT,
+                'workout_plan': encode_workout_plan(day_codes[i], equipment, level, data.get('intensity', 'moderate'), catalog),
+                'nutrition_plan': encode_nutrition_plan(daily_targets, data['meals_per_day'], data['diet_type'], data['macro_preference'])
+            })
+        logger.info(f"Generated {len(results)} plans in batch")
+        return results
+    except Exception as e:
+        logger.error(f"Error generating plans in batch: {str(e)}")
+        raise
+
 def format_complete_plan(workout_plan, nutrition_plan):
     """Format and combine workout and nutrition plans"""
     try:
@@ -268,45 +213,60 @@ def format_complete_plan(workout_plan, nutrition_plan):
         raise
 
 # Admin routes remain unchanged for brevity; include them as in your current code
-@app.route('/admin/register', methods=['POST'])
+@api.route('/admin/register', methods=['POST'])
 def admin_register():
     data = request.get_json()
     username = data.get('username')
     password = data.get('password')
-    admin_doc = db.collection('admins').document(username).get()
-    if admin_doc.exists:
+    admins = get_store().admins
+    if admins.get(username, fields=['username']) is not None:
         logger.warning(f"Admin registration failed: Username {username} already exists")
         return jsonify({'error': "Username already exists"}), 400
-    db.collection('admins').document(username).set({
-        'username': username, 'password': generate_password_hash(password), 'created_at': firestore.SERVER_TIMESTAMP
+    admins.set(username, {
+        'username': username, 'password': generate_password_hash(password), 'created_at': server_timestamp()
     })
     logger.info(f"Admin {username} registered successfully")
     return jsonify({'success': True, 'message': 'Admin registered successfully'}), 200
 # Admin login route
-@app.route('/admin/login', methods=['POST'])
+@api.route('/admin/login', methods=['POST'])
 def admin_login():
     data = request.get_json()
     username = data.get('username')
     password = data.get('password')
-    admin_doc = db.collection('admins').document(username).get()
-    if admin_doc.exists and check_password_hash(admin_doc.to_dict()['password'], password):
+    admin_data = get_store().admins.get(username, fields=['password'])
+    if admin_data is not None and check_password_hash(admin_data['password'], password):
         session['is_admin'] = True
         session['admin_username'] = username
         logger.info(f"Admin {username} logged in")
         return jsonify({'success': True, 'message': 'Login successful', 'redirect': '/admin/dashboard'}), 200
     logger.warning(f"Login failed for admin {username}")
     return jsonify({'error': "Login failed"}), 401
+# Dashboards return one page of summaries; ?cursor=<next_cursor> fetches the next page
+PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+PLAN_SUMMARY_FIELDS = ['status', 'created_at', 'cluster', 'coach_comment']
+COACH_SUMMARY_FIELDS = ['email', 'username', 'specialization', 'profile_pic_url', 'services']
+
+def page_limit():
+    return max(1, min(request.args.get('limit', PAGE_LIMIT, type=int), MAX_PAGE_LIMIT))
+
 # Admin dashboard route
-@app.route('/admin/dashboard')
+@api.route('/admin/dashboard')
 def admin_dashboard():
     if 'is_admin' not in session:
         logger.info("Redirecting unauthenticated user to admin login")
         return jsonify({'error': 'Unauthorized'}), 401
-    coaches = [doc.to_dict() for doc in db.collection('users').where('user_type', '==', 'coach').stream()]
-    logger.info("Fetching admin dashboard data")
-    return jsonify({'coaches': coaches}), 200
+    # Ordered by document id, so the user_type filter needs no composite index
+    try:
+        docs, next_cursor = get_store().users.page({'user_type': 'coach'}, '__name__', fields=COACH_SUMMARY_FIELDS,
+                                                   limit=page_limit(), cursor=request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    coaches = [{'id': doc_id, **data} for doc_id, data in docs]
+    logger.info(f"Fetching admin dashboard data: {len(coaches)} coaches")
+    return jsonify({'coaches': coaches, 'next_cursor': next_cursor}), 200
 # Admin register coach route
-@app.route('/admin/register_coach', methods=['POST'])
+@api.route('/admin/register_coach', methods=['POST'])
 def register_coach():
     if 'is_admin' not in session:
         logger.warning("Unauthorized attempt to register coach")
@@ -319,48 +279,80 @@ def register_coach():
         profile_pic_url = request.form['profile_pic_url']
         services = request.form.getlist('services')
 
-        user = auth.create_user(email=email, password=password)
-        db.collection('users').document(user.uid).set({
+        user = get_auth().create_user(email=email, password=password)
+        store = get_store()
+        batch = store.batch()
+        batch.set(store.users, user.uid, {
             'user_type': 'coach', 'username': coach_name, 'email': email,
             'password': generate_password_hash(password), 'specialization': specialization,
             'profile_pic_url': profile_pic_url, 'services': services
         })
+        coach_index.add_coach(batch, store, email, user.uid)
+        batch.commit()
         logger.info(f"Coach {email} registered by admin")
         return jsonify({'success': True}), 200
     except Exception as e:
         logger.error(f"Error registering coach: {str(e)}")
         return jsonify({'error': str(e)}), 400
 # Admin delete coach route
-@app.route('/admin/delete_coach/<coach_email>', methods=['POST'])
+@api.route('/admin/delete_coach/<coach_email>', methods=['POST'])
 def delete_coach(coach_email):
     if 'is_admin' not in session:
         logger.warning("Unauthorized attempt to delete coach")
         return jsonify({'error': 'Unauthorized'}), 401
     try:
-        coach_docs = db.collection('users').where('email', '==', coach_email).limit(1).get()
-        if not coach_docs:
+        store = get_store()
+        coach_id = coach_index.coach_uid(store, coach_email)
+        if coach_id is None:
             logger.warning(f"Coach {coach_email} not found")
             return jsonify({'error': 'Coach not found'}), 404
-        coach_docs[0].reference.delete()
+        batch = store.batch()
+        batch.delete(store.users, coach_id)
+        coach_index.remove_coach(batch, store, coach_email)
+        batch.commit()
         logger.info(f"Coach {coach_email} deleted by admin")
         return jsonify({'success': True}), 200
     except Exception as e:
         logger.error(f"Error deleting coach: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# Admin bulk delete: one index read for all emails, batched deletes
+@api.route('/admin/delete_coaches', methods=['POST'])
+def delete_coaches():
+    if 'is_admin' not in session:
+        logger.warning("Unauthorized attempt to delete coaches")
+        return jsonify({'error': 'Unauthorized'}), 401
+    try:
+        emails = (request.get_json() or {}).get('emails', [])
+        store = get_store()
+        coach_ids = coach_index.coach_uids(store, emails)
+        deleted = list(coach_ids)
+        batch = store.batch()
+        for email in deleted:
+            batch.delete(store.users, coach_ids[email])
+            coach_index.remove_coach(batch, store, email)
+        batch.commit()
+        not_found = [email for email in dict.fromkeys(emails) if email not in coach_ids]
+        logger.info(f"Deleted {len(deleted)} coaches by admin ({len(not_found)} not found)")
+        return jsonify({'success': True, 'deleted': deleted, 'not_found': not_found}), 200
+    except Exception as e:
+        logger.error(f"Error deleting coaches: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # Admin get coach details route
-@app.route('/admin/get_coach/<coach_email>', methods=['GET'])
+@api.route('/admin/get_coach/<coach_email>', methods=['GET'])
 def get_coach(coach_email):
     if 'is_admin' not in session:
         logger.warning("Unauthorized attempt to fetch coach details")
         return jsonify({'error': 'Unauthorized'}), 401
     try:
-        coach_docs = db.collection('users').where('email', '==', coach_email).where('user_type', '==', 'coach').limit(1).get()
-        if not coach_docs:
+        store = get_store()
+        coach_id = coach_index.coach_uid(store, coach_email)
+        coach_data = store.users.get(coach_id) if coach_id else None
+        if coach_data is None:
             logger.warning(f"Coach {coach_email} not found")
             return jsonify({'error': 'Coach not found'}), 404
-        coach_data = coach_docs[0].to_dict()
-        coach_data['uid'] = coach_docs[0].id  # Include the Firestore document ID
+        coach_data['uid'] = coach_id  # Include the Firestore document ID
         logger.info(f"Fetched details for coach {coach_email}")
         return jsonify(coach_data), 200
     except Exception as e:
@@ -369,20 +361,18 @@ def get_coach(coach_email):
 
 
 # Add this new route to edit coach details
-@app.route('/admin/edit_coach/<coach_email>', methods=['POST'])
+@api.route('/admin/edit_coach/<coach_email>', methods=['POST'])
 def edit_coach(coach_email):
     if 'is_admin' not in session:
         logger.warning("Unauthorized attempt to edit coach")
         return jsonify({'error': 'Unauthorized'}), 401
     try:
         # Find the coach by email
-        coach_docs = db.collection('users').where('email', '==', coach_email).where('user_type', '==', 'coach').limit(1).get()
-        if not coach_docs:
+        store = get_store()
+        coach_id = coach_index.coach_uid(store, coach_email)
+        if coach_id is None:
             logger.warning(f"Coach {coach_email} not found")
             return jsonify({'error': 'Coach not found'}), 404
-        
-        coach_ref = coach_docs[0].reference
-        coach_id = coach_docs[0].id
 
         # Get form data
         email = request.form.get('email')
@@ -403,13 +393,18 @@ def edit_coach(coach_email):
             'specialization': specialization,
             'profile_pic_url': profile_pic_url,
             'services': services,
-            'updated_at': firestore.SERVER_TIMESTAMP
+            'updated_at': server_timestamp()
         }
-        coach_ref.update(updated_data)
+        batch = store.batch()
+        batch.update(store.users, coach_id, updated_data)
+        if email != coach_email:
+            coach_index.remove_coach(batch, store, coach_email)
+            coach_index.add_coach(batch, store, email, coach_id)
+        batch.commit()
 
         # Update Firebase Auth email if it changed
         if email != coach_email:
-            auth.update_user(coach_id, email=email)
+            get_auth().update_user(coach_id, email=email)
             logger.info(f"Updated email in Firebase Auth for coach {coach_id} from {coach_email} to {email}")
 
         logger.info(f"Coach {coach_email} updated successfully")
@@ -417,42 +412,51 @@ def edit_coach(coach_email):
     except Exception as e:
         logger.error(f"Error editing coach {coach_email}: {str(e)}")
         return jsonify({'error': str(e)}), 500
+# Admin model version routes
+@api.route('/admin/model', methods=['GET'])
+def get_model_version():
+    if 'is_admin' not in session:
+        logger.warning("Unauthorized attempt to fetch model version")
+        return jsonify({'error': 'Unauthorized'}), 401
+    return jsonify(get_model_registry().active().manifest), 200
+
+@api.route('/admin/model/reload', methods=['POST'])
+def reload_model():
+    if 'is_admin' not in session:
+        logger.warning("Unauthorized attempt to reload model")
+        return jsonify({'error': 'Unauthorized'}), 401
+    try:
+        get_model_registry().reload()
+        version_id = get_model_registry().active().version_id
+        logger.info(f"Model reload requested by admin, serving {version_id}")
+        return jsonify({'success': True, 'version': version_id}), 200
+    except Exception as e:
+        logger.error(f"Error reloading model: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 # Email sending function
 def send_email(to_email, subject, body):
-    sender_email = os.getenv('SMTP_EMAIL')
-    sender_password = os.getenv('SMTP_PASSWORD')
-    
-    if not sender_email or not sender_password:
+    """Queue an email on the outbox; a background sender delivers it (src/mailer.py)"""
+    if not os.getenv('SMTP_EMAIL') or not os.getenv('SMTP_PASSWORD'):
         raise ValueError("SMTP_EMAIL and SMTP_PASSWORD must be set in .env")
 
-    msg = MIMEText(body)
-    msg['Subject'] = subject
-    msg['From'] = sender_email
-    msg['To'] = to_email
-
     try:
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
-        logger.info(f"Email sent successfully to {to_email}")
+        message_id = get_outbox().enqueue(to_email, subject, body)
+        logger.info(f"Email to {to_email} queued as {message_id}")
     except Exception as e:
-        logger.error(f"Failed to send email to {to_email}: {str(e)}")
+        logger.error(f"Failed to queue email to {to_email}: {str(e)}")
         raise
 # Admin reset coach password
-@app.route('/admin/reset_coach_password/<coach_email>', methods=['POST'])
+@api.route('/admin/reset_coach_password/<coach_email>', methods=['POST'])
 def reset_coach_password(coach_email):
     if 'is_admin' not in session:
         logger.warning("Unauthorized attempt to reset coach password")
         return jsonify({'error': 'Unauthorized'}), 401
     try:
-        coach_docs = db.collection('users').where('email', '==', coach_email).where('user_type', '==', 'coach').limit(1).get()
-        if not coach_docs:
+        if coach_index.coach_uid(get_store(), coach_email) is None:
             logger.warning(f"Coach {coach_email} not found")
             return jsonify({'error': 'Coach not found'}), 404
-        
-        coach_id = coach_docs[0].id
-        reset_link = auth.generate_password_reset_link(coach_email)
+
+        reset_link = get_auth().generate_password_reset_link(coach_email)
         logger.info(f"Password reset link generated for {coach_email}: {reset_link}")
 
         email_body = (
@@ -470,7 +474,7 @@ def reset_coach_password(coach_email):
         logger.error(f"Error resetting password for coach {coach_email}: {str(e)}")
         return jsonify({'error': str(e)}), 500
 # User registration and login routes
-@app.route('/register', methods=['POST'])
+@api.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
     email = data.get('email')
@@ -478,8 +482,8 @@ def register():
     user_name = data.get('user_name')
     user_type = data.get('user_type')
     try:
-        user = auth.create_user(email=email, password=password)
-        db.collection('users').document(user.uid).set({
+        user = get_auth().create_user(email=email, password=password)
+        get_store().users.set(user.uid, {
             'user_name': user_name, 'email': email, 'user_type': user_type
         })
         logger.info(f"User {email} registered as {user_type}")
@@ -488,7 +492,7 @@ def register():
         logger.error(f"Registration failed: {str(e)}")
         return jsonify({'error': f"Registration failed: {str(e)}"}), 400
 
-@app.route('/login', methods=['POST'])
+@api.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
     email = data.get('email')
@@ -517,8 +521,8 @@ def login():
         # But to match the "convert" request, I should probably replicate the behavior or improve it.
         # I'll keep it as is but return JSON.
         
-        user = auth.get_user_by_email(email)
-        user_data = db.collection('users').document(user.uid).get().to_dict()
+        user = get_auth().get_user_by_email(email)
+        user_data = get_store().users.get(user.uid, fields=['user_type'])
         session['user_id'] = user.uid
         session['user_type'] = user_data['user_type']
         logger.info(f"User {email} logged in as {user_data['user_type']}")
@@ -528,10 +532,15 @@ def login():
         return jsonify({'error': f"Login failed: {str(e)}"}), 401
 
 # Password reset route
-@app.route('/forgot_password', methods=['POST'])
+@api.route('/forgot_password', methods=['POST'])
 def forgot_password():
     data = request.get_json()
     email = data.get('email')
+    try:
+        auth = get_auth()
+    except Exception as e:
+        logger.error(f"Error processing password reset for {email}: {str(e)}")
+        return jsonify({'error': "Failed to send reset email. Please try again later."}), 500
     try:
         # Check if the email exists in Firebase Authentication
         auth.get_user_by_email(email)
@@ -540,20 +549,15 @@ def forgot_password():
         reset_link = auth.generate_password_reset_link(email)
         logger.info(f"Password reset link generated for {email}")
 
-        # Send the reset email using Flask-Mail
-        msg = Message(
-            subject="Password Reset Request",
-            recipients=[email],
-            body=(
-                f"Dear User,\n\n"
-                f"You have requested to reset your password. Please click the link below to reset it:\n\n"
-                f"{reset_link}\n\n"
-                f"If you did not request this, please ignore this email or contact support.\n\n"
-                f"Best regards,\nFitness AI Team"
-            )
+        email_body = (
+            f"Dear User,\n\n"
+            f"You have requested to reset your password. Please click the link below to reset it:\n\n"
+            f"{reset_link}\n\n"
+            f"If you did not request this, please ignore this email or contact support.\n\n"
+            f"Best regards,\nFitness AI Team"
         )
-        mail.send(msg)
-        logger.info(f"Password reset email sent to {email}")
+        send_email(email, "Password Reset Request", email_body)
+        logger.info(f"Password reset email queued for {email}")
         
         return jsonify({'success': True, 'message': "A password reset link has been sent to your email."}), 200
     except auth.UserNotFoundError:
@@ -563,57 +567,117 @@ def forgot_password():
         logger.error(f"Error processing password reset for {email}: {str(e)}")
         return jsonify({'error': "Failed to send reset email. Please try again later."}), 500
 
-@app.route('/logout', methods=['POST'])
+@api.route('/logout', methods=['POST'])
 def logout():
     session.clear()
     logger.info("User logged out")
     return jsonify({'success': True, 'message': 'Logged out successfully'}), 200
 # customer and coach dashboard routes
-@app.route('/customer_dashboard')
+@api.route('/customer_dashboard')
 def customer_dashboard():
     if 'user_id' not in session:
         logger.info("Redirecting unauthenticated user to login")
         return jsonify({'error': 'Unauthorized'}), 401
-    user_data = db.collection('users').document(session['user_id']).get().to_dict()
-    plans = [{'id': doc.id, **doc.to_dict(), 'status': doc.to_dict().get('status', 'not_sent')}
-             for doc in db.collection('plans').where('user_id', '==', session['user_id']).stream()]
-    logger.info("Fetching customer dashboard data")
-    return jsonify({'user_name': user_data.get('user_name', 'Customer'), 'plans': plans}), 200
-
-@app.route('/coach_dashboard')
+    store = get_store()
+    user_data = store.users.get(session['user_id'], fields=['user_name']) or {}
+    # Newest first; needs the composite index (user_id ASC, created_at DESC) from firestore.indexes.json
+    try:
+        docs, next_cursor = store.plans.page({'user_id': session['user_id']}, 'created_at', descending=True,
+                                             fields=PLAN_SUMMARY_FIELDS, limit=page_limit(),
+                                             cursor=request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except MissingIndexError as e:
+        logger.error(f"Customer dashboard unavailable: {str(e)}")
+        return jsonify({'error': 'Plans are temporarily unavailable'}), 503
+    plans = []
+    for doc_id, data in docs:
+        plans.append({
+            'id': doc_id, 'status': data.get('status', 'not_sent'), 'created_at': data.get('created_at'),
+            'cluster': data.get('cluster'), 'coach_comment': data.get('coach_comment', '')
+        })
+    logger.info(f"Fetching customer dashboard data: {len(plans)} plans")
+    return jsonify({'user_name': user_data.get('user_name', 'Customer'), 'plans': plans, 'next_cursor': next_cursor}), 200
+
+def stored_plans(plan_id):
+    """The plans repository, once a write-behind write of plan_id (if one is queued) has landed"""
+    plans = get_store().plans
+    writer = get_plan_writer()
+    if writer is not None:
+        writer.wait(plans, plan_id)
+    return plans
+
+# Full plan, loaded on demand from a dashboard summary
+@api.route('/plan/<plan_id>')
+def get_plan(plan_id):
+    if 'user_id' not in session:
+        logger.warning("Unauthorized attempt to fetch plan")
+        return jsonify({'error': 'Unauthorized'}), 401
+    plan_data = stored_plans(plan_id).get(plan_id)
+    if plan_data is None:
+        logger.warning(f"Plan {plan_id} not found")
+        return jsonify({'error': 'Plan not found'}), 404
+    if plan_data.get('user_id') != session['user_id'] and session.get('user_type') != 'coach':
+        logger.warning(f"Unauthorized access attempt for plan {plan_id}")
+        return jsonify({'error': 'Unauthorized'}), 401
+    plan = hydrate_plan(plan_data, get_catalog())
+    plan['id'] = plan_id
+    plan['status'] = plan_data.get('status', 'not_sent')
+    return jsonify(plan), 200
+
+FITNESS_GOALS = {'0': 'Weight Loss', '1': 'Muscle Gain', '2': 'Endurance', '3': 'General Fitness'}
+
+def get_user_names(user_ids):
+    """user_id -> user_name for the given ids ('Unknown' for missing users)
+
+    Ids are deduplicated and served from the shared user_names cache where
+    possible; the rest are read in one batched get_many that fetches only the
+    user_name field.
+    """
+    user_ids = list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+    names = user_names.get_many(user_ids)
+    missing = [user_id for user_id in user_ids if user_id not in names]
+    if missing:
+        found = get_store().users.get_many(missing, fields=['user_name'])
+        fetched = {user_id: found.get(user_id, {}).get('user_name', 'Unknown') for user_id in missing}
+        user_names.set_many(fetched)
+        names.update(fetched)
+    return names
+
+@api.route('/coach_dashboard')
 def coach_dashboard():
     if 'user_id' not in session or session['user_type'] != 'coach':
         logger.info("Redirecting unauthorized user to login")
         return jsonify({'error': 'Unauthorized'}), 401
+    catalog = get_catalog()
+    docs = get_store().plans.find({'status': 'requested'})
+    names = get_user_names([data.get('user_id') for _, data in docs])
     plans = []
-    for doc in db.collection('plans').where('status', '==', 'requested').stream():
-        plan = doc.to_dict()
-        plan['id'] = doc.id
-        user_doc = db.collection('users').document(plan['user_id']).get()
-        plan['user_name'] = user_doc.to_dict().get('user_name', 'Unknown') if user_doc.exists else 'Unknown'
-        fitness_goals = {'0': 'Weight Loss', '1': 'Muscle Gain', '2': 'Endurance', '3': 'General Fitness'}
-        plan['fitness_goal'] = fitness_goals.get(str(plan['user_data'].get('exercise_type', '')), 'Not specified')
+    for doc_id, data in docs:
+        plan = hydrate_plan(data, catalog)
+        plan['id'] = doc_id
+        plan['user_name'] = names.get(plan['user_id'], 'Unknown')
+        plan['fitness_goal'] = FITNESS_GOALS.get(str(plan['user_data'].get('exercise_type', '')), 'Not specified')
         plans.append(plan)
-    logger.info("Fetching coach dashboard data")
+    logger.info(f"Fetching coach dashboard data: {len(plans)} plans, {len(names)} users")
     return jsonify({'plans': plans}), 200
 
-@app.route('/tell_coach/<plan_id>', methods=['POST'])
+@api.route('/tell_coach/<plan_id>', methods=['POST'])
 def send_to_coach_review(plan_id):
     if 'user_id' not in session:
         logger.warning("Unauthorized attempt to send plan to coach")
         return jsonify({'error': 'Unauthorized'}), 401
     try:
-        plan_ref = db.collection('plans').document(plan_id)
-        plan_doc = plan_ref.get()
-        if not plan_doc.exists:
+        plans = stored_plans(plan_id)
+        plan_data = plans.get(plan_id, fields=['user_id'])
+        if plan_data is None:
             logger.warning(f"Plan {plan_id} not found")
             return jsonify({'error': 'Plan not found'}), 404
-        plan_data = plan_doc.to_dict()
         if plan_data.get('user_id') != session['user_id']:
             logger.warning(f"Unauthorized access attempt for plan {plan_id}")
             return jsonify({'error': 'Unauthorized'}), 401
-        plan_ref.update({
-            'status': 'requested', 'updated_at': firestore.SERVER_TIMESTAMP, 'sent_by': session['user_id']
+        plans.update(plan_id, {
+            'status': 'requested', 'updated_at': server_timestamp(), 'sent_by': session['user_id']
         })
         logger.info(f"Plan {plan_id} sent to coach")
         return jsonify({'success': True, 'message': 'Plan sent to coach successfully'}), 200
@@ -621,7 +685,7 @@ def send_to_coach_review(plan_id):
         logger.error(f"Error sending plan to coach: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/review_plan/<plan_id>', methods=['POST'])
+@api.route('/review_plan/<plan_id>', methods=['POST'])
 def review_plan(plan_id):
     if 'user_id' not in session or session['user_type'] != 'coach':
         logger.warning("Unauthorized attempt to review plan")
@@ -632,14 +696,13 @@ def review_plan(plan_id):
         logger.warning(f"Missing fields for plan {plan_id}")
         return jsonify({'error': 'Missing required fields'}), 400
     try:
-        plan_ref = db.collection('plans').document(plan_id)
-        plan_doc = plan_ref.get()
-        if not plan_doc.exists:
+        plans = stored_plans(plan_id)
+        if plans.get(plan_id, fields=['status']) is None:
             logger.warning(f"Plan {plan_id} not found")
             return jsonify({'error': 'Plan not found'}), 404
         new_status = 'approved' if action == 'approve' else 'rejected'
-        plan_ref.update({
-            'coach_comment': coach_comment, 'status': new_status, 'updated_at': firestore.SERVER_TIMESTAMP
+        plans.update(plan_id, {
+            'coach_comment': coach_comment, 'status': new_status, 'updated_at': server_timestamp()
         })
         logger.info(f"Plan {plan_id} {new_status} by coach")
         return jsonify({'success': True, 'status': new_status}), 200
@@ -647,28 +710,28 @@ def review_plan(plan_id):
         logger.error(f"Error reviewing plan {plan_id}: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/delete_plan/<plan_id>', methods=['POST'])
+@api.route('/delete_plan/<plan_id>', methods=['POST'])
 def delete_plan(plan_id):
     if 'user_id' not in session or session['user_type'] != 'customer':
         logger.warning("Unauthorized attempt to delete plan")
         return jsonify({'error': 'Unauthorized'}), 401
     try:
-        plan_ref = db.collection('plans').document(plan_id)
-        plan_doc = plan_ref.get()
-        if not plan_doc.exists:
+        plans = stored_plans(plan_id)
+        plan_data = plans.get(plan_id, fields=['user_id'])
+        if plan_data is None:
             logger.warning(f"Plan {plan_id} not found")
             return jsonify({'error': 'Plan not found'}), 404
-        if plan_doc.to_dict().get('user_id') != session['user_id']:
+        if plan_data.get('user_id') != session['user_id']:
             logger.warning(f"Unauthorized deletion attempt for plan {plan_id}")
             return jsonify({'error': 'Unauthorized'}), 401
-        plan_ref.delete()
+        plans.delete(plan_id)
         logger.info(f"Plan {plan_id} deleted")
         return jsonify({'success': True}), 200
     except Exception as e:
         logger.error(f"Error deleting plan {plan_id}: {str(e)}")
         return jsonify({'error': str(e)}), 500
 # Generate workout and nutrition plans
-@app.route('/generate', methods=['POST'])
+@api.route('/generate', methods=['POST'])
 def generate():
     if 'user_id' not in session:
         logger.info("Redirecting unauthenticated user to login from generate")
@@ -681,33 +744,42 @@ def generate():
             form_data = request.form
 
         processed_data = process_form_data(form_data)
-        features = pd.DataFrame([[
-            processed_data['weight'], processed_data['height'], processed_data['age'], processed_data['bmi'],
-            processed_data['days_per_week'], processed_data['sleep_hours'], processed_data['calories'],
-            processed_data['protein'], processed_data['carbohydrate'], processed_data['total_fat'],
-            processed_data['fiber'], processed_data['intensity'], processed_data['exercise_type'],
-            processed_data['rating']
-        ]], columns=FEATURE_NAMES)
-        logger.info(f"Features for prediction: {features.to_dict(orient='records')}")
+        # One model version for the whole request, even if a reload lands meanwhile
+        active_model = get_model_registry().active()
+        features = [float(processed_data[name]) for name in active_model.feature_names]
+        logger.info("Features for prediction", extra={'payload': dict(zip(active_model.feature_names, features))})
         
-        cluster = model.predict(scaler.transform(features))[0]
-        logger.info(f"Predicted cluster: {cluster}")
+        cluster = active_model.predictor.predict_one(features)
+        logger.info(f"Predicted cluster: {cluster} (model {active_model.version_id})")
         
-        workout_plan = generate_workout_plan(processed_data)
+        # Plans are built compactly (catalog row ids, daily targets) and hydrated for display
+        seed = new_seed()
+        compact_workout = compact_workout_plan(processed_data, seed)
+        workout_plan = hydrate_workout_plan(compact_workout, get_catalog())
         logger.info("Generated workout plan")
-        nutrition_plan = generate_nutrition_plan(processed_data)
+        compact_nutrition = compact_nutrition_plan(processed_data)
+        nutrition_plan = hydrate_nutrition_plan(compact_nutrition)
         logger.info("Generated nutrition plan")
         complete_plan = format_complete_plan(workout_plan, nutrition_plan)  # Use the formatting function
         logger.info("Formatted complete plan")
 
         plan_data = {
-            'user_id': session['user_id'], 'created_at': firestore.SERVER_TIMESTAMP, 'status': 'new',
-            'workout_plan': workout_plan, 'nutrition_plan': nutrition_plan, 'user_data': processed_data,
-            'cluster': int(cluster), 'coach_comment': '', 'coach_id': None
+            'user_id': session['user_id'], 'created_at': server_timestamp(), 'status': 'new',
+            **stored_plan_bodies(compact_workout, compact_nutrition, get_catalog(), workout_plan, nutrition_plan),
+            'user_data': processed_data,
+            'cluster': int(cluster), 'model_version': active_model.version_id, 'seed': seed,
+            'coach_comment': '', 'coach_id': None
         }
-        plan_ref = db.collection('plans').add(plan_data)
-        logger.info("Added plan to Firestore")
-        complete_plan['plan_id'] = plan_ref[1].id
+        # The id is allocated locally; with write-behind the response does not wait for the write
+        plans = get_store().plans
+        plan_id = plans.new_id()
+        writer = get_plan_writer()
+        if writer is not None and writer.put(plans, plan_id, plan_data):
+            logger.info("Queued plan for storage")
+        else:
+            plans.set(plan_id, plan_data)
+            logger.info("Added plan to Firestore")
+        complete_plan['plan_id'] = plan_id
 
         logger.info(f"Plan generated with ID {complete_plan['plan_id']}")
         return jsonify(complete_plan), 200
@@ -715,11 +787,52 @@ def generate():
         logger.error(f"Error generating plan: {str(e)}")
         return jsonify({'error': str(e)}), 400
 
+@api.route('/generate/batch', methods=['POST'])
+def generate_batch():
+    if 'is_admin' not in session:
+        logger.warning("Unauthorized attempt to generate plans in batch")
+        return jsonify({'error': 'Unauthorized'}), 401
+    try:
+        users = (request.get_json() or {}).get('users', [])
+        missing_ids = [i for i, form_data in enumerate(users) if not form_data.get('user_id')]
+        if missing_ids:
+            return jsonify({'error': f"Missing user_id for entries: {missing_ids}"}), 400
+
+        results = generate_plans_batch(users)
+
+        # The store batch commits in chunks of Firestore's 500-write limit
+        store = get_store()
+        catalog = get_catalog()
+        batch = store.batch()
+        plans = []
+        for form_data, result in zip(users, results):
+            plan_id = store.plans.new_id()
+            batch.set(store.plans, plan_id, {
+                'user_id': form_data['user_id'], 'created_at': server_timestamp(), 'status': 'new',
+                **stored_plan_bodies(result['workout_plan'], result['nutrition_plan'], catalog),
+                'user_data': result['user_data'], 'cluster': result['cluster'],
+                'model_version': result['model_version'], 'seed': result['seed'],
+                'coach_comment': '', 'coach_id': None
+            })
+            plans.append({
+                'user_id': form_data['user_id'], 'plan_id': plan_id, 'cluster': result['cluster'],
+                'overview': workout_overview(result['workout_plan'])
+            })
+        batch.commit()
+
+        logger.info(f"Batch generated {len(plans)} plans")
+        return jsonify({'plans': plans}), 200
+    except Exception as e:
+        logger.error(f"Error generating plans in batch: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
 # Calorie calculator route removed as it is a frontend feature
 # @app.route('/calorie_calculator')
 # def calorie_calculator():
 #     ...
 
+app = create_app()
+
 if __name__ == '__main__':
     logger.info("Starting Flask application")
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('workout_app')
+
+WORKOUTS_PATH = 'data/workouts.csv'
+
+# Form values -> catalog values (shared with generate_workout_plan)
+EQUIPMENT_MAP = {
+    'none': 'Body Only', 'bands': 'Bands', 'barbell': 'Barbell', 'dumbbell': 'Dumbbell',
+    'cable': 'Cable', 'machine': 'Machine', 'kettlebell': 'Kettlebells',
+    'medicine ball': 'Medicine Ball', 'exercise ball': 'Exercise Ball'
+}
+LEVEL_MAP = {'1': 'Beginner', '2': 'Intermediate', '3': 'Expert'}
+
+# Plan day type -> workout types in the CSV
+TYPE_GROUPS = {
+    'Cardio': ['Cardio'],
+    'Strength': ['Strength'],
+    'Flexibility': ['Stretching', 'Plyometrics']
+}
+
+# Text fields of an exercise entry, in the order they are packed by to_arrays
+TEXT_FIELDS = ('name', 'desc', 'equipment')
+
+
+def arrays_version(arrays):
+    """Content hash of the row ids, exercise text and ratings in to_arrays() output"""
+    digest = hashlib.sha256()
+    for name in ('row_ids', 'text', 'text_offsets', 'ratings'):
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class WorkoutCatalog:
+    """Workouts indexed by (equipment, level, type group), best rated first"""
+
+    def __init__(self, records, index):
+        self.records = records  # row id -> exercise entry
+        self.index = index      # (equipment, level, group) -> list of exercise entries
+        self._version = None
+
+    @property
+    def version(self):
+        """Content hash of the exercises; compact plans store it to detect a regenerated CSV"""
+        if self._version is None:
+            self._version = arrays_version(self.to_arrays()[0])
+        return self._version
+
+    @classmethod
+    def from_dataframe(cls, workouts_df):
+        """Build the catalog and its lookup index from the workouts table"""
+        records = {
+            int(row_id): {
+                'id': int(row_id), 'name': str(row['Title']), 'desc': str(row['Desc']),
+                'equipment': str(row['Equipment']), 'rating': float(row.get('Rating', 0))
+            } for row_id, row in zip(workouts_df.index, workouts_df.to_dict('records'))
+        }
+
+        index = {}
+        for equipment in set(EQUIPMENT_MAP.values()):
+            by_equipment = workouts_df[workouts_df['Equipment'].str.contains(equipment, na=False)]
+            for level in LEVEL_MAP.values():
+                filtered = by_equipment[by_equipment['Level'] == level]
+                for group, types in TYPE_GROUPS.items():
+                    ordered = filtered[filtered['Type'].isin(types)].sort_values('Rating', ascending=False)
+                    index[(equipment, level, group)] = [records[int(row_id)] for row_id in ordered.index]
+
+        logger.info(f"Workout catalog built: {len(records)} exercises, {len(index)} index keys")
+        return cls(records, index)
+
+    @classmethod
+    def from_csv(cls, path=WORKOUTS_PATH):
+        """Load workouts.csv once and index it"""
+        return cls.from_dataframe(pd.read_csv(path, index_col=0))
+
+    def exercises(self, equipment, level, group, limit=None):
+        """Exercises for a lookup key ordered by rating, optionally truncated"""
+        entries = self.index.get((equipment, level, group), [])
+        return entries if limit is None else entries[:limit]
+
+    def record(self, row_id):
+        """Exercise entry for a workouts.csv row id"""
+        return self.records[int(row_id)]
+
+    def resolve(self, equipment, fitness_level):
+        """Map form values for equipment and fitness level to catalog keys"""
+        return EQUIPMENT_MAP.get(equipment.lower(), 'Body Only'), LEVEL_MAP.get(str(fitness_level), 'Intermediate')
+
+    def to_arrays(self):
+        """Flatten the catalog into plain arrays and the list of index keys
+
+        Text fields are UTF-8 encoded into one byte blob with offsets, so the
+        arrays can be saved as .npy files and memory-mapped by other processes.
+        """
+        row_ids = np.array(sorted(self.records), dtype=np.int64)
+        position = {int(row_id): i for i, row_id in enumerate(row_ids)}
+
+        encoded = [self.records[int(row_id)][field].encode('utf-8')
+                   for row_id in row_ids for field in TEXT_FIELDS]
+        text_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=text_offsets[1:])
+
+        keys = list(self.index)
+        index_rows = np.array([position[entry['id']] for key in keys for entry in self.index[key]], dtype=np.int32)
+        index_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum([len(self.index[key]) for key in keys], out=index_offsets[1:])
+
+        arrays = {
+            'row_ids': row_ids,
+            'text': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'text_offsets': text_offsets,
+            'ratings': np.array([self.records[int(row_id)]['rating'] for row_id in row_ids], dtype=np.float64),
+            'index_rows': index_rows,
+            'index_offsets': index_offsets
+        }
+        return arrays, [list(key) for key in keys]
+
+
+class ArrayWorkoutCatalog(WorkoutCatalog):
+    """WorkoutCatalog over the flat arrays from to_arrays (e.g. memory-mapped)
+
+    Entries are decoded on lookup, so the catalog itself holds no per-process copies.
+    """
+
+    def __init__(self, arrays, keys):
+        self.arrays = arrays
+        self.key_slots = {tuple(key): slot for slot, key in enumerate(keys)}
+        self.positions = {int(row_id): i for i, row_id in enumerate(arrays['row_ids'])}
+        self._version = None
+
+    @property
+    def version(self):
+        if self._version is None:
+            self._version = arrays_version(self.arrays)
+        return self._version
+
+    def _entry(self, position):
+        offsets = self.arrays['text_offsets']
+        text = self.arrays['text']
+        first = position * len(TEXT_FIELDS)
+        entry = {'id': int(self.arrays['row_ids'][position])}
+        for i, field in enumerate(TEXT_FIELDS):
+            entry[field] = bytes(text[offsets[first + i]:offsets[first + i + 1]]).decode('utf-8')
+        entry['rating'] = float(self.arrays['ratings'][position])
+        return entry
+
+    def exercises(self, equipment, level, group, limit=None):
+        slot = self.key_slots.get((equipment, level, group))
+        if slot is None:
+            return []
+        start, stop = self.arrays['index_offsets'][slot:slot + 2]
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return [self._entry(position) for position in self.arrays['index_rows'][start:stop]]
+
+    def record(self, row_id):
+        return self._entry(self.positions[int(row_id)])
+
@@ -0,0 +1,67 @@
+import logging
+from urllib.parse import quote
+
+logger = logging.getLogger('workout_app')
+
+# coach_emails/<email key> -> {'uid', 'email'}: lets the admin coach routes find
+# a coach with a document read instead of an (email, user_type) query over
+# users. Entries are written in the same batch as the coach's user document.
+
+
+def email_key(email):
+    """Document id for an email: lower-cased (Firebase Auth emails are case-insensitive), '/' escaped"""
+    return quote(email.strip().lower(), safe='@+')
+
+
+def add_coach(batch, store, email, uid):
+    batch.set(store.coach_emails, email_key(email), {'uid': uid, 'email': email})
+
+
+def remove_coach(batch, store, email):
+    batch.delete(store.coach_emails, email_key(email))
+
+
+def coach_uids(store, emails):
+    """email -> uid for the coaches among emails, with one batched read of the index
+
+    Emails missing from the index (coaches registered before it existed) are
+    looked up with the users query once and added, so the next lookup is a read.
+    """
+    emails = list(dict.fromkeys(emails))
+    keys = {email: email_key(email) for email in emails}
+    found = store.coach_emails.get_many(keys.values())
+
+    uids = {}
+    for email, key in keys.items():
+        if key in found:
+            uids[email] = found[key]['uid']
+            continue
+        coach = store.users.find_one({'email': email, 'user_type': 'coach'}, fields=[])
+        if coach is not None:
+            store.coach_emails.set(key, {'uid': coach[0], 'email': email})
+            logger.info(f"Added coach {email} to the email index")
+            uids[email] = coach[0]
+    return uids
+
+
+def coach_uid(store, email):
+    """uid of the coach with this email, or None"""
+    return coach_uids(store, [email]).get(email)
+
+
+def backfill(store):
+    """Index every existing coach; returns the number of entries written"""
+    batch = store.batch()
+    for doc_id, data in store.users.find({'user_type': 'coach'}, fields=['email']):
+        if data.get('email'):
+            add_coach(batch, store, data['email'], doc_id)
+    count = batch.commit()
+    logger.info(f"Indexed {count} coach emails")
+    return count
+
+
+if __name__ == "__main__":
+    # python -m src.coach_index   (from the backend directory)
+    logging.basicConfig(level=logging.INFO)
+    from src.resources import get_store
+    print(f"Indexed {backfill(get_store())} coaches")
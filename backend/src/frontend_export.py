@@ -0,0 +1,167 @@
+import os
+import re
+import json
+import base64
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.catalog import EQUIPMENT_MAP, LEVEL_MAP
+
+logger = logging.getLogger('workout_app')
+
+# Data bundled into the Next.js frontend. Output is minified; workouts are split
+# into one shard per (equipment, level) so a request only loads the rows
+# generateWorkoutPlan filters to, and each export is skipped when the hashes of
+# its sources match the stamp written by the previous run.
+FRONTEND_DIR = '../frontend/src'
+WORKOUT_SHARD_DIR = os.path.join(FRONTEND_DIR, 'data', 'workouts')
+MODEL_EXPORT_DIR = os.path.join(FRONTEND_DIR, 'lib', 'ml')
+STAMP_NAME = '.export-stamp.json'
+
+# Columns the frontend workout generator reads
+WORKOUT_COLUMNS = ['Title', 'Desc', 'Type', 'Equipment', 'Level', 'Rating']
+
+
+def dump_minified(data, path):
+    """Write JSON without whitespace, atomically"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.export-', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    os.chmod(tmp_path, 0o644)  # mkstemp creates files readable only by the owner
+    os.replace(tmp_path, path)
+
+
+def source_hashes(paths):
+    """sha256 of each source file, plus this module so format changes trigger a rebuild"""
+    hashes = {}
+    for path in list(paths) + [os.path.abspath(__file__)]:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        hashes[os.path.basename(path)] = digest.hexdigest()
+    return hashes
+
+
+def is_up_to_date(output_dir, hashes):
+    """True when the stamp in output_dir records the same source hashes and its outputs still exist"""
+    try:
+        with open(os.path.join(output_dir, STAMP_NAME)) as f:
+            stamp = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    return stamp.get('sources') == hashes and all(
+        os.path.exists(os.path.join(output_dir, name)) for name in stamp.get('outputs', []))
+
+
+def write_stamp(output_dir, hashes, outputs):
+    dump_minified({'sources': hashes, 'outputs': sorted(outputs), 'exported_at': datetime.now().isoformat()},
+                  os.path.join(output_dir, STAMP_NAME))
+
+
+def slug(value):
+    return re.sub(r'[^a-z0-9]+', '-', str(value).lower()).strip('-')
+
+
+def shard_name(equipment, level):
+    """File name (without .json) of a workout shard; workout-generator.ts builds the same name"""
+    return f'{slug(equipment)}--{slug(level)}'
+
+
+def workout_shards(workouts_df):
+    """Workout records per shard name, with the same equipment/level filter as the generator
+
+    Equipment matches as a substring, like the frontend's includes() and the
+    backend catalog, so a row can belong to more than one shard.
+    """
+    df = workouts_df[WORKOUT_COLUMNS].astype(object).where(workouts_df[WORKOUT_COLUMNS].notna(), None)
+    shards = {}
+    for equipment in sorted(set(EQUIPMENT_MAP.values())):
+        by_equipment = df[workouts_df['Equipment'].str.contains(equipment, na=False, regex=False)]
+        for level in LEVEL_MAP.values():
+            shards[shard_name(equipment, level)] = by_equipment[by_equipment['Level'] == level].to_dict('records')
+    return shards
+
+
+def export_workouts(workouts_path='data/workouts.csv', output_dir=WORKOUT_SHARD_DIR, force=False):
+    """Write the workout shards; returns the shard sizes, or None when the export was up to date"""
+    try:
+        hashes = source_hashes([workouts_path])
+        if not force and is_up_to_date(output_dir, hashes):
+            logger.info(f"Workout shards in {output_dir} are up to date")
+            return None
+
+        shards = workout_shards(pd.read_csv(workouts_path))
+        outputs = [f'{name}.json' for name in shards]
+        for name, records in shards.items():
+            dump_minified(records, os.path.join(output_dir, f'{name}.json'))
+        # Shards a previous export wrote that no longer exist
+        for name in os.listdir(output_dir):
+            if name.endswith('.json') and not name.startswith('.') and name not in outputs:
+                os.remove(os.path.join(output_dir, name))
+        write_stamp(output_dir, hashes, outputs)
+        logger.info(f"Exported {len(shards)} workout shards to {output_dir}")
+        return {name: len(records) for name, records in shards.items()}
+    except Exception as e:
+        logger.error(f"Error exporting workouts: {str(e)}")
+        raise
+
+
+def pack_float32(array):
+    """Base64 of the array as little-endian float32, row-major"""
+    return base64.b64encode(np.ascontiguousarray(array, dtype='<f4').tobytes()).decode('ascii')
+
+
+def unpack_float32(packed, shape):
+    return np.frombuffer(base64.b64decode(packed), dtype='<f4').reshape(shape)
+
+
+def model_data(centers, scaler_mean, scaler_scale, feature_names):
+    """model-data.json contents: centers packed as float32, scaler parameters as plain lists
+
+    The scaler stays float64 because it works in raw units (calories in the
+    thousands); standardized centers are well within float32 precision.
+    """
+    centers = np.asarray(centers)
+    return {
+        'n_clusters': int(centers.shape[0]),
+        'n_features': int(centers.shape[1]),
+        'cluster_centers_f32': pack_float32(centers),
+        'scaler': {
+            'mean': np.asarray(scaler_mean, dtype=float).tolist(),
+            'scale': np.asarray(scaler_scale, dtype=float).tolist(),
+            'feature_names': [str(name) for name in feature_names]
+        }
+    }
+
+
+def export_model(model_dir='models', output_dir=MODEL_EXPORT_DIR, force=False):
+    """Write model-data.json and cluster-info.json; returns the written files, or None when up to date"""
+    try:
+        sources = [os.path.join(model_dir, name) for name in ('model.pkl', 'scaler.pkl', 'cluster_info.json')]
+        hashes = source_hashes(sources)
+        if not force and is_up_to_date(output_dir, hashes):
+            logger.info(f"Model export in {output_dir} is up to date")
+            return None
+
+        import joblib
+        model = joblib.load(sources[0])
+        scaler = joblib.load(sources[1])
+        with open(sources[2]) as f:
+            cluster_info = json.load(f)
+
+        outputs = ['model-data.json', 'cluster-info.json']
+        dump_minified(model_data(model.cluster_centers_, scaler.mean_, scaler.scale_, scaler.feature_names_in_),
+                      os.path.join(output_dir, outputs[0]))
+        dump_minified(cluster_info, os.path.join(output_dir, outputs[1]))
+        write_stamp(output_dir, hashes, outputs)
+        logger.info(f"Exported model with {model.n_clusters} clusters to {output_dir}")
+        return outputs
+    except Exception as e:
+        logger.error(f"Error exporting model: {str(e)}")
+        raise
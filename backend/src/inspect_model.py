@@ -1,3 +1,5 @@
+import os
+import json
 import joblib
 import numpy as np
 
@@ -11,13 +13,20 @@ def inspect_kmeans_model():
         
         # Get cluster centers
         centers = model.cluster_centers_
+        feature_names = joblib.load('models/scaler.pkl').feature_names_in_
+
+        # Cluster sizes as recorded by train.py; nothing is preprocessed or predicted here
+        sizes = None
+        if os.path.exists('models/cluster_analysis.json'):
+            with open('models/cluster_analysis.json') as f:
+                analysis = json.load(f)
+            sizes = [analysis.get(str(i), {}).get('size') for i in range(n_clusters)]
         
         print(f"Model type: {type(model)}")
         print(f"Number of clusters: {n_clusters}")
         print("\nCluster centers:")
         for i, center in enumerate(centers):
-            print(f"\nCluster {i}:")
-            feature_names = ['weight', 'height', 'age', 'days_per_week', 'sleep_hours', 'dummy']
+            print(f"\nCluster {i}:" + (f" {sizes[i]} samples" if sizes and sizes[i] is not None else ""))
             for name, value in zip(feature_names, center):
                 print(f"{name}: {value:.2f}")
         
@@ -28,4 +37,5 @@ def inspect_kmeans_model():
         return None
 
 if __name__ == "__main__":
+    # Run from the backend directory: python src/inspect_model.py
     inspect_kmeans_model()
\ No newline at end of file
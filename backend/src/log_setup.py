@@ -0,0 +1,104 @@
+import os
+import json
+import queue
+import atexit
+import random
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Request threads only build a JSON line and put it on a queue; a QueueListener
+# thread writes it to logs/workout_app.log (and the console), so file I/O and
+# rotation never run on a request. Large payloads (form data, feature vectors)
+# are logged as logger.info(message, extra={'payload': ...}) and kept for a
+# FITGEN_LOG_PAYLOAD_SAMPLE fraction of records (default 1%).
+#
+#   FITGEN_LOG_DIR              log directory (logs)
+#   FITGEN_LOG_MAX_BYTES        rotate the file at this size (10 MB), 10 backups
+#   FITGEN_LOG_CONSOLE          also write to stderr (1)
+#   FITGEN_LOG_PAYLOAD_SAMPLE   fraction of payload records kept (0.01)
+#   FITGEN_LOG_QUEUE            records buffered before new ones are dropped (10000)
+
+# LogRecord attributes that are not extra fields
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and any extra fields"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class PayloadSampler(logging.Filter):
+    """Keeps every record without a payload and a `rate` fraction of those with one"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return not hasattr(record, 'payload') or random.random() < self.rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StoppableQueueListener(QueueListener):
+    """QueueListener whose stop() may run twice (atexit after an explicit stop)"""
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+
+
+def configure(logger, log_dir=None, level=logging.INFO):
+    """Route logger through a queue to the file (and console) handlers; returns the started listener"""
+    for handler in logger.handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            return handler.listener  # already configured in this process
+
+    log_dir = log_dir or os.getenv('FITGEN_LOG_DIR', 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    file_handler = RotatingFileHandler(os.path.join(log_dir, 'workout_app.log'),
+                                       maxBytes=int(os.getenv('FITGEN_LOG_MAX_BYTES', 10 * 1024 * 1024)), backupCount=10)
+    handlers = [file_handler]
+    if os.getenv('FITGEN_LOG_CONSOLE', '1').lower() not in ('0', 'false', 'no'):
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter('%(message)s'))  # already JSON, see prepare()
+
+    queue_handler = DroppingQueueHandler(queue.Queue(int(os.getenv('FITGEN_LOG_QUEUE', 10000))))
+    # prepare() formats on the logging thread, so payloads are serialized before
+    # the caller can change them; the listener only writes lines
+    queue_handler.setFormatter(JsonFormatter())
+    queue_handler.addFilter(PayloadSampler(float(os.getenv('FITGEN_LOG_PAYLOAD_SAMPLE', 0.01))))
+    listener = StoppableQueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    queue_handler.listener = listener
+
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import uuid
+import atexit
+import smtplib
+import logging
+import threading
+from email.mime.text import MIMEText
+
+logger = logging.getLogger('workout_app')
+
+# Routes call send_email(), which only writes the message to the outbox: a spool
+# directory shared by every worker process. Background sender threads deliver
+# it over a pooled SMTP session (connect, STARTTLS and login once, then reuse),
+# at most `rate` messages per second per process, retrying failures with backoff.
+#
+#   outbox/tmp/     messages being written
+#   outbox/new/     waiting (or waiting for a retry)
+#   outbox/cur/     claimed by a sender (rename is atomic, so only one claims it)
+#   outbox/failed/  gave up after max_attempts
+STALE_CLAIM_SECONDS = 600  # a claim this old belongs to a sender that died
+
+
+class SMTPPool:
+    """Up to size authenticated SMTP sessions, reused until idle for max_idle seconds"""
+
+    def __init__(self, host, port, username=None, password=None, starttls=True, size=2, max_idle=60.0, timeout=30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.connects = 0
+        self._idle = []  # (session, released_at)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        # smtplib.SMTP is looked up here so stand-ins installed later are used
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        self.connects += 1
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _take_idle(self):
+        with self._lock:
+            while self._idle:
+                server, released_at = self._idle.pop()
+                if time.monotonic() - released_at < self.max_idle:
+                    return server
+                self._close(server)
+        return None
+
+    def send(self, msg):
+        """Send msg on a pooled session; a session the server dropped is replaced once"""
+        with self._slots:
+            for attempt in range(2):
+                server = self._take_idle() or self._connect()
+                try:
+                    server.send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    self._close(server)
+                    if attempt:
+                        raise
+                    continue
+                except Exception:
+                    self._close(server)
+                    raise
+                with self._lock:
+                    self._idle.append((server, time.monotonic()))
+                return
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+class Outbox:
+    """Persistent email queue drained by background sender threads (see the comment above)"""
+
+    def __init__(self, directory, pool, sender, rate=5.0, workers=1, max_attempts=5, retry_delay=30.0,
+                 poll_interval=1.0):
+        self.directory = directory
+        self.pool = pool
+        self.sender = sender
+        self.rate = rate
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self._next_send = 0.0
+        self._rate_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        for name in ('tmp', 'new', 'cur', 'failed'):
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+    def _path(self, state, message_id):
+        return os.path.join(self.directory, state, f'{message_id}.json')
+
+    def _write(self, state, message):
+        tmp_path = self._path('tmp', message['id'])
+        with open(tmp_path, 'w') as f:
+            json.dump(message, f)
+        os.replace(tmp_path, self._path(state, message['id']))
+
+    def enqueue(self, to_email, subject, body):
+        """Store a message for delivery and wake a sender; returns the message id"""
+        message = {'id': f'{time.time():.6f}-{uuid.uuid4().hex[:8]}', 'to': to_email, 'subject': subject,
+                   'body': body, 'attempts': 0, 'due': time.time()}
+        self._write('new', message)
+        self.start()
+        self._wake.set()
+        return message['id']
+
+    def _throttle(self):
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_send - now
+            self._next_send = max(self._next_send, now) + 1.0 / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def _deliver(self, message):
+        msg = MIMEText(message['body'])
+        msg['Subject'] = message['subject']
+        msg['From'] = self.sender
+        msg['To'] = message['to']
+        self._throttle()
+        self.pool.send(msg)
+
+    def process(self, limit=None):
+        """Send the messages that are due (oldest first); returns how many were attempted"""
+        attempted = 0
+        for name in sorted(os.listdir(os.path.join(self.directory, 'new'))):
+            if attempted == limit or limit is None and self._stopping.is_set():
+                break
+            message_id = name[:-len('.json')]
+            try:
+                with open(self._path('new', message_id)) as f:
+                    message = json.load(f)
+                if message['due'] > time.time():
+                    continue
+                os.rename(self._path('new', message_id), self._path('cur', message_id))
+            except (FileNotFoundError, ValueError):
+                continue  # claimed by another sender, or still being renamed into place
+            attempted += 1
+            try:
+                self._deliver(message)
+            except Exception as e:
+                message['attempts'] += 1
+                if message['attempts'] >= self.max_attempts:
+                    logger.error(f"Giving up on email to {message['to']} after {message['attempts']} attempts: {str(e)}")
+                    self._write('failed', message)
+                else:
+                    message['due'] = time.time() + self.retry_delay * 2 ** (message['attempts'] - 1)
+                    logger.warning(f"Email to {message['to']} failed (attempt {message['attempts']}), retrying: {str(e)}")
+                    self._write('new', message)
+            else:
+                self.sent += 1
+                logger.info(f"Email sent successfully to {message['to']}")
+            os.remove(self._path('cur', message_id))
+        return attempted
+
+    def recover(self):
+        """Return messages claimed by senders that died to new/"""
+        cur_dir = os.path.join(self.directory, 'cur')
+        for name in os.listdir(cur_dir):
+            path = os.path.join(cur_dir, name)
+            try:
+                if time.time() - os.path.getmtime(path) > STALE_CLAIM_SECONDS:
+                    os.rename(path, os.path.join(self.directory, 'new', name))
+                    logger.warning(f"Requeued stale outbox message {name}")
+            except FileNotFoundError:
+                pass
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                if self.process():
+                    continue
+            except Exception as e:
+                logger.error(f"Outbox sender error: {str(e)}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self):
+        """Start the sender threads (once); enqueue() calls this"""
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self.recover()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'outbox-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            atexit.register(self.close)
+
+    def close(self, timeout=10.0):
+        """Stop the senders, then send what is due before exiting; the rest stays in the outbox"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self.process(limit=1):
+            pass
+        self.pool.close()
@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import tempfile
+import logging
+from datetime import datetime
+import numpy as np
+from src.registry import REGISTRY_DIR, ModelVersion, current_version_id, publish_version
+
+logger = logging.getLogger('workout_app')
+
+CHECKPOINT_PATH = 'models/online_checkpoint.json'
+PAGE_SIZE = 500
+BATCH_SIZE = 1024
+
+
+def version_stats(version):
+    """Running statistics of a version, estimated for versions published without them"""
+    stats = version.manifest.get('stats') or {}
+    n_clusters = len(version.centers)
+    n_samples_seen = stats.get('n_samples_seen') or version.manifest.get('summary', {}).get('total_samples') or n_clusters
+    scaler_var = stats.get('scaler_var')
+    if scaler_var is None:
+        scaler_var = np.asarray(version.scaler_scale, dtype=np.float64) ** 2
+    cluster_counts = stats.get('cluster_counts')
+    if cluster_counts is None:
+        cluster_counts = np.full(n_clusters, n_samples_seen / n_clusters)
+    return int(n_samples_seen), np.asarray(scaler_var, dtype=np.float64), np.asarray(cluster_counts, dtype=np.float64)
+
+
+def update_scaler(mean, var, n_samples_seen, features):
+    """Combine the scaler's running mean/variance with new rows (Chan et al. parallel update)"""
+    n_new = len(features)
+    if n_new == 0:
+        return mean, var, n_samples_seen
+    new_mean = features.mean(axis=0)
+    new_var = features.var(axis=0)
+    total = n_samples_seen + n_new
+    delta = new_mean - mean
+    combined_mean = mean + delta * n_new / total
+    combined_var = (var * n_samples_seen + new_var * n_new + delta ** 2 * n_samples_seen * n_new / total) / total
+    return combined_mean, combined_var, total
+
+
+def scale_from_var(var):
+    """StandardScaler's scale_: sqrt of the variance, with 1 for constant features"""
+    scale = np.sqrt(var)
+    return np.where(scale < 10 * np.finfo(scale.dtype).eps, 1.0, scale)
+
+
+def update_centers(centers, counts, points, batch_size=BATCH_SIZE):
+    """Mini-batch k-means steps: each center moves to the running mean of the points assigned to it"""
+    centers = np.array(centers, dtype=np.float64)
+    counts = np.array(counts, dtype=np.float64)
+    for start in range(0, len(points), batch_size):
+        batch = points[start:start + batch_size]
+        squared = (np.einsum('ij,ij->i', batch, batch)[:, None] + np.einsum('ij,ij->i', centers, centers)[None, :]
+                   - 2 * batch @ centers.T)
+        labels = squared.argmin(axis=1)
+        assigned = np.bincount(labels, minlength=len(centers))
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, batch)
+        moved = assigned > 0
+        counts[moved] += assigned[moved]
+        centers[moved] += (sums[moved] - assigned[moved, None] * centers[moved]) / counts[moved, None]
+    return centers, counts
+
+
+def update_model(version, features, batch_size=BATCH_SIZE):
+    """New centers and scaler statistics from a version plus raw feature rows
+
+    Centers are kept in raw feature units while they are updated, so moving the
+    scaler does not move the clusters; they are rescaled with the new scaler.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    n_samples_seen, var, counts = version_stats(version)
+    mean = np.asarray(version.scaler_mean, dtype=np.float64)
+    scale = np.asarray(version.scaler_scale, dtype=np.float64)
+    raw_centers = np.asarray(version.centers, dtype=np.float64) * scale + mean
+
+    raw_centers, counts = update_centers(raw_centers, counts, features, batch_size)
+    mean, var, n_samples_seen = update_scaler(mean, var, n_samples_seen, features)
+    scale = scale_from_var(var)
+    return {
+        'centers': (raw_centers - mean) / scale,
+        'scaler_mean': mean,
+        'scaler_scale': scale,
+        'stats': {'n_samples_seen': int(n_samples_seen), 'scaler_var': var.tolist(), 'cluster_counts': counts.tolist()}
+    }
+
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_checkpoint(checkpoint, path=CHECKPOINT_PATH):
+    """Write the checkpoint atomically"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.checkpoint-', dir=directory)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def fetch_plan_features(db, feature_names, checkpoint, page_size=PAGE_SIZE):
+    """Feature rows of plans created after the checkpoint, read in pages of page_size
+
+    Only user_data and created_at are fetched. Returns (features, checkpoint for
+    the last plan read, number of plans skipped for missing features).
+    """
+    plans = db.collection('plans')
+    query = plans.order_by('created_at').select(['user_data', 'created_at']).limit(page_size)
+    cursor = None
+    if checkpoint.get('last_plan_id'):
+        cursor = plans.document(checkpoint['last_plan_id']).get()
+        if not cursor.exists:
+            logger.warning(f"Checkpoint plan {checkpoint['last_plan_id']} is gone; resuming from its timestamp")
+            cursor = {'created_at': datetime.fromisoformat(checkpoint['last_created_at'])}
+
+    rows, skipped, last = [], 0, None
+    while True:
+        page = list((query.start_after(cursor) if cursor is not None else query).stream())
+        for doc in page:
+            user_data = doc.to_dict().get('user_data') or {}
+            try:
+                rows.append([float(user_data[name]) for name in feature_names])
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+        if page:
+            cursor = last = page[-1]
+        if len(page) < page_size:
+            break
+
+    if last is None:
+        return np.empty((0, len(feature_names))), checkpoint, skipped
+    created_at = last.to_dict().get('created_at')
+    new_checkpoint = {
+        'last_plan_id': last.id,
+        'last_created_at': created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at
+    }
+    return np.array(rows, dtype=np.float64).reshape(-1, len(feature_names)), new_checkpoint, skipped
+
+
+def run_online_update(db=None, registry_dir=REGISTRY_DIR, checkpoint_path=CHECKPOINT_PATH, min_samples=1,
+                      activate=True, page_size=PAGE_SIZE):
+    """Fold plans generated since the checkpoint into the active model and publish the result
+
+    Returns the new version id, or None when there were fewer than min_samples new plans.
+    """
+    try:
+        if db is None:
+            from src.resources import get_db
+            db = get_db()
+        version_id = current_version_id(registry_dir)
+        if version_id is None:
+            raise ValueError(f"No active model version in {registry_dir}")
+        version = ModelVersion.load(version_id, registry_dir)
+
+        checkpoint = load_checkpoint(checkpoint_path)
+        features, new_checkpoint, skipped = fetch_plan_features(db, version.feature_names, checkpoint, page_size)
+        logger.info(f"Online update: {len(features)} new plans since {checkpoint.get('last_created_at', 'the start')}"
+                    f" ({skipped} skipped)")
+        if len(features) < min_samples:
+            # Keep the checkpoint so the rows are counted toward the next run
+            return None
+
+        updated = update_model(version, features)
+        summary = dict(version.manifest.get('summary', {}))
+        summary.update({
+            'parent_version': version_id,
+            'online_update': {'new_samples': int(len(features)), 'skipped': skipped, **new_checkpoint},
+            'total_samples': updated['stats']['n_samples_seen']
+        })
+        new_version_id = publish_version(updated['centers'], updated['scaler_mean'], updated['scaler_scale'],
+                                         version.feature_names, summary, registry_dir, activate, updated['stats'])
+        save_checkpoint(dict(new_checkpoint, version=new_version_id), checkpoint_path)
+        logger.info(f"Online update published {new_version_id} from {version_id}")
+        return new_version_id
+    except Exception as e:
+        logger.error(f"Error running online model update: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    # python -m src.online_update [min_samples]   (from the backend directory)
+    logging.basicConfig(level=logging.INFO)
+    run_online_update(min_samples=int(sys.argv[1]) if len(sys.argv) > 1 else 1)
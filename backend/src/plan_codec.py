@@ -0,0 +1,124 @@
+import logging
+from src.planner import DAY_TYPES, REST, MACRO_RATIOS
+
+logger = logging.getLogger('workout_app')
+
+# Stored on plan documents whose workout and nutrition bodies are compact
+PLAN_FORMAT = 'compact-v1'
+
+
+def select_exercise_ids(equipment, level, catalog):
+    """Catalog row ids of the top rated exercises per workout type"""
+    return {
+        workout_type: [ex['id'] for ex in catalog.exercises(equipment, level, workout_type, limit=3)]
+        for workout_type in DAY_TYPES
+    }
+
+
+def encode_workout_plan(day_codes, equipment, level, intensity, catalog):
+    """Compact workout plan: a day code per day plus catalog row ids per workout type
+
+    Row ids only mean something for the catalog they came from, so its
+    version is stored alongside them.
+    """
+    return {
+        'days': [int(code) for code in day_codes],
+        'exercise_ids': select_exercise_ids(equipment, level, catalog),
+        'catalog_version': catalog.version,
+        'equipment': equipment,
+        'level': level,
+        'intensity': intensity
+    }
+
+
+def hydrate_workout_plan(compact, catalog):
+    """Expand a compact workout plan into the per-day plan with full exercise text
+
+    If the plan was encoded against another catalog version (workouts.csv was
+    regenerated), its row ids may now name other exercises; the exercises are
+    selected again from the current catalog by equipment, level and type.
+    """
+    intensity = compact['intensity']
+    exercise_ids = compact['exercise_ids']
+    if compact.get('catalog_version') != catalog.version:
+        logger.warning(f"Plan encoded for catalog {compact.get('catalog_version')}, serving {catalog.version}; "
+                       f"selecting exercises again")
+        exercise_ids = select_exercise_ids(compact['equipment'], compact['level'], catalog)
+    exercises_by_type = {}
+    for workout_type, row_ids in exercise_ids.items():
+        exercises_by_type[workout_type] = (
+            [{
+                'name': ex['name'], 'desc': ex['desc'], 'equipment': ex['equipment'],
+                'sets': 3, 'reps': 12 if workout_type == 'Strength' else 30, 'rating': ex['rating'],
+                'intensity': intensity
+            } for ex in (catalog.record(row_id) for row_id in row_ids)] if row_ids else
+            [{'name': f'Basic {workout_type}', 'desc': 'Bodyweight exercise', 'equipment': 'Body Only',
+              'sets': 3, 'reps': 12, 'rating': 0, 'intensity': intensity}]
+        )
+
+    plan = {}
+    for day, code in enumerate(compact['days'], start=1):
+        if code == REST:
+            plan[str(day)] = {'type': 'Rest', 'exercises': [], 'intensity': 'low', 'notes': 'Focus on recovery'}
+        else:
+            workout_type = DAY_TYPES[code]
+            plan[str(day)] = {
+                'type': workout_type, 'exercises': [dict(ex) for ex in exercises_by_type[workout_type]],
+                'intensity': intensity, 'notes': 'Focus on form'
+            }
+    return plan
+
+
+def workout_overview(compact):
+    """Workout and rest day counts straight from a compact workout plan"""
+    rest_days = sum(1 for code in compact['days'] if code == REST)
+    return {'total_days': len(compact['days']), 'workout_days': len(compact['days']) - rest_days, 'rest_days': rest_days}
+
+
+def encode_nutrition_plan(daily_targets, meals_per_day, diet_type, macro_preference):
+    """Compact nutrition plan: daily targets only, meals are derived on hydration"""
+    return {
+        'daily_targets': daily_targets,
+        'meals_per_day': meals_per_day,
+        'diet_type': diet_type,
+        'macro_preference': macro_preference
+    }
+
+
+def build_nutrition_plan(daily_targets, meals_per_day, diet_type, macro_ratios):
+    """Split daily targets across meals and compile the nutrition plan"""
+    meal_names = ['Breakfast', 'Lunch', 'Dinner'][:meals_per_day] if meals_per_day <= 3 else \
+                 ['Breakfast', 'Snack 1', 'Lunch', 'Snack 2', 'Dinner'][:meals_per_day]
+    meals = {
+        name: {
+            'calories': daily_targets['calories'] / meals_per_day,
+            'protein': daily_targets['protein'] / meals_per_day,
+            'carbs': daily_targets['carbs'] / meals_per_day,
+            'fat': daily_targets['fat'] / meals_per_day,
+            'fiber': daily_targets['fiber'] / meals_per_day
+        } for name in meal_names
+    }
+    return {
+        'daily_targets': daily_targets,
+        'meals': meals,
+        'diet_type': diet_type,
+        'macro_split': macro_ratios
+    }
+
+
+def hydrate_nutrition_plan(compact):
+    """Expand a compact nutrition plan into the full per-meal plan"""
+    return build_nutrition_plan(
+        compact['daily_targets'], compact['meals_per_day'], compact['diet_type'],
+        MACRO_RATIOS[compact['macro_preference']]
+    )
+
+
+def hydrate_plan(plan, catalog):
+    """Plan document with full workout and nutrition bodies; older full documents pass through"""
+    if plan.get('plan_format') != PLAN_FORMAT:
+        return plan
+    hydrated = dict(plan)
+    hydrated['workout_plan'] = hydrate_workout_plan(plan['workout_plan'], catalog)
+    hydrated['nutrition_plan'] = hydrate_nutrition_plan(plan['nutrition_plan'])
+    return hydrated
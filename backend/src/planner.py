@@ -0,0 +1,88 @@
+import secrets
+
+# numpy is imported inside the functions so that importing the plan constants
+# (as src.app and src.plan_codec do) stays cheap for routes that never plan
+
+TOTAL_DAYS = 30
+DAY_TYPES = ['Cardio', 'Strength', 'Flexibility']
+DAY_TYPE_P = [0.4, 0.4, 0.2]
+REST = -1  # day code for rest days
+
+MACRO_RATIOS = {
+    'balanced': {'protein': 0.3, 'carbs': 0.4, 'total_fat': 0.3},
+    'high_protein': {'protein': 0.4, 'carbs': 0.4, 'total_fat': 0.2},
+    'low_carb': {'protein': 0.5, 'carbs': 0.1, 'total_fat': 0.4},
+    'high_carb': {'protein': 0.3, 'carbs': 0.5, 'total_fat': 0.2}
+}
+
+
+def rest_day_counts(days_per_week, fitness_level):
+    """Number of rest days in the 30 day plan for each user"""
+    import numpy as np
+    days_per_week = np.minimum(np.asarray(days_per_week, dtype=float), 7)
+    fitness_level = np.asarray(fitness_level)
+
+    total_workout_days = (TOTAL_DAYS / 7) * days_per_week
+    total_rest_days = TOTAL_DAYS - total_workout_days
+    # Beginners get two extra rest days, experts two fewer
+    total_rest_days = np.where(
+        fitness_level == 1, np.minimum(total_rest_days + 2, TOTAL_DAYS - 5),
+        np.where(fitness_level == 3, np.maximum(total_rest_days - 2, 2), total_rest_days)
+    )
+    return np.clip(total_rest_days.astype(int), 0, TOTAL_DAYS)
+
+
+def draw_uniforms(rng, n_users):
+    """Random numbers consumed by schedule_days: one row of 2 x 30 per user"""
+    return rng.random((n_users, 2 * TOTAL_DAYS))
+
+
+def new_seed():
+    """Random seed stored on a plan; fits in a signed 64-bit Firestore integer"""
+    return secrets.randbits(63)
+
+
+def seeded_uniforms(seeds):
+    """Uniform rows drawn from one Generator per seed
+
+    Each row depends only on its own seed, so a plan generated in a batch can be
+    regenerated alone from (inputs, seed) and requests never share RNG state.
+    """
+    import numpy as np
+    return np.vstack([draw_uniforms(np.random.default_rng(seed), 1) for seed in seeds])
+
+
+def schedule_days(days_per_week, fitness_level, uniforms):
+    """Pick rest days and workout types for every user at once
+
+    Returns an (n_users, 30) array of day codes: REST or an index into DAY_TYPES.
+    The first 30 uniforms of a row rank the days (lowest ranks rest), the last
+    30 pick each day's type with DAY_TYPE_P.
+    """
+    import numpy as np
+    uniforms = np.asarray(uniforms)
+    rest_counts = rest_day_counts(days_per_week, fitness_level)
+
+    ranks = uniforms[:, :TOTAL_DAYS].argsort(axis=1).argsort(axis=1)
+    is_rest = ranks < rest_counts[:, None]
+
+    types = np.searchsorted(np.cumsum(DAY_TYPE_P), uniforms[:, TOTAL_DAYS:], side='right')
+    types = np.minimum(types, len(DAY_TYPES) - 1)
+    return np.where(is_rest, REST, types)
+
+
+def nutrition_targets(calories, macro_preference, diet_type):
+    """Daily calorie, macro and fiber targets for every user at once"""
+    import numpy as np
+    calories = np.asarray(calories, dtype=float)
+    ratios = {key: np.array([MACRO_RATIOS[pref][key] for pref in macro_preference])
+              for key in ('protein', 'carbs', 'total_fat')}
+    high_carb = np.asarray(diet_type) == 'high_carb'
+
+    return {
+        'calories': calories,
+        'protein': calories * ratios['protein'] / 4,  # 4 kcal/g for protein
+        'carbs': calories * ratios['carbs'] / 4,      # 4 kcal/g for carbs
+        'fat': calories * ratios['total_fat'] / 9,    # 9 kcal/g for fat
+        'fiber': calories * np.where(high_carb, 0.016, 0.014)
+    }
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+class CentroidPredictor:
+    """Nearest-centroid cluster assignment on raw (unscaled) features
+
+    StandardScaler is folded into the centroids: for x' = (x - mean) / scale,
+    ||x' - c||^2 = ||x'||^2 + bias - 2 x . w with w = c / scale and
+    bias = ||c||^2 + 2 mean . w. ||x'||^2 is the same for every centroid, so the
+    nearest one is argmin(bias - 2 x . w) and a prediction is one small matmul.
+    """
+
+    def __init__(self, centers, mean, scale, feature_names=None):
+        centers = np.asarray(centers, dtype=np.float64)
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+
+        weights = centers / scale
+        self.weights = np.ascontiguousarray((2 * weights).T)  # (n_features, n_clusters)
+        self.bias = (centers ** 2).sum(axis=1) + 2 * weights @ mean
+        self.n_clusters = centers.shape[0]
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    @classmethod
+    def from_sklearn(cls, model, scaler):
+        """Build from a fitted KMeans and the StandardScaler it was trained with"""
+        feature_names = getattr(scaler, 'feature_names_in_', None)
+        return cls(model.cluster_centers_, scaler.mean_, scaler.scale_, feature_names)
+
+    def predict(self, features):
+        """Cluster ids for a 2-D array of raw feature rows"""
+        features = np.asarray(features, dtype=np.float64)
+        return (self.bias - features @ self.weights).argmin(axis=1)
+
+    def predict_one(self, features):
+        """Cluster id for one raw feature vector (any float sequence)"""
+        return int((self.bias - np.asarray(features, dtype=np.float64) @ self.weights).argmin())
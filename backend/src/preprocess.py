@@ -1,13 +1,23 @@
-from sklearn.preprocessing import StandardScaler
 import pandas as pd
 import numpy as np
+import os
 import re
+import json
+import shutil
+import hashlib
 import logging
+import tempfile
+from datetime import datetime
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Preprocessed matrices are cached under CACHE_DIR/<key>, where the key hashes
+# the input files, this file's source and the pandas/numpy versions
+CACHE_DIR = os.getenv('FITGEN_PREPROCESS_CACHE', 'cache/preprocess')
+HASH_INDEX = 'file_hashes.json'
+
 def load_data(bmi_path, meals_path, nutrition_path, workouts_path):
     """Load all required datasets"""
     try:
@@ -38,8 +48,12 @@ def clean_bmi_data(bmi_df):
     
     return bmi_df
 
-def clean_workouts_data(workouts_df):
-    """Clean and process workouts data"""
+def clean_workouts_data(workouts_df, type_categories=None):
+    """Clean and process workouts data
+
+    type_categories fixes the Type_Code mapping (see workout_type_categories) so
+    chunks of a streamed file get the same codes as the whole file would.
+    """
     # Create a copy to avoid chained assignment warning
     df = workouts_df.copy()
     
@@ -48,7 +62,7 @@ def clean_workouts_data(workouts_df):
     df['Level_Numeric'] = df['Level'].map(level_map).fillna(1)
     
     # Convert type to categorical
-    df['Type_Code'] = pd.Categorical(df['Type']).codes
+    df['Type_Code'] = pd.Categorical(df['Type'], categories=type_categories).codes
     
     # Clean equipment field properly
     df['Equipment'] = df['Equipment'].fillna('bodyweight')
@@ -61,6 +75,14 @@ def clean_workouts_data(workouts_df):
     
     return df
 
+# extract_numeric's number pattern. QUANTITY_PATTERN applies it to one cell
+# per line of a newline-joined column: the lazy prefix makes the captured number
+# the leftmost match, as re.findall(...)[0] would return, and the unit suffix
+# after it is captured separately.
+NUMBER_PATTERN = r'[-+]?\d*\.\d+|\d+'
+QUANTITY_PATTERN = re.compile(
+    rf'^(?:[^\n]*?({NUMBER_PATTERN})[^\S\n]*((?i:mcg|mg|kcal|kj|g))?)?[^\n]*$', re.MULTILINE)
+
 def extract_numeric(value):
     """Extract numeric values from strings"""
     if isinstance(value, (int, float)):
@@ -68,12 +90,52 @@ def extract_numeric(value):
     
     if isinstance(value, str):
         # Extract numbers from string (including decimals)
-        matches = re.findall(r'[-+]?\d*\.\d+|\d+', value)
+        matches = re.findall(NUMBER_PATTERN, value)
         if matches:
             return float(matches[0])
     
     return 0.0  # Default value if no number found
 
+def parse_quantities(series):
+    """Vectorized extract_numeric over a column; returns (values, unit suffix counts)
+
+    A value is the first number in the cell ("12.5 g" -> 12.5, "0mg" -> 0.0)
+    and cells without a number become 0. The unit after the number ("g", "mg",
+    ...) is captured and counted, never used to rescale. Distinct strings are
+    parsed once, in a single regex pass over the newline-joined column, and
+    mapped back with their factorize codes; numeric columns are cast directly
+    and the rare non-string cells of text columns fall back to extract_numeric.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float), {}
+
+    raw = series.to_numpy(dtype=object)
+    is_str = np.fromiter((isinstance(value, str) for value in raw), dtype=bool, count=len(raw))
+    values = np.zeros(len(raw))
+    units = {}
+    if is_str.any():
+        codes, uniques = pd.factorize(raw[is_str])
+        uniques = list(uniques)
+        text = '\n'.join(uniques)
+        matches = QUANTITY_PATTERN.findall(text) if text.count('\n') == len(uniques) - 1 else None
+        if matches is not None and len(matches) == len(uniques):
+            unique_values = np.fromiter((float(number) if number else 0.0 for number, _ in matches),
+                                        dtype=float, count=len(uniques))
+            unit_codes = [unit.lower() for _, unit in matches]
+        else:
+            # A cell contains a newline; parse the distinct strings one by one
+            found = [QUANTITY_PATTERN.match(value.replace('\n', ' ')) for value in uniques]
+            unique_values = np.array([float(match.group(1)) if match.group(1) else 0.0 for match in found])
+            unit_codes = [(match.group(2) or '').lower() for match in found]
+        values[is_str] = unique_values[codes]
+        counts = np.bincount(codes, minlength=len(uniques))
+        for unit, count in zip(unit_codes, counts):
+            if unit:
+                units[unit] = units.get(unit, 0) + int(count)
+    if not is_str.all():
+        values[~is_str] = [extract_numeric(value) for value in raw[~is_str]]
+    return pd.Series(values, index=series.index, name=series.name), units
+
 def normalize_nutrition_data(nutrition_df):
     """Clean and normalize nutrition data"""
     columns_to_normalize = [
@@ -83,15 +145,21 @@ def normalize_nutrition_data(nutrition_df):
     
     for col in columns_to_normalize:
         if (col in nutrition_df.columns):
-            nutrition_df[col] = nutrition_df[col].apply(extract_numeric)
+            nutrition_df[col], units = parse_quantities(nutrition_df[col])
+            if len(units) > 1:
+                logger.warning(f"Column {col} mixes units {units}; values are used as written")
         else:
             logger.warning(f"Column {col} not found in nutrition data")
             nutrition_df[col] = 0
             
     return nutrition_df
 
-def combine_features(bmi_df, nutrition_df, workouts_df):
-    """Combine all features for clustering with proper alignment"""
+def combine_features(bmi_df, nutrition_df, workouts_df, fill_missing=True):
+    """Combine all features for clustering with proper alignment
+
+    With fill_missing=False NaNs are kept, for callers that fill them with
+    statistics of the whole dataset rather than of this frame.
+    """
     
     # Reset indices to ensure proper alignment
     bmi_df = bmi_df.reset_index(drop=True)
@@ -125,12 +193,49 @@ def combine_features(bmi_df, nutrition_df, workouts_df):
     })
     
     # Remove any remaining NaN values
-    features = features.fillna(features.mean())
+    if fill_missing:
+        features = features.fillna(features.mean())
     
     logger.info(f"Combined feature shape: {features.shape}")
     return features
 
-def preprocess_data(bmi_path, meals_path, nutrition_path, workouts_path):
+def workout_type_categories(workouts_path, chunksize=100000):
+    """Sorted workout types of the whole file, the categories pd.Categorical would infer"""
+    types = set()
+    for chunk in pd.read_csv(workouts_path, usecols=['Type'], chunksize=chunksize):
+        types.update(chunk['Type'].dropna().unique())
+    return sorted(types)
+
+def iter_feature_chunks(bmi_path, nutrition_path, workouts_path, chunksize=100000, type_categories=None):
+    """Yield combined feature frames (NaNs kept) from the CSVs read chunksize rows at a time
+
+    Each source is cleaned per chunk and rows are aligned by position after
+    cleaning, exactly as combine_features aligns the full tables; the stream
+    ends with the shortest source.
+    """
+    if type_categories is None:
+        type_categories = workout_type_categories(workouts_path, chunksize)
+    sources = [
+        (clean_bmi_data(chunk) for chunk in pd.read_csv(bmi_path, chunksize=chunksize)),
+        (normalize_nutrition_data(chunk) for chunk in pd.read_csv(nutrition_path, chunksize=chunksize)),
+        (clean_workouts_data(chunk, type_categories) for chunk in pd.read_csv(workouts_path, chunksize=chunksize))
+    ]
+    buffers = [pd.DataFrame() for _ in sources]
+    while True:
+        for i, source in enumerate(sources):
+            while len(buffers[i]) < chunksize:
+                chunk = next(source, None)
+                if chunk is None:
+                    break
+                buffers[i] = pd.concat([buffers[i], chunk]) if len(buffers[i]) else chunk
+
+        size = min(len(buffer) for buffer in buffers)
+        if size == 0:
+            return
+        yield combine_features(*(buffer.iloc[:size] for buffer in buffers), fill_missing=False)
+        buffers = [buffer.iloc[size:] for buffer in buffers]
+
+def _preprocess_uncached(bmi_path, meals_path, nutrition_path, workouts_path):
     """Main preprocessing function"""
     try:
         # Load data
@@ -151,7 +256,8 @@ def preprocess_data(bmi_path, meals_path, nutrition_path, workouts_path):
         # Combine features
         features = combine_features(bmi_df, nutrition_df, workouts_df)
         
-        # Scale features
+        # Scale features (sklearn is only needed here, so it is imported here)
+        from sklearn.preprocessing import StandardScaler
         scaler = StandardScaler()
         scaled_features = scaler.fit_transform(features)
         
@@ -165,6 +271,115 @@ def preprocess_data(bmi_path, meals_path, nutrition_path, workouts_path):
         logger.error(f"Error in preprocessing: {str(e)}")
         raise
 
+def file_sha256(path, cache_dir=CACHE_DIR):
+    """sha256 of a file, remembered per (path, size, mtime) so unchanged files are not re-read"""
+    stat = os.stat(path)
+    stamp = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    index_path = os.path.join(cache_dir, HASH_INDEX)
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        index = {}
+    if stamp in index:
+        return index[stamp]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    index[stamp] = digest.hexdigest()
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.hashes-', dir=cache_dir)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+    return index[stamp]
+
+def cache_key(paths, cache_dir=CACHE_DIR):
+    """Key for a preprocessing run: input file hashes, preprocessing code and library versions"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        code_hash = hashlib.sha256(f.read()).hexdigest()
+    parts = {
+        'inputs': [file_sha256(path, cache_dir) for path in paths],
+        'code': code_hash,
+        'pandas': pd.__version__,
+        'numpy': np.__version__
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()[:16], parts
+
+def save_preprocessed(directory, scaled_features, scaler, feature_names, metadata):
+    """Write the scaled matrix, scaler parameters and feature names as .npy files plus metadata.json"""
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.staging-', dir=parent)
+    arrays = {
+        'scaled_features': np.ascontiguousarray(scaled_features, dtype=np.float64),
+        'scaler_mean': scaler.mean_,
+        'scaler_var': scaler.var_,
+        'scaler_scale': scaler.scale_,
+        'feature_names': np.array([str(name) for name in feature_names])  # fixed-width unicode, no pickle
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f'{name}.npy'), array)
+    metadata = dict(metadata, shape=list(arrays['scaled_features'].shape),
+                    n_samples_seen=int(np.max(scaler.n_samples_seen_)), created_at=datetime.now().isoformat())
+    with open(os.path.join(staging, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    if os.path.exists(directory):
+        shutil.rmtree(staging)  # another run cached the same key first
+    else:
+        os.replace(staging, directory)
+
+def load_preprocessed(directory):
+    """Memory-mapped scaled matrix, a StandardScaler rebuilt from the cached arrays, and feature names"""
+    from sklearn.preprocessing import StandardScaler
+    with open(os.path.join(directory, 'metadata.json')) as f:
+        metadata = json.load(f)
+
+    def load(name, mmap_mode=None):
+        return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+
+    feature_names = pd.Index(load('feature_names').tolist())
+    scaler = StandardScaler()
+    scaler.mean_ = load('scaler_mean')
+    scaler.var_ = load('scaler_var')
+    scaler.scale_ = load('scaler_scale')
+    scaler.n_samples_seen_ = metadata['n_samples_seen']
+    scaler.n_features_in_ = len(feature_names)
+    scaler.feature_names_in_ = np.array(feature_names.tolist(), dtype=object)
+    return load('scaled_features', mmap_mode='r'), scaler, feature_names
+
+def preprocess_data(bmi_path, meals_path, nutrition_path, workouts_path, cache_dir=CACHE_DIR):
+    """Main preprocessing function, cached by content (cache_dir=None disables the cache)
+
+    On a hit the scaled matrix is memory-mapped read-only from the cache
+    instead of being rebuilt from the CSVs.
+    """
+    paths = [bmi_path, meals_path, nutrition_path, workouts_path]
+    if not cache_dir:
+        return _preprocess_uncached(*paths)
+
+    key, parts = cache_key(paths, cache_dir)
+    directory = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(directory, 'metadata.json')):
+        try:
+            cached = load_preprocessed(directory)
+            logger.info(f"Loaded preprocessed features from cache {directory}")
+            return cached
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable preprocessing cache {directory}: {str(e)}")
+            shutil.rmtree(directory, ignore_errors=True)
+
+    scaled_features, scaler, feature_names = _preprocess_uncached(*paths)
+    try:
+        save_preprocessed(directory, scaled_features, scaler, feature_names,
+                          dict(parts, paths=[os.path.abspath(path) for path in paths]))
+        logger.info(f"Cached preprocessed features in {directory}")
+    except OSError as e:
+        logger.warning(f"Could not cache preprocessed features: {str(e)}")
+    return scaled_features, scaler, feature_names
+
 if __name__ == "__main__":
     # Test preprocessing
     scaled_features, scaler, feature_names = preprocess_data(
@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+import logging
+from datetime import datetime
+import numpy as np
+
+logger = logging.getLogger('workout_app')
+
+REGISTRY_DIR = 'models/registry'
+CURRENT_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+ARRAY_NAMES = ('centers', 'scaler_mean', 'scaler_scale')
+
+def publish_version(centers, scaler_mean, scaler_scale, feature_names, summary=None,
+                    registry_dir=REGISTRY_DIR, activate=True, stats=None):
+    """Write a model version as plain .npy arrays plus a manifest; no pickles involved
+
+    stats holds the running statistics incremental updates continue from
+    (n_samples_seen, scaler_var, cluster_counts); see training_stats.
+    """
+    arrays = {
+        'centers': np.ascontiguousarray(centers, dtype=np.float64),
+        'scaler_mean': np.ascontiguousarray(scaler_mean, dtype=np.float64),
+        'scaler_scale': np.ascontiguousarray(scaler_scale, dtype=np.float64)
+    }
+    digest = hashlib.sha256()
+    for name in ARRAY_NAMES:
+        digest.update(arrays[name].tobytes())
+    digest.update(json.dumps(list(feature_names)).encode('utf-8'))
+    version_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{digest.hexdigest()[:8]}"
+
+    manifest = {
+        'version': version_id,
+        'created_at': datetime.now().isoformat(),
+        'sha256': digest.hexdigest(),
+        'n_clusters': int(arrays['centers'].shape[0]),
+        'feature_names': list(feature_names),
+        'summary': summary or {},
+        'stats': stats or {}
+    }
+
+    os.makedirs(registry_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.staging-', dir=registry_dir)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f'{name}.npy'), array)
+    with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    target = os.path.join(registry_dir, version_id)
+    if os.path.exists(target):
+        shutil.rmtree(staging)  # identical arrays already published this second
+    else:
+        os.replace(staging, target)
+    logger.info(f"Published model version {version_id}")
+
+    if activate:
+        activate_version(version_id, registry_dir)
+    return version_id
+
+def training_stats(scaler, labels, n_clusters):
+    """Running statistics of a fitted scaler and cluster assignment, for publish_version"""
+    return {
+        'n_samples_seen': int(np.max(scaler.n_samples_seen_)),
+        'scaler_var': np.asarray(scaler.var_, dtype=np.float64).tolist(),
+        'cluster_counts': np.bincount(np.asarray(labels), minlength=n_clusters).tolist()
+    }
+
+def publish_from_artifacts(model_dir='models', registry_dir=REGISTRY_DIR, activate=True):
+    """Publish the joblib model.pkl/scaler.pkl and model_summary.json written by train.py"""
+    import joblib
+    model = joblib.load(os.path.join(model_dir, 'model.pkl'))
+    scaler = joblib.load(os.path.join(model_dir, 'scaler.pkl'))
+    summary_path = os.path.join(model_dir, 'model_summary.json')
+    summary = None
+    if os.path.exists(summary_path):
+        with open(summary_path) as f:
+            summary = json.load(f)
+    return publish_version(model.cluster_centers_, scaler.mean_, scaler.scale_, scaler.feature_names_in_.tolist(),
+                           summary, registry_dir, activate,
+                           training_stats(scaler, model.labels_, len(model.cluster_centers_)))
+
+def activate_version(version_id, registry_dir=REGISTRY_DIR):
+    """Point CURRENT at a published version; the rename makes the switch atomic"""
+    if not os.path.exists(os.path.join(registry_dir, version_id, MANIFEST_FILE)):
+        raise ValueError(f"Model version {version_id} not found in {registry_dir}")
+    fd, tmp_path = tempfile.mkstemp(prefix='.current-', dir=registry_dir)
+    with os.fdopen(fd, 'w') as f:
+        f.write(version_id)
+    os.replace(tmp_path, os.path.join(registry_dir, CURRENT_FILE))
+    logger.info(f"Activated model version {version_id}")
+
+def current_version_id(registry_dir=REGISTRY_DIR):
+    """Version id in CURRENT, or None for an empty registry"""
+    try:
+        with open(os.path.join(registry_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def list_versions(registry_dir=REGISTRY_DIR):
+    """Published version ids, oldest first"""
+    if not os.path.isdir(registry_dir):
+        return []
+    return sorted(name for name in os.listdir(registry_dir)
+                  if os.path.exists(os.path.join(registry_dir, name, MANIFEST_FILE)))
+
+class ModelVersion:
+    """One loaded model version: arrays, manifest and (optionally) a predictor built from them"""
+
+    def __init__(self, version_id, centers, scaler_mean, scaler_scale, feature_names, manifest=None,
+                 predictor_factory=None):
+        self.version_id = version_id
+        self.centers = centers
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.feature_names = list(feature_names)
+        self.manifest = manifest or {'version': version_id, 'feature_names': self.feature_names}
+        self.predictor = (predictor_factory(centers, scaler_mean, scaler_scale, self.feature_names)
+                          if predictor_factory else None)
+
+    @classmethod
+    def load(cls, version_id, registry_dir=REGISTRY_DIR, predictor_factory=None):
+        """Memory-map a published version"""
+        version_dir = os.path.join(registry_dir, version_id)
+        with open(os.path.join(version_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        arrays = {name: np.load(os.path.join(version_dir, f'{name}.npy'), mmap_mode='r', allow_pickle=False)
+                  for name in ARRAY_NAMES}
+        return cls(version_id, arrays['centers'], arrays['scaler_mean'], arrays['scaler_scale'],
+                   manifest['feature_names'], manifest, predictor_factory)
+
+class ModelRegistry:
+    """Serves the active model version and hot reloads it when CURRENT changes
+
+    Callers take active() once per request and use that version throughout, so
+    a reload swaps the reference for new requests while in-flight ones finish on
+    the version they started with.
+    """
+
+    def __init__(self, registry_dir=REGISTRY_DIR, predictor_factory=None, reload_interval=5.0, fallback=None):
+        self.registry_dir = registry_dir
+        self.predictor_factory = predictor_factory
+        self.reload_interval = reload_interval
+        self.fallback = fallback  # served while the registry has no versions
+        self._active = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Load the version named in CURRENT if it differs from the active one"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version_id = current_version_id(self.registry_dir)
+            if version_id is None or (self._active is not None and self._active.version_id == version_id):
+                return self._active
+            version = ModelVersion.load(version_id, self.registry_dir, self.predictor_factory)
+            self._active = version  # single reference swap
+            logger.info(f"Serving model version {version_id}")
+            return version
+
+    def active(self):
+        """Active version, checking CURRENT at most every reload_interval seconds"""
+        if time.monotonic() - self._checked_at >= self.reload_interval and not self._lock.locked():
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Model reload failed, keeping current version: {str(e)}")
+        return self._active if self._active is not None else self.fallback
+
+if __name__ == "__main__":
+    # python src/registry.py publish | activate <version> | list
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    if command == 'publish':
+        print(publish_from_artifacts())
+    elif command == 'activate':
+        activate_version(sys.argv[2])
+    else:
+        current = current_version_id()
+        for version_id in list_versions():
+            print(f"{'*' if version_id == current else ' '} {version_id}")
@@ -0,0 +1,246 @@
+import os
+import time
+import threading
+import logging
+
+# pandas, numpy, sklearn, firebase_admin and the model/catalog modules are
+# imported inside the factories below, so importing this module (and src.app)
+# does not load the scientific stack or the Firebase SDK.
+logger = logging.getLogger('workout_app')
+
+# Heavy resources are built on first use instead of at import, so cold starts
+# (serverless, worker recycling) only pay for what the first request needs.
+CACHE_DIR = os.getenv('FITGEN_CACHE_DIR', 'cache')
+FIREBASE_CREDENTIALS = os.getenv('FIREBASE_CREDENTIALS', 'hdproject-6e51c-firebase-adminsdk-4e5te-d7102a3fe3.json')
+
+
+class Lazy:
+    """Value built by a factory on first get(), once per process"""
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    started = time.perf_counter()
+                    self._value = self.factory()
+                    self._loaded = True
+                    logger.info(f"Initialized {self.name} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return self._value
+
+    def set(self, value):
+        """Install a prebuilt value (tests, benchmarks, stand-ins)"""
+        with self._lock:
+            self._value = value
+            self._loaded = True
+
+
+class ExpiringCache:
+    """Thread-safe key -> value map whose entries expire ttl seconds after they are set
+
+    Holds at most maxsize entries; when full, the entries closest to expiry
+    are dropped first.
+    """
+
+    def __init__(self, ttl, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Cached values for the keys that have one, as a dict"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        found[key] = entry[1]
+                    else:
+                        del self._entries[key]
+        return found
+
+    def set_many(self, values):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries.pop(key, None)  # re-insert so the dict stays in expiry order
+                self._entries[key] = (expires_at, value)
+            overflow = len(self._entries) - self.maxsize
+            if overflow > 0:
+                # Insertion order is expiry order, since every entry has the same ttl
+                for key in list(self._entries)[:overflow]:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _init_firebase():
+    import firebase_admin
+    from firebase_admin import credentials
+    return firebase_admin.initialize_app(credentials.Certificate(FIREBASE_CREDENTIALS))
+
+
+def _init_firestore():
+    from firebase_admin import firestore
+    return firestore.client(firebase_app.get())
+
+
+def _storage_backend():
+    return os.getenv('FITGEN_STORAGE', 'firestore').lower()
+
+
+def _init_storage():
+    # FITGEN_STORAGE=memory serves everything from process memory (load tests,
+    # benchmarks); the default stores users, plans and admins in Firestore
+    from src.storage import FirestoreStore, MemoryStore
+    backend = _storage_backend()
+    if backend == 'memory':
+        logger.warning("Using in-memory storage; data is lost when the process exits")
+        return MemoryStore()
+    if backend != 'firestore':
+        raise ValueError(f"Unknown FITGEN_STORAGE backend: {backend}")
+    return FirestoreStore(get_db)
+
+
+def _init_plan_writer():
+    # FITGEN_WRITE_BEHIND=1 stores generated plans from a background queue
+    # instead of on the request thread; None keeps writes synchronous
+    if os.getenv('FITGEN_WRITE_BEHIND', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+    from src.write_behind import WriteBehindQueue
+    return WriteBehindQueue(get_store(), maxsize=int(os.getenv('FITGEN_WRITE_BEHIND_QUEUE', 1000)),
+                            batch_size=int(os.getenv('FITGEN_WRITE_BEHIND_BATCH', 100)))
+
+
+def _init_outbox():
+    # Email goes through a spool directory drained by background senders on a
+    # pooled SMTP session; SMTP_HOST/SMTP_PORT/SMTP_STARTTLS=0 point it at the
+    # local stand-in (python -m benchmarks.smtp_server)
+    from src.mailer import SMTPPool, Outbox
+    sender = os.getenv('SMTP_EMAIL')
+    pool = SMTPPool(os.getenv('SMTP_HOST', 'smtp.gmail.com'), int(os.getenv('SMTP_PORT', 587)),
+                    sender, os.getenv('SMTP_PASSWORD'),
+                    starttls=os.getenv('SMTP_STARTTLS', '1').lower() not in ('0', 'false', 'no'))
+    return Outbox(os.getenv('FITGEN_OUTBOX_DIR', 'outbox'), pool, sender,
+                  rate=float(os.getenv('FITGEN_MAIL_RATE', 5)))
+
+
+def _attach_shared_state():
+    # Workers started through gunicorn.conf.py attach to the model parameters and
+    # workout catalog the master wrote once, instead of loading private copies
+    directory = os.getenv('FITGEN_SHARED_STATE')
+    if not directory:
+        return None
+    from src.shared_state import SharedState
+    return SharedState.attach(directory)
+
+
+def _load_catalog():
+    shared_state = get_shared_state()
+    if shared_state is not None:
+        return shared_state.catalog
+    from src.catalog import WORKOUTS_PATH
+    from src.shared_state import load_cached_catalog
+    return load_cached_catalog(WORKOUTS_PATH, CACHE_DIR)
+
+
+def _load_legacy_model():
+    """joblib (or shared-state) model, served only while the registry is empty"""
+    from src.predictor import CentroidPredictor
+    from src.registry import ModelVersion
+    shared_state = get_shared_state()
+    if shared_state is not None:
+        return ModelVersion('legacy', shared_state.centers, shared_state.scaler_mean, shared_state.scaler_scale,
+                            shared_state.feature_names, predictor_factory=CentroidPredictor)
+    import joblib
+    model = joblib.load('models/model.pkl')
+    scaler = joblib.load('models/scaler.pkl')
+    logger.info(f"Scaler expected feature names: {scaler.feature_names_in_}")
+    return ModelVersion('legacy', model.cluster_centers_, scaler.mean_, scaler.scale_,
+                        scaler.feature_names_in_.tolist(), predictor_factory=CentroidPredictor)
+
+
+def _load_model_registry():
+    # Published model versions under models/registry are hot reloaded
+    from src.predictor import CentroidPredictor
+    from src.registry import REGISTRY_DIR, ModelRegistry, current_version_id
+    registry_dir = os.getenv('FITGEN_MODEL_REGISTRY', REGISTRY_DIR)
+    fallback = None if current_version_id(registry_dir) else _load_legacy_model()
+    return ModelRegistry(registry_dir, predictor_factory=CentroidPredictor,
+                         reload_interval=float(os.getenv('FITGEN_MODEL_RELOAD_SECONDS', 5)), fallback=fallback)
+
+
+# user_id -> user_name, shared by coach requests; names change rarely and a
+# stale one only shows in the dashboard for the TTL
+user_names = ExpiringCache(float(os.getenv('FITGEN_USER_NAME_TTL', 60)))
+
+shared_state = Lazy('shared state', _attach_shared_state)
+firebase_app = Lazy('firebase', _init_firebase)
+firestore_db = Lazy('firestore client', _init_firestore)
+storage = Lazy('storage', _init_storage)
+plan_writer = Lazy('plan writer', _init_plan_writer)
+outbox = Lazy('outbox', _init_outbox)
+workout_catalog = Lazy('workout catalog', _load_catalog)
+model_registry = Lazy('model registry', _load_model_registry)
+
+
+def get_shared_state():
+    return shared_state.get()
+
+
+def get_db():
+    return firestore_db.get()
+
+
+def get_auth():
+    """firebase_admin.auth, once the default Firebase app is initialized
+
+    With FITGEN_STORAGE=memory it is the store's in-memory stand-in instead;
+    otherwise the store is left alone, so /login only initializes Firebase.
+    """
+    if _storage_backend() == 'memory':
+        return get_store().auth
+    firebase_app.get()
+    from firebase_admin import auth
+    return auth
+
+
+def get_store():
+    return storage.get()
+
+
+def get_outbox():
+    return outbox.get()
+
+
+def get_plan_writer():
+    """Write-behind queue for generated plans, or None when writes are synchronous"""
+    return plan_writer.get()
+
+
+def server_timestamp():
+    """Value the store records as the write time (Firestore's SERVER_TIMESTAMP sentinel)"""
+    return get_store().timestamp()
+
+
+def get_catalog():
+    return workout_catalog.get()
+
+
+def get_model_registry():
+    return model_registry.get()
@@ -0,0 +1,125 @@
+import os
+import json
+import shutil
+import tempfile
+import logging
+import numpy as np
+from src.catalog import WORKOUTS_PATH, WorkoutCatalog, ArrayWorkoutCatalog
+from src.predictor import CentroidPredictor
+
+logger = logging.getLogger('workout_app')
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def save_arrays(directory, arrays, manifest):
+    """Write arrays as .npy files plus a manifest, swapping the directory in atomically
+
+    The directory is staged next to the target and renamed into place, so
+    readers never attach to a half-written state; processes that already
+    mapped the old files keep their mappings.
+    """
+    manifest = dict(manifest, arrays=sorted(arrays))
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.staging-', dir=parent)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f'{name}.npy'), np.ascontiguousarray(array))
+    with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+
+    retired = None
+    if os.path.exists(directory):
+        retired = tempfile.mkdtemp(prefix='.retired-', dir=parent)
+        os.replace(directory, os.path.join(retired, 'state'))
+    os.replace(staging, directory)
+    if retired:
+        shutil.rmtree(retired, ignore_errors=True)
+    return directory
+
+
+def load_arrays(directory):
+    """Manifest and read-only memory maps of the arrays written by save_arrays"""
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+              for name in manifest['arrays']}
+    return manifest, arrays
+
+
+def build_shared_state(directory, model, scaler, catalog):
+    """Write cluster centers, scaler parameters and the workout catalog as .npy files"""
+    arrays, catalog_keys = catalog.to_arrays()
+    arrays.update({
+        'centers': np.asarray(model.cluster_centers_, dtype=np.float64),
+        'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64),
+        'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64)
+    })
+    manifest = {
+        'feature_names': scaler.feature_names_in_.tolist(),
+        'n_clusters': int(model.n_clusters),
+        'catalog_keys': catalog_keys
+    }
+    save_arrays(directory, arrays, manifest)
+    logger.info(f"Shared state written to {directory}: {len(arrays)} arrays")
+    return os.path.abspath(directory)
+
+
+def build_from_artifacts(directory, model_path='models/model.pkl', scaler_path='models/scaler.pkl',
+                         workouts_path=WORKOUTS_PATH):
+    """Load the trained artifacts and workouts.csv once and write the shared state"""
+    import joblib
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    return build_shared_state(directory, model, scaler, WorkoutCatalog.from_csv(workouts_path))
+
+
+def load_cached_catalog(workouts_path=WORKOUTS_PATH, cache_dir='cache'):
+    """Workout catalog from a binary array cache keyed by the CSV's size and mtime
+
+    The first load parses and indexes the CSV and writes the arrays; later
+    cold starts only memory-map them.
+    """
+    stat = os.stat(workouts_path)
+    directory = os.path.join(cache_dir, f'catalog-{stat.st_size}-{stat.st_mtime_ns}')
+    if not os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        catalog = WorkoutCatalog.from_csv(workouts_path)
+        arrays, catalog_keys = catalog.to_arrays()
+        save_arrays(directory, arrays, {'catalog_keys': catalog_keys, 'source': workouts_path})
+        logger.info(f"Cached workout catalog in {directory}")
+        return catalog
+    manifest, arrays = load_arrays(directory)
+    return ArrayWorkoutCatalog(arrays, manifest['catalog_keys'])
+
+
+class SharedState:
+    """Read-only view of a shared state directory; arrays are memory-mapped, not copied"""
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.arrays = arrays
+        self.feature_names = manifest['feature_names']
+        self.n_clusters = manifest['n_clusters']
+        self.centers = arrays['centers']
+        self.scaler_mean = arrays['scaler_mean']
+        self.scaler_scale = arrays['scaler_scale']
+        self.catalog = ArrayWorkoutCatalog(arrays, manifest['catalog_keys'])
+
+    @classmethod
+    def attach(cls, directory):
+        """Map every array in the directory read-only"""
+        manifest, arrays = load_arrays(directory)
+        logger.info(f"Attached shared state from {directory}")
+        return cls(manifest, arrays)
+
+    @property
+    def predictor(self):
+        """Nearest-centroid predictor over the mapped centers and scaler parameters"""
+        return CentroidPredictor(self.centers, self.scaler_mean, self.scaler_scale, self.feature_names)
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    build_from_artifacts(sys.argv[1] if len(sys.argv) > 1 else 'shared_state')
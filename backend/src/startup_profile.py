@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import time
+import builtins
+import logging
+import threading
+import importlib.util
+
+logger = logging.getLogger('workout_app')
+
+# FITGEN_PROFILE_STARTUP=1 turns the profiler on; FITGEN_PROFILE_REPORT=<path>
+# also writes the report as JSON once the first request has been served.
+PROFILE_ENV = 'FITGEN_PROFILE_STARTUP'
+REPORT_ENV = 'FITGEN_PROFILE_REPORT'
+
+_profiler = None
+
+
+class ImportProfiler:
+    """Times first-time imports by wrapping builtins.__import__, like python -X importtime
+
+    Every import statement that loads a module not yet in sys.modules gets a
+    cumulative time and a self time (cumulative minus the imports it triggered),
+    so self times add up to the total without double counting.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = {}  # module -> {'self_ms', 'cumulative_ms'}
+        self.first_request_started_ms = None
+        self.first_request_ms = None
+        self._stack = []
+        self._original_import = None
+
+    def install(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import or builtins.__import__
+        if threading.current_thread() is not threading.main_thread():
+            return original(name, globals, locals, fromlist, level)
+        module = _resolve(name, globals, level)
+        if module is None or module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)  # time spent in nested imports
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = (time.perf_counter() - started) * 1000
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += cumulative
+            self.timings[module] = {'self_ms': cumulative - nested, 'cumulative_ms': cumulative}
+
+    def report(self, top=20):
+        """Slowest modules, self time per top-level package and the startup timings"""
+        packages = {}
+        for module, timing in self.timings.items():
+            package = module.split('.')[0]
+            packages[package] = packages.get(package, 0.0) + timing['self_ms']
+        slowest = sorted(self.timings.items(), key=lambda item: item[1]['cumulative_ms'], reverse=True)[:top]
+        return {
+            'import_ms': sum(timing['self_ms'] for timing in self.timings.values()),
+            'first_request_started_ms': self.first_request_started_ms,
+            'first_request_ms': self.first_request_ms,
+            'modules': [{'module': module, **timing} for module, timing in slowest],
+            'packages': dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top])
+        }
+
+
+def _resolve(name, globals, level):
+    """Absolute module name an import statement refers to"""
+    if level == 0:
+        return name
+    try:
+        package = (globals or {}).get('__package__') or (globals or {}).get('__name__', '')
+        return importlib.util.resolve_name('.' * level + name, package)
+    except (ImportError, ValueError):
+        return None
+
+
+def install_from_env():
+    """Start profiling imports if FITGEN_PROFILE_STARTUP is set; returns the profiler or None"""
+    global _profiler
+    if _profiler is None and os.getenv(PROFILE_ENV, '').lower() in ('1', 'true', 'yes'):
+        _profiler = ImportProfiler().install()
+    return _profiler
+
+
+def attach(app):
+    """Record time to first request on the app and log the startup report after it"""
+    if _profiler is None:
+        return
+
+    @app.before_request
+    def _mark_first_request():
+        if _profiler.first_request_started_ms is None:
+            _profiler.first_request_started_ms = _profiler.elapsed_ms()
+
+    @app.after_request
+    def _report_first_request(response):
+        if _profiler.first_request_ms is None:
+            _profiler.first_request_ms = _profiler.elapsed_ms()
+            _profiler.uninstall()
+            log_report(_profiler.report())
+        return response
+
+
+def log_report(report):
+    """Log the startup report and write it to FITGEN_PROFILE_REPORT if set"""
+    logger.info(f"Startup profile: imports {report['import_ms']:.1f} ms, "
+                f"first request served {report['first_request_ms']:.1f} ms after startup")
+    for package, self_ms in report['packages'].items():
+        logger.info(f"Startup profile: {package:30} {self_ms:8.1f} ms")
+    path = os.getenv(REPORT_ENV)
+    if path:
+        try:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            logger.error(f"Error writing startup profile to {path}: {str(e)}")
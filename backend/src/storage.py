@@ -0,0 +1,342 @@
+import copy
+import uuid
+import threading
+import logging
+from datetime import datetime, timezone
+
+logger = logging.getLogger('workout_app')
+
+# Routes read and write users, plans and admins through a store instead of the
+# Firestore client. FirestoreStore is the production backend; MemoryStore keeps
+# everything in process (FITGEN_STORAGE=memory) so the API can be load tested
+# and benchmarked on one machine; it carries a MemoryAuth (store.auth) that
+# get_auth() returns in place of Firebase Authentication, so no Firebase
+# project is needed at all. Both stores expose the same repositories:
+#
+#   store.users / store.plans / store.admins / store.coach_emails
+#       get(id, fields) -> dict or None      get_many(ids, fields) -> {id: dict}
+#       find(filters, order_by, descending, fields, limit, after) -> [(id, dict)]
+#       page(...) -> ([(id, dict)], next_cursor)
+#       add(data) -> id, new_id(), set(id, data, merge), update(id, data), delete(id)
+#   store.batch() -> set/update/delete(repository, id, ...) then commit()
+#   store.timestamp() -> value stored for "now" (Firestore's SERVER_TIMESTAMP)
+#
+# Filters are equality filters; order_by '__name__' orders by document id.
+# Queries that need a composite index are listed in firestore.indexes.json at
+# the repository root; without it find() raises MissingIndexError.
+COLLECTIONS = ('users', 'plans', 'admins', 'coach_emails')
+MAX_BATCH_WRITES = 500  # Firestore's limit per commit
+
+
+class MissingIndexError(RuntimeError):
+    """The backend cannot run a query until its composite index is created"""
+
+
+class Repository:
+    """Operations shared by both backends, built on find()"""
+
+    def page(self, filters=None, order_by='__name__', descending=False, fields=None, limit=20, cursor=None):
+        """One page of find() results and the cursor (last document id) for the next page, or None
+
+        Reads limit + 1 documents to know whether another page exists.
+        """
+        rows = self.find(filters, order_by, descending, fields, limit + 1, after=cursor)
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def find_one(self, filters, fields=None):
+        """(id, data) of the first document matching filters, or None"""
+        rows = self.find(filters, fields=fields, limit=1)
+        return rows[0] if rows else None
+
+
+class FirestoreRepository(Repository):
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    @property
+    def collection(self):
+        return self.store.db.collection(self.name)
+
+    def get(self, doc_id, fields=None):
+        ref = self.collection.document(doc_id)
+        doc = ref.get() if fields is None else ref.get(field_paths=fields)
+        return doc.to_dict() if doc.exists else None
+
+    def get_many(self, doc_ids, fields=None):
+        """Documents by id in one batched read; missing ids are left out"""
+        collection = self.collection
+        refs = [collection.document(doc_id) for doc_id in dict.fromkeys(doc_ids)]
+        if not refs:
+            return {}
+        docs = self.store.db.get_all(refs) if fields is None else self.store.db.get_all(refs, field_paths=fields)
+        return {doc.id: doc.to_dict() or {} for doc in docs if doc.exists}
+
+    def find(self, filters=None, order_by=None, descending=False, fields=None, limit=None, after=None):
+        collection = self.collection
+        query = collection
+        for field, value in (filters or {}).items():
+            query = query.where(field, '==', value)
+        if order_by is not None:
+            query = query.order_by(order_by, direction='DESCENDING' if descending else 'ASCENDING')
+        if fields is not None:
+            query = query.select(fields)
+        if after:
+            # Resume after the cursor document, read with only the ordering field
+            cursor_fields = [] if order_by in (None, '__name__') else [order_by]
+            cursor_doc = collection.document(after).get(field_paths=cursor_fields)
+            if not cursor_doc.exists:
+                raise ValueError(f"Unknown cursor {after}")
+            query = query.start_after(cursor_doc)
+        if limit is not None:
+            query = query.limit(limit)
+        try:
+            return [(doc.id, doc.to_dict()) for doc in query.stream()]
+        except Exception as e:
+            from google.api_core.exceptions import FailedPrecondition
+            if isinstance(e, FailedPrecondition):
+                raise MissingIndexError(f"Query on {self.name} needs a composite index: {str(e)}") from e
+            raise
+
+    def new_id(self):
+        return self.collection.document().id
+
+    def add(self, data):
+        ref = self.collection.document()
+        ref.set(data)
+        return ref.id
+
+    def set(self, doc_id, data, merge=False):
+        self.collection.document(doc_id).set(data, merge=merge)
+
+    def update(self, doc_id, data):
+        self.collection.document(doc_id).update(data)
+
+    def delete(self, doc_id):
+        self.collection.document(doc_id).delete()
+
+
+class FirestoreBatch:
+    """Writes queued and committed as Firestore batches of up to 500 writes"""
+
+    def __init__(self, store):
+        self.store = store
+        self.writes = []
+
+    def set(self, repository, doc_id, data, merge=False):
+        self.writes.append(('set', repository, doc_id, data, merge))
+
+    def update(self, repository, doc_id, data):
+        self.writes.append(('update', repository, doc_id, data, None))
+
+    def delete(self, repository, doc_id):
+        self.writes.append(('delete', repository, doc_id, None, None))
+
+    def commit(self):
+        """Commit the queued writes; more than 500 go out as several commits. Returns the write count"""
+        db = self.store.db
+        for start in range(0, len(self.writes), MAX_BATCH_WRITES):
+            batch = db.batch()
+            for op, repository, doc_id, data, merge in self.writes[start:start + MAX_BATCH_WRITES]:
+                ref = db.collection(repository.name).document(doc_id)
+                if op == 'set':
+                    batch.set(ref, data, merge=merge)
+                elif op == 'update':
+                    batch.update(ref, data)
+                else:
+                    batch.delete(ref)
+            batch.commit()
+        count, self.writes = len(self.writes), []
+        return count
+
+
+class FirestoreStore:
+    def __init__(self, client_factory):
+        # The client is looked up on use, so it is only created by the first query
+        self._client_factory = client_factory
+        for name in COLLECTIONS:
+            setattr(self, name, FirestoreRepository(self, name))
+
+    @property
+    def db(self):
+        return self._client_factory()
+
+    def repository(self, name):
+        return FirestoreRepository(self, name)
+
+    def batch(self):
+        return FirestoreBatch(self)
+
+    def timestamp(self):
+        from firebase_admin import firestore
+        return firestore.SERVER_TIMESTAMP
+
+
+class MemoryRepository(Repository):
+    """Dict-backed collection; values are copied in and out like a real store would serialize them"""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        self.docs = {}
+
+    @staticmethod
+    def _project(data, fields):
+        if fields is None:
+            return copy.deepcopy(data)
+        return {field: copy.deepcopy(data[field]) for field in fields if field in data}
+
+    def get(self, doc_id, fields=None):
+        with self.store.lock:
+            data = self.docs.get(doc_id)
+            return None if data is None else self._project(data, fields)
+
+    def get_many(self, doc_ids, fields=None):
+        with self.store.lock:
+            return {doc_id: self._project(self.docs[doc_id], fields)
+                    for doc_id in dict.fromkeys(doc_ids) if doc_id in self.docs}
+
+    def _sort_key(self, order_by):
+        if order_by in (None, '__name__'):
+            return lambda item: item[0]
+        # Documents without the field sort first, like Firestore's null ordering
+        return lambda item: (item[1].get(order_by) is not None, item[1].get(order_by), item[0])
+
+    def find(self, filters=None, order_by=None, descending=False, fields=None, limit=None, after=None):
+        filters = filters or {}
+        key = self._sort_key(order_by)
+        with self.store.lock:
+            rows = sorted(((doc_id, data) for doc_id, data in self.docs.items()
+                           if all(data.get(field) == value for field, value in filters.items())),
+                          key=key, reverse=descending)
+            if after:
+                if after not in self.docs:
+                    raise ValueError(f"Unknown cursor {after}")
+                cursor_key = key((after, self.docs[after]))
+                rows = [row for row in rows if (key(row) < cursor_key if descending else key(row) > cursor_key)]
+            return [(doc_id, self._project(data, fields)) for doc_id, data in rows[:limit]]
+
+    def new_id(self):
+        return uuid.uuid4().hex[:20]
+
+    def add(self, data):
+        doc_id = self.new_id()
+        self.set(doc_id, data)
+        return doc_id
+
+    def set(self, doc_id, data, merge=False):
+        with self.store.lock:
+            current = self.docs.get(doc_id, {}) if merge else {}
+            self.docs[doc_id] = dict(current, **copy.deepcopy(data))
+
+    def update(self, doc_id, data):
+        with self.store.lock:
+            if doc_id not in self.docs:
+                raise KeyError(f"No document to update: {self.name}/{doc_id}")
+            # Replaced rather than updated in place, so a batch can roll back to its snapshot
+            self.docs[doc_id] = dict(self.docs[doc_id], **copy.deepcopy(data))
+
+    def delete(self, doc_id):
+        with self.store.lock:
+            self.docs.pop(doc_id, None)
+
+
+class MemoryBatch(FirestoreBatch):
+    def commit(self):
+        """Apply the queued writes atomically: all of them or, if an update fails, none"""
+        with self.store.lock:
+            snapshot = {name: dict(repository.docs) for name, repository in self.store.repositories.items()}
+            try:
+                for op, repository, doc_id, data, merge in self.writes:
+                    if op == 'set':
+                        repository.set(doc_id, data, merge)
+                    elif op == 'update':
+                        repository.update(doc_id, data)
+                    else:
+                        repository.delete(doc_id)
+            except Exception:
+                for name, docs in snapshot.items():
+                    self.store.repositories[name].docs = docs
+                raise
+        count, self.writes = len(self.writes), []
+        return count
+
+
+class MemoryAuth:
+    """The firebase_admin.auth calls the app makes, backed by a dict; passwords are not kept"""
+
+    class UserNotFoundError(LookupError):
+        pass
+
+    class EmailAlreadyExistsError(ValueError):
+        pass
+
+    class UserRecord:
+        def __init__(self, uid, email):
+            self.uid = uid
+            self.email = email
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}  # uid -> email
+
+    def _uid(self, email):
+        for uid, user_email in self.users.items():
+            if user_email.lower() == (email or '').lower():
+                return uid
+        raise self.UserNotFoundError(f"No user record found for the provided email: {email}")
+
+    def create_user(self, email, password=None):
+        with self.lock:
+            try:
+                self._uid(email)
+            except self.UserNotFoundError:
+                uid = uuid.uuid4().hex[:28]
+                self.users[uid] = email
+                return self.UserRecord(uid, email)
+            raise self.EmailAlreadyExistsError(f"The user with the provided email already exists: {email}")
+
+    def get_user_by_email(self, email):
+        with self.lock:
+            return self.UserRecord(self._uid(email), email)
+
+    def update_user(self, uid, email=None, password=None):
+        with self.lock:
+            if uid not in self.users:
+                raise self.UserNotFoundError(f"No user record found for the given identifier: {uid}")
+            if email is not None:
+                self.users[uid] = email
+            return self.UserRecord(uid, self.users[uid])
+
+    def delete_user(self, uid):
+        with self.lock:
+            self.users.pop(uid, None)
+
+    def generate_password_reset_link(self, email):
+        with self.lock:
+            self._uid(email)
+        return f"http://localhost:3000/reset-password?oobCode={uuid.uuid4().hex}"
+
+
+class MemoryStore:
+    """In-process store (and auth) for tests, benchmarks and load tests; data is lost on exit"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.repositories = {}
+        self.auth = MemoryAuth()
+        for name in COLLECTIONS:
+            setattr(self, name, self.repository(name))
+
+    def repository(self, name):
+        with self.lock:
+            if name not in self.repositories:
+                self.repositories[name] = MemoryRepository(self, name)
+            return self.repositories[name]
+
+    def batch(self):
+        return MemoryBatch(self)
+
+    def timestamp(self):
+        return datetime.now(timezone.utc)
@@ -1,27 +1,161 @@
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score  # Add this import
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
 import joblib
 import os
-from preprocess import preprocess_data
+import sys
+import csv
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from preprocess import preprocess_data, iter_feature_chunks, workout_type_categories
+from registry import publish_version, training_stats
 import logging
 import numpy as np
 import json
 from datetime import datetime
+from statistics import NormalDist
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Silhouette is estimated from at most this many points (exact below it); the
+# estimator is O(sample_size * n) time and O(chunk_size^2) memory instead of O(n^2)
+SILHOUETTE_SAMPLE_SIZE = 10000
+SILHOUETTE_CHUNK_SIZE = 1024
+
+def cluster_distance_sums(points, features, labels, n_clusters, chunk_size=SILHOUETTE_CHUNK_SIZE, sums=None):
+    """Add the distance from each point to every member of each cluster into sums
+
+    Works over chunk_size x chunk_size blocks, so it can be fed a dataset one
+    chunk of (features, labels) at a time.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    features = np.asarray(features, dtype=np.float64)
+    if sums is None:
+        sums = np.zeros((len(points), n_clusters))
+    point_norms = np.einsum('ij,ij->i', points, points)
+    feature_norms = np.einsum('ij,ij->i', features, features)
+    for start in range(0, len(points), chunk_size):
+        rows = slice(start, start + chunk_size)
+        for col_start in range(0, len(features), chunk_size):
+            cols = slice(col_start, col_start + chunk_size)
+            squared = point_norms[rows, None] + feature_norms[None, cols] - 2 * points[rows] @ features[cols].T
+            distances = np.sqrt(np.maximum(squared, 0))
+            one_hot = np.zeros((distances.shape[1], n_clusters))
+            one_hot[np.arange(distances.shape[1]), labels[cols]] = 1
+            sums[rows] += distances @ one_hot
+    return sums
+
+def silhouette_from_sums(sums, point_labels, counts, n_samples, exact, confidence=0.95):
+    """Mean silhouette (and confidence interval) from per-cluster distance sums of sampled points"""
+    rows = np.arange(len(point_labels))
+    own_size = counts[point_labels]
+    a = sums[rows, point_labels] / np.maximum(own_size - 1, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_to_other = np.where(counts > 0, sums / counts, np.inf)
+        mean_to_other[rows, point_labels] = np.inf
+        b = mean_to_other.min(axis=1)
+        values = (b - a) / np.maximum(a, b)
+    values = np.where(own_size > 1, np.nan_to_num(values), 0)  # singleton clusters score 0
+
+    score = float(values.mean())
+    if exact or len(values) < 2:
+        half_width = 0.0
+    else:
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        correction = np.sqrt((n_samples - len(values)) / (n_samples - 1))
+        half_width = float(z * values.std(ddof=1) / np.sqrt(len(values)) * correction)
+    return {
+        'score': score,
+        'ci_low': score - half_width,
+        'ci_high': score + half_width,
+        'confidence': confidence,
+        'sample_size': int(len(values)),
+        'exact': bool(exact)
+    }
+
+def silhouette_estimate(features, labels, sample_size=SILHOUETTE_SAMPLE_SIZE, chunk_size=SILHOUETTE_CHUNK_SIZE,
+                        confidence=0.95, random_state=0):
+    """Mean silhouette of a random sample of points, each scored against the full dataset
+
+    Distances are accumulated per cluster over blocks of chunk_size x chunk_size,
+    so memory stays bounded. With sample_size=None (or >= n) the score is exact
+    and matches sklearn's silhouette_score; otherwise it comes with a normal
+    confidence interval (finite population corrected) over the sampled points.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    n_samples = len(features)
+    _, labels = np.unique(np.asarray(labels), return_inverse=True)
+    n_clusters = int(labels.max()) + 1
+    counts = np.bincount(labels, minlength=n_clusters)
+
+    exact = sample_size is None or sample_size >= n_samples
+    if exact:
+        sample = np.arange(n_samples)
+    else:
+        sample = np.sort(np.random.default_rng(random_state).choice(n_samples, sample_size, replace=False))
+
+    sums = cluster_distance_sums(features[sample], features, labels, n_clusters, chunk_size)
+    return silhouette_from_sums(sums, labels[sample], counts, n_samples, exact, confidence)
+
+def cluster_statistics(scaled_features, labels, centers):
+    """Per-cluster size, mean, std dev, median and compactness in one grouped pass
+
+    Rows are sorted by label once and every statistic is a segment reduction
+    over the sorted matrix (medians partition each segment in place of a view),
+    so the cost does not grow with the number of clusters. Empty clusters get
+    NaN statistics, as np.mean/np.std/np.median of an empty selection would.
+    """
+    scaled_features = np.asarray(scaled_features, dtype=np.float64)
+    labels = np.asarray(labels)
+    centers = np.asarray(centers, dtype=np.float64)
+    n_clusters, n_features = centers.shape
+
+    order = np.argsort(labels, kind='stable')
+    sorted_labels = labels[order]
+    grouped = scaled_features[order]
+    sizes = np.bincount(labels, minlength=n_clusters)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    present = sizes > 0
+    segment_starts = starts[present]  # reduceat needs non-empty segments
+
+    def segment_sums(values):
+        sums = np.full((n_clusters,) + values.shape[1:], np.nan)
+        sums[present] = np.add.reduceat(values, segment_starts, axis=0)
+        return sums
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = segment_sums(grouped) / sizes[:, None]
+        deviations = grouped - means[sorted_labels]
+        std_devs = np.sqrt(segment_sums(deviations ** 2) / sizes[:, None])
+        distances = np.linalg.norm(grouped - centers[sorted_labels], axis=1)
+        compactness = segment_sums(distances) / sizes
+
+    # Medians: a partition of each contiguous segment (a view, no mask or copy of the matrix)
+    medians = np.full((n_clusters, n_features), np.nan)
+    for i in np.flatnonzero(present):
+        medians[i] = np.median(grouped[starts[i]:starts[i] + sizes[i]], axis=0)
+
+    return [{
+        'size': int(sizes[i]),
+        'std_dev': std_devs[i].tolist(),
+        'mean': means[i].tolist(),
+        'median': medians[i].tolist(),
+        'compactness': float(compactness[i])
+    } for i in range(n_clusters)]
+
 def analyze_clusters(kmeans, scaled_features, feature_names):
     """Analyze cluster characteristics"""
+    sizes = np.bincount(kmeans.labels_, minlength=kmeans.n_clusters)
     for i in range(kmeans.n_clusters):
-        # Get samples in this cluster
-        cluster_samples = scaled_features[kmeans.labels_ == i]
         cluster_center = kmeans.cluster_centers_[i]
         
         # Calculate cluster statistics
-        size = len(cluster_samples)
+        size = int(sizes[i])
         percentage = (size / len(scaled_features)) * 100
         
         logger.info(f"\nCluster {i} Analysis:")
@@ -30,7 +164,7 @@ def analyze_clusters(kmeans, scaled_features, feature_names):
         for feat, val in zip(feature_names, cluster_center):
             logger.info(f"- {feat}: {val:.2f}")
 
-def train_model(n_clusters=25):  # Changed from 30 to 25 for optimal performance
+def train_model(n_clusters=25, silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE):  # Changed from 30 to 25 for optimal performance
     """Train the KMeans model with optimized parameters"""
     try:
         # Get preprocessed features
@@ -57,14 +191,20 @@ def train_model(n_clusters=25):  # Changed from 30 to 25 for optimal performance
         # Fit the model
         kmeans.fit(scaled_features)
         
-        # Calculate quality metrics
-        silhouette = silhouette_score(scaled_features, kmeans.labels_)
+        # Calculate quality metrics (silhouette once, shared with the saved summary)
+        silhouette_stats = silhouette_estimate(scaled_features, kmeans.labels_, silhouette_sample_size)
+        silhouette = silhouette_stats['score']
         inertia = kmeans.inertia_
         
         # Log detailed metrics
         logger.info("\nModel Quality Metrics:")
         logger.info(f"Number of clusters: {n_clusters}")
-        logger.info(f"Silhouette Score: {silhouette:.3f}")
+        if silhouette_stats['exact']:
+            logger.info(f"Silhouette Score: {silhouette:.3f}")
+        else:
+            logger.info(f"Silhouette Score: {silhouette:.3f} "
+                        f"({silhouette_stats['confidence']:.0%} CI {silhouette_stats['ci_low']:.3f}-"
+                        f"{silhouette_stats['ci_high']:.3f}, {silhouette_stats['sample_size']} sampled points)")
         logger.info(f"Inertia: {inertia:.2f}")
         logger.info(f"Iterations to converge: {kmeans.n_iter_}")
         
@@ -74,7 +214,15 @@ def train_model(n_clusters=25):  # Changed from 30 to 25 for optimal performance
         joblib.dump(scaler, 'models/scaler.pkl')
         
         # Save detailed cluster analysis
-        analyze_and_save_clusters(kmeans, scaled_features, feature_names)
+        analyze_and_save_clusters(kmeans, scaled_features, feature_names, silhouette_stats)
+
+        # Publish a registry version; running workers hot reload it
+        with open('models/model_summary.json') as f:
+            summary = json.load(f)
+        version_id = publish_version(kmeans.cluster_centers_, scaler.mean_, scaler.scale_,
+                                     feature_names.tolist(), summary,
+                                     stats=training_stats(scaler, kmeans.labels_, n_clusters))
+        logger.info(f"Published model version {version_id}")
         
         return kmeans, scaler, silhouette
         
@@ -82,50 +230,329 @@ def train_model(n_clusters=25):  # Changed from 30 to 25 for optimal performance
         logger.error(f"Error training model: {str(e)}")
         raise
 
-def analyze_and_save_clusters(kmeans, scaled_features, feature_names):
+# Streaming mode keeps at most this many rows per cluster to estimate medians
+MEDIAN_SAMPLE_SIZE = 2000
+
+def _bottom_k(keys, groups, k):
+    """Indices of the k smallest random keys within each group (a bottom-k sample)"""
+    order = np.lexsort((keys, groups))
+    sorted_groups = groups[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_groups, sorted_groups, side='left')
+    return order[rank < k]
+
+def train_model_streaming(n_clusters=25, chunksize=100000, epochs=3, batch_size=4096,
+                          data_paths=('data/bmi.csv', 'data/nutrition.csv', 'data/workouts.csv'),
+                          model_dir='models', silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE,
+                          median_sample_size=MEDIAN_SAMPLE_SIZE, random_state=42, publish=True):
+    """Out-of-core training: stream CSV chunks, fit the scaler incrementally, train MiniBatchKMeans
+
+    Memory is bounded by chunksize rather than the dataset. Writes the same
+    model.pkl, scaler.pkl, cluster_analysis.json and model_summary.json as
+    train_model. Every statistic is exact except the per-cluster medians, which
+    come from a bottom-k sample of up to median_sample_size rows per cluster
+    (exact for smaller clusters), and the silhouette (see silhouette_estimate).
+    """
+    try:
+        if not silhouette_sample_size:
+            logger.warning(f"Streaming silhouette needs a sample; using {SILHOUETTE_SAMPLE_SIZE} rows")
+            silhouette_sample_size = SILHOUETTE_SAMPLE_SIZE
+        bmi_path, nutrition_path, workouts_path = data_paths
+        type_categories = workout_type_categories(workouts_path, chunksize)
+
+        def chunks():
+            return iter_feature_chunks(bmi_path, nutrition_path, workouts_path, chunksize, type_categories)
+
+        # Pass 1: column means over the whole dataset, used to fill NaNs like combine_features
+        sums = counts = None
+        for features in chunks():
+            sums = features.sum() if sums is None else sums + features.sum()
+            counts = features.count() if counts is None else counts + features.count()
+        if sums is None:
+            raise ValueError("No rows to train on")
+        means = sums / counts
+        feature_names = means.index
+
+        # Pass 2: incremental scaler
+        scaler = StandardScaler()
+        for features in chunks():
+            scaler.partial_fit(features.fillna(means))
+
+        def scaled_chunks():
+            for features in chunks():
+                yield scaler.transform(features.fillna(means))
+
+        # Passes 3..: mini-batch k-means; the first chunk seeds k-means++
+        logger.info(f"Starting streaming training: {n_clusters} clusters, {epochs} epochs, chunks of {chunksize}")
+        rng = np.random.default_rng(random_state)
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, batch_size=batch_size,
+                                 init='k-means++', n_init=3)
+        for epoch in range(epochs):
+            for scaled in scaled_chunks():
+                scaled = scaled[rng.permutation(len(scaled))]
+                if not hasattr(kmeans, 'cluster_centers_'):
+                    kmeans.partial_fit(scaled)
+                    continue
+                for start in range(0, len(scaled), batch_size):
+                    kmeans.partial_fit(scaled[start:start + batch_size])
+            logger.info(f"Epoch {epoch + 1}/{epochs} done ({kmeans.n_steps_} mini-batch steps)")
+
+        # Next pass: exact sizes, means, std devs, compactness and inertia, plus bottom-k
+        # samples for the medians and the silhouette
+        centers = kmeans.cluster_centers_
+        n_features = centers.shape[1]
+        sizes = np.zeros(n_clusters, dtype=np.int64)
+        offset_sums = np.zeros((n_clusters, n_features))
+        offset_squares = np.zeros((n_clusters, n_features))
+        distance_sums = np.zeros(n_clusters)
+        inertia = 0.0
+        empty = (np.empty(0), np.empty(0, dtype=np.int64), np.empty((0, n_features)))
+        median_sample, silhouette_sample = empty, empty
+        for scaled in scaled_chunks():
+            labels = kmeans.predict(scaled)
+            offsets = scaled - centers[labels]
+            squared = np.einsum('ij,ij->i', offsets, offsets)
+            sizes += np.bincount(labels, minlength=n_clusters)
+            np.add.at(offset_sums, labels, offsets)
+            np.add.at(offset_squares, labels, offsets ** 2)
+            distance_sums += np.bincount(labels, weights=np.sqrt(squared), minlength=n_clusters)
+            inertia += float(squared.sum())
+
+            keys = rng.random(len(scaled))
+            merged = [np.concatenate([kept, new]) for kept, new in zip(median_sample, (keys, labels, scaled))]
+            keep = _bottom_k(merged[0], merged[1], median_sample_size)
+            median_sample = tuple(array[keep] for array in merged)
+            merged = [np.concatenate([kept, new]) for kept, new in zip(silhouette_sample, (keys, labels, scaled))]
+            keep = _bottom_k(merged[0], np.zeros(len(merged[0]), dtype=np.int64), silhouette_sample_size)
+            silhouette_sample = tuple(array[keep] for array in merged)
+
+        total_samples = int(sizes.sum())
+        # Silhouette pass: sampled points against every row; exact when all rows were kept
+        exact = silhouette_sample_size >= total_samples
+        points, point_labels = silhouette_sample[2], silhouette_sample[1]
+        distances = None
+        for scaled in scaled_chunks():
+            distances = cluster_distance_sums(points, scaled, kmeans.predict(scaled), n_clusters, sums=distances)
+        silhouette_stats = silhouette_from_sums(distances, point_labels, sizes, total_samples, exact)
+
+        cluster_stats = []
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for i in range(n_clusters):
+                size = int(sizes[i])
+                mean_offset = offset_sums[i] / size
+                cluster_stats.append({
+                    'size': size,
+                    'std_dev': np.sqrt(np.maximum(offset_squares[i] / size - mean_offset ** 2, 0)).tolist(),
+                    'mean': (centers[i] + mean_offset).tolist(),
+                    'median': np.median(median_sample[2][median_sample[1] == i], axis=0).tolist(),
+                    'compactness': float(distance_sums[i] / size)
+                })
+        kmeans.inertia_ = inertia  # whole dataset, not the last mini-batch
+
+        logger.info("\nModel Quality Metrics:")
+        logger.info(f"Number of clusters: {n_clusters}")
+        logger.info(f"Samples: {total_samples}")
+        logger.info(f"Silhouette Score: {silhouette_stats['score']:.3f} "
+                    f"(CI {silhouette_stats['ci_low']:.3f}-{silhouette_stats['ci_high']:.3f})")
+        logger.info(f"Inertia: {inertia:.2f}")
+
+        os.makedirs(model_dir, exist_ok=True)
+        joblib.dump(kmeans, os.path.join(model_dir, 'model.pkl'))
+        joblib.dump(scaler, os.path.join(model_dir, 'scaler.pkl'))
+        summary = {
+            'n_clusters': n_clusters,
+            'silhouette_score': silhouette_stats['score'],
+            'silhouette_ci': [silhouette_stats['ci_low'], silhouette_stats['ci_high']],
+            'silhouette_sample_size': silhouette_stats['sample_size'],
+            'inertia': inertia,
+            'n_iterations': int(kmeans.n_steps_),
+            'feature_names': feature_names.tolist(),
+            'total_samples': total_samples,
+            'training_mode': 'streaming'
+        }
+        save_cluster_analysis(centers, cluster_stats, feature_names, summary, model_dir)
+
+        if publish:
+            stats = {'n_samples_seen': total_samples, 'scaler_var': scaler.var_.tolist(),
+                     'cluster_counts': sizes.tolist()}
+            version_id = publish_version(centers, scaler.mean_, scaler.scale_, feature_names.tolist(), summary,
+                                         os.path.join(model_dir, 'registry'), stats=stats)
+            logger.info(f"Published model version {version_id}")
+
+        return kmeans, scaler, silhouette_stats['score']
+
+    except Exception as e:
+        logger.error(f"Error training model in streaming mode: {str(e)}")
+        raise
+
+# Worker-side feature matrix for sweep_clusters, memory-mapped once per process
+_sweep_features = None
+
+def _init_sweep_worker(features_path):
+    """Map the shared feature matrix and keep each worker to one BLAS/OpenMP thread"""
+    global _sweep_features
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)  # the pool already uses every core
+    _sweep_features = np.load(features_path, mmap_mode='r')
+
+def _fit_sweep_run(n_clusters, seed, n_init, silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE):
+    """Fit one (k, seed) pair and return its metrics row"""
+    started = time.perf_counter()
+    kmeans = KMeans(n_clusters=n_clusters, random_state=seed, n_init=n_init, max_iter=300, tol=1e-5,
+                    init='k-means++')
+    kmeans.fit(_sweep_features)
+    fit_seconds = time.perf_counter() - started
+    silhouette_stats = silhouette_estimate(_sweep_features, kmeans.labels_, silhouette_sample_size,
+                                           random_state=seed)
+    return {
+        'n_clusters': n_clusters,
+        'seed': seed,
+        'inertia': float(kmeans.inertia_),
+        'silhouette': silhouette_stats['score'],
+        'silhouette_ci_low': silhouette_stats['ci_low'],
+        'silhouette_ci_high': silhouette_stats['ci_high'],
+        'n_iterations': int(kmeans.n_iter_),
+        'fit_seconds': fit_seconds
+    }
+
+def summarize_sweep(runs):
+    """Mean and spread of each metric per k, plus the k with the best mean silhouette"""
+    by_k = {}
+    for run in runs:
+        by_k.setdefault(run['n_clusters'], []).append(run)
+    summary = {}
+    for n_clusters, k_runs in sorted(by_k.items()):
+        silhouettes = np.array([run['silhouette'] for run in k_runs])
+        inertias = np.array([run['inertia'] for run in k_runs])
+        summary[str(n_clusters)] = {
+            'runs': len(k_runs),
+            'silhouette_mean': float(silhouettes.mean()),
+            'silhouette_std': float(silhouettes.std()),
+            'inertia_mean': float(inertias.mean()),
+            'inertia_std': float(inertias.std()),
+            'fit_seconds_mean': float(np.mean([run['fit_seconds'] for run in k_runs]))
+        }
+    best_k = max(summary, key=lambda k: summary[k]['silhouette_mean']) if summary else None
+    return summary, (int(best_k) if best_k is not None else None)
+
+def sweep_clusters(scaled_features, k_values, seeds=(42,), n_init=20, max_workers=None,
+                   report_path='models/sweep_report', silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE):
+    """Fit every (k, seed) pair in a process pool and write a JSON/CSV comparison report
+
+    The feature matrix is written once to a temporary .npy file that each worker
+    memory-maps, so it is not pickled per task. Writes <report_path>.json and
+    <report_path>.csv and returns the report dict.
+    """
+    tasks = [(int(k), int(seed)) for k in k_values for seed in seeds]
+    max_workers = max_workers or os.cpu_count() or 1
+    temp_dir = tempfile.mkdtemp(prefix='fitgen-sweep-')
+    try:
+        features_path = os.path.join(temp_dir, 'features.npy')
+        np.save(features_path, np.ascontiguousarray(scaled_features, dtype=np.float64))
+
+        logger.info(f"Sweeping {len(tasks)} fits (k={min(k_values)}..{max(k_values)}, "
+                    f"{len(seeds)} seeds) on {max_workers} workers")
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_sweep_worker,
+                                 initargs=(features_path,)) as pool:
+            futures = [pool.submit(_fit_sweep_run, k, seed, n_init, silhouette_sample_size) for k, seed in tasks]
+            runs = []
+            for future in futures:
+                run = future.result()
+                logger.info(f"k={run['n_clusters']} seed={run['seed']}: silhouette {run['silhouette']:.3f}, "
+                            f"inertia {run['inertia']:.2f}, {run['fit_seconds']:.1f}s")
+                runs.append(run)
+        wall_seconds = time.perf_counter() - started
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    summary, best_k = summarize_sweep(runs)
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'total_samples': int(len(scaled_features)),
+        'n_init': n_init,
+        'silhouette_sample_size': silhouette_sample_size,
+        'seeds': [int(seed) for seed in seeds],
+        'max_workers': max_workers,
+        'wall_seconds': wall_seconds,
+        'best_k': best_k,
+        'summary': summary,
+        'runs': runs
+    }
+
+    os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+    with open(f'{report_path}.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    with open(f'{report_path}.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(runs[0]) if runs else ['n_clusters'])
+        writer.writeheader()
+        writer.writerows(runs)
+    logger.info(f"Sweep finished in {wall_seconds:.1f}s, best k by silhouette: {best_k}; "
+                f"report written to {report_path}.json/.csv")
+    return report
+
+def run_sweep(k_values, seeds=(42,), n_init=20, max_workers=None, report_path='models/sweep_report',
+              silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE):
+    """Preprocess once and sweep n_clusters over the same feature matrix"""
+    try:
+        scaled_features, scaler, feature_names = preprocess_data(
+            'data/bmi.csv',
+            'data/mealplans.csv',
+            'data/nutrition.csv',
+            'data/workouts.csv'
+        )
+        return sweep_clusters(scaled_features, k_values, seeds, n_init, max_workers, report_path,
+                              silhouette_sample_size)
+    except Exception as e:
+        logger.error(f"Error sweeping n_clusters: {str(e)}")
+        raise
+
+def analyze_and_save_clusters(kmeans, scaled_features, feature_names, silhouette_stats=None, model_dir='models'):
     """Analyze clusters and save detailed information"""
+    if silhouette_stats is None:
+        silhouette_stats = silhouette_estimate(scaled_features, kmeans.labels_)
+    cluster_stats = cluster_statistics(scaled_features, kmeans.labels_, kmeans.cluster_centers_)
+
+    save_cluster_analysis(kmeans.cluster_centers_, cluster_stats, feature_names, {
+        'n_clusters': kmeans.n_clusters,
+        'silhouette_score': silhouette_stats['score'],
+        'silhouette_ci': [silhouette_stats['ci_low'], silhouette_stats['ci_high']],
+        'silhouette_sample_size': silhouette_stats['sample_size'],
+        'inertia': float(kmeans.inertia_),
+        'n_iterations': int(kmeans.n_iter_),
+        'feature_names': feature_names.tolist(),
+        'total_samples': len(scaled_features)
+    }, model_dir)
+
+def save_cluster_analysis(centers, cluster_stats, feature_names, summary, model_dir='models'):
+    """Write cluster_analysis.json and model_summary.json from per-cluster statistics"""
+    total_samples = sum(stats['size'] for stats in cluster_stats)
     cluster_info = {}
-    
-    for i in range(kmeans.n_clusters):
-        cluster_mask = kmeans.labels_ == i
-        cluster_samples = scaled_features[cluster_mask]
-        center = kmeans.cluster_centers_[i]
-        
-        # Calculate additional metrics
+    for i, (center, stats) in enumerate(zip(centers, cluster_stats)):
         cluster_info[str(i)] = {
-            'size': int(cluster_samples.shape[0]),
-            'percentage': float((cluster_samples.shape[0] / len(scaled_features)) * 100),
+            'size': stats['size'],
+            'percentage': float((stats['size'] / total_samples) * 100),
             'center': center.tolist(),
             'focus': get_cluster_focus(center, feature_names),
             'intensity_level': get_intensity_level(center, feature_names),
             'recommended_days': get_recommended_days(center, feature_names),
             'dominant_features': get_dominant_features(center, feature_names),
             'metrics': {
-                'std_dev': np.std(cluster_samples, axis=0).tolist(),
-                'mean': np.mean(cluster_samples, axis=0).tolist(),
-                'median': np.median(cluster_samples, axis=0).tolist(),
-                'compactness': float(np.mean(np.linalg.norm(cluster_samples - center, axis=1)))
+                'std_dev': stats['std_dev'],
+                'mean': stats['mean'],
+                'median': stats['median'],
+                'compactness': stats['compactness']
             },
             'feature_names': feature_names.tolist()
         }
     
     # Save detailed analysis
-    os.makedirs('models', exist_ok=True)
-    with open('models/cluster_analysis.json', 'w') as f:
+    os.makedirs(model_dir, exist_ok=True)
+    with open(os.path.join(model_dir, 'cluster_analysis.json'), 'w') as f:
         json.dump(cluster_info, f, indent=2)
     
     # Save summary metrics
-    summary = {
-        'n_clusters': kmeans.n_clusters,
-        'silhouette_score': float(silhouette_score(scaled_features, kmeans.labels_)),
-        'inertia': float(kmeans.inertia_),
-        'n_iterations': int(kmeans.n_iter_),
-        'feature_names': feature_names.tolist(),
-        'total_samples': len(scaled_features),
-        'timestamp': datetime.now().isoformat()
-    }
-    
-    with open('models/model_summary.json', 'w') as f:
+    summary = dict(summary, timestamp=datetime.now().isoformat())
+    with open(os.path.join(model_dir, 'model_summary.json'), 'w') as f:
         json.dump(summary, f, indent=2)
 
 def get_cluster_focus(center, feature_names):
@@ -172,8 +599,40 @@ def get_dominant_features(center, feature_names):
     sorted_features = sorted(features.items(), key=lambda x: abs(x[1]), reverse=True)
     return {k: float(v) for k, v in sorted_features[:3]}
 
+def parse_k_range(value):
+    """'10-40' or '10-40:5' -> list of k values; '25' -> [25]"""
+    bounds, _, step = value.partition(':')
+    low, _, high = bounds.partition('-')
+    return list(range(int(low), int(high or low) + 1, int(step or 1)))
+
 # Update main block to use 25 clusters
 if __name__ == "__main__":
-    kmeans, scaler, silhouette = train_model(n_clusters=25)  # Changed from 30 to 25
+    # python src/train.py                          train and publish with k=25
+    # python src/train.py --sweep 10-40:5 --seeds 3   compare k values in parallel
+    parser = argparse.ArgumentParser(description='Train the KMeans model or sweep n_clusters')
+    parser.add_argument('--n-clusters', type=int, default=25)
+    parser.add_argument('--sweep', type=parse_k_range, help="k range to compare, e.g. 10-40 or 10-40:5")
+    parser.add_argument('--seeds', type=int, default=1, help='random seeds per k (42, 43, ...)')
+    parser.add_argument('--n-init', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: all cores)')
+    parser.add_argument('--report', default='models/sweep_report', help='report path without extension')
+    parser.add_argument('--stream', action='store_true', help='out-of-core training over CSV chunks')
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--silhouette-sample', type=int, default=SILHOUETTE_SAMPLE_SIZE,
+                        help='points used to estimate silhouette (0 = exact)')
+    args = parser.parse_args()
+    silhouette_sample_size = args.silhouette_sample or None
+
+    if args.sweep:
+        run_sweep(args.sweep, tuple(range(42, 42 + args.seeds)), args.n_init, args.workers, args.report,
+                  silhouette_sample_size)
+        sys.exit(0)
+
+    if args.stream:
+        kmeans, scaler, silhouette = train_model_streaming(args.n_clusters, args.chunksize, args.epochs,
+                                                           silhouette_sample_size=silhouette_sample_size)
+    else:
+        kmeans, scaler, silhouette = train_model(args.n_clusters, silhouette_sample_size)  # Changed from 30 to 25
     logger.info("\nTraining completed successfully!")
-    logger.info(f"Final model saved with {25} clusters")
\ No newline at end of file
+    logger.info(f"Final model saved with {args.n_clusters} clusters")
\ No newline at end of file
@@ -0,0 +1,138 @@
+import time
+import queue
+import atexit
+import logging
+import threading
+
+logger = logging.getLogger('workout_app')
+
+# With FITGEN_WRITE_BEHIND=1, /generate allocates the plan id itself, hands the
+# document to a WriteBehindQueue and responds without waiting for storage. One
+# background thread commits queued documents in store batches. When the queue
+# is full the request waits up to put_timeout for room, then writes the plan
+# itself, so a slow store slows clients down instead of growing memory.
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Bounded queue of (repository, id, data) sets flushed to a store in batches
+
+    Failed batches are retried with exponential backoff; after max_retries the
+    documents are logged and counted as failed. Routes that act on one document
+    call wait() first, so a plan is never read or updated before it is stored.
+    """
+
+    def __init__(self, store, maxsize=1000, batch_size=100, flush_interval=0.05, put_timeout=0.5,
+                 max_retries=5, retry_delay=0.2):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize)
+        self._pending = {}  # (repository name, id) -> Event set once the document is stored (or dropped)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    def put(self, repository, doc_id, data):
+        """Queue a set of data under doc_id; False if the queue stayed full (the caller writes it instead)"""
+        if self._closed:
+            return False
+        self._start()
+        key = (repository.name, doc_id)
+        with self._lock:
+            self._pending[key] = threading.Event()
+        try:
+            self._queue.put((repository, doc_id, data), timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            logger.warning(f"Write-behind queue full, writing {repository.name}/{doc_id} synchronously")
+            self._done([key])
+            return False
+
+    def wait(self, repository, doc_id, timeout=5.0):
+        """Block until a queued document is stored; True at once when none is pending"""
+        with self._lock:
+            event = self._pending.get((repository.name, doc_id))
+        return event is None or event.wait(timeout)
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is stored or dropped"""
+        with self._lock:
+            events = list(self._pending.values())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for event in events:
+            if not event.wait(None if deadline is None else max(deadline - time.monotonic(), 0)):
+                return False
+        return True
+
+    def close(self, timeout=30.0):
+        """Stop accepting documents and drain the queue (registered with atexit)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.error(f"Write-behind queue not drained after {timeout} s, {self._queue.qsize()} writes lost")
+        logger.info(f"Write-behind queue closed: {self.written} written, {self.failed} failed")
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            items = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    items.append(item)
+                if stopping or len(items) >= self.batch_size:
+                    break
+                try:
+                    # Drain whatever is already queued, wait briefly for more
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if items:
+                self._flush_items(items)
+
+    def _flush_items(self, items):
+        for attempt in range(self.max_retries + 1):
+            try:
+                batch = self.store.batch()
+                for repository, doc_id, data in items:
+                    batch.set(repository, doc_id, data)
+                batch.commit()
+                self.written += len(items)
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += len(items)
+                    ids = ', '.join(f"{repository.name}/{doc_id}" for repository, doc_id, _ in items)
+                    logger.error(f"Write-behind batch failed after {attempt + 1} attempts, dropped {ids}: {str(e)}")
+                    break
+                logger.warning(f"Write-behind batch of {len(items)} failed, retrying: {str(e)}")
+                time.sleep(self.retry_delay * 2 ** attempt)
+        self._done([(repository.name, doc_id) for repository, doc_id, _ in items])
+
+    def _done(self, keys):
+        with self._lock:
+            for key in keys:
+                event = self._pending.pop(key, None)
+                if event is not None:
+                    event.set()
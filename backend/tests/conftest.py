@@ -4,3 +4,47 @@ import sys
 # Add src directory to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import pytest
+from src import resources
+
+@pytest.fixture(autouse=True)
+def fresh_resources(monkeypatch):
+    """Every test starts with unloaded Lazy resources, whatever earlier tests loaded"""
+    for name, value in list(vars(resources).items()):
+        if isinstance(value, resources.Lazy):
+            monkeypatch.setattr(resources, name, resources.Lazy(value.name, value.factory))
+
+@pytest.fixture
+def db():
+    """Empty in-process Firestore client (benchmarks/standins.py)"""
+    from benchmarks.standins import FakeFirestore
+    return FakeFirestore()
+
+@pytest.fixture
+def use_store(monkeypatch):
+    """Installs a store as the app's storage, with no workout catalog and an empty user-name cache"""
+    def install(store):
+        monkeypatch.setattr(resources, 'storage', resources.Lazy('storage', lambda: store))
+        monkeypatch.setattr(resources, 'workout_catalog', resources.Lazy('workout catalog', lambda: None))
+        resources.user_names.clear()
+        return store
+    return install
+
+@pytest.fixture
+def store(db, use_store):
+    """FirestoreStore over the db fixture, installed as the app's storage"""
+    from src.storage import FirestoreStore
+    return use_store(FirestoreStore(lambda: db))
+
+@pytest.fixture
+def client_for():
+    """Makes test clients of one app, each with the given session values"""
+    from src.app import create_app
+    app = create_app({'TESTING': True})
+
+    def make(**session_values):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session.update(session_values)
+        return client
+    return make
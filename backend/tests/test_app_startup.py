@@ -0,0 +1,57 @@
+import gc
+import sys
+from src import resources
+from src.app import create_app
+
+def test_light_routes_do_not_initialize_resources():
+    """/ and /logout are served without Firebase, the model or the catalog"""
+    client = create_app({'TESTING': True}).test_client()
+
+    assert client.get('/').status_code == 200
+    assert client.post('/logout').status_code == 200
+    loaded = [lazy.name for lazy in vars(resources).values() if isinstance(lazy, resources.Lazy) and lazy.loaded]
+    assert loaded == []
+
+def test_login_does_not_initialize_storage(monkeypatch):
+    """Under the default Firestore backend, an auth lookup only initializes Firebase"""
+    monkeypatch.delenv('FITGEN_STORAGE', raising=False)
+    monkeypatch.setattr(resources, 'firebase_app', resources.Lazy('firebase', lambda: None))
+    client = create_app({'TESTING': True}).test_client()
+
+    assert client.post('/login', json={'email': 'nobody@example.com', 'password': 'pw'}).status_code == 401
+    assert resources.firebase_app.loaded
+    assert not resources.storage.loaded
+
+def test_lazy_builds_once():
+    """A Lazy resource calls its factory on first get() only"""
+    calls = []
+    lazy = resources.Lazy('counter', lambda: calls.append(1) or len(calls))
+    assert not lazy.loaded
+    assert lazy.get() == 1
+    assert lazy.get() == 1
+    assert calls == [1]
+
+def test_import_profiler_times_nested_imports(tmp_path, monkeypatch):
+    """Self times exclude nested imports and every newly loaded module is recorded"""
+    from src.startup_profile import ImportProfiler
+    (tmp_path / 'probe_outer.py').write_text('import probe_inner\n')
+    (tmp_path / 'probe_inner.py').write_text('import time\ntime.sleep(0.01)\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    # A full collection of the suite's heap inside the import would count as self time
+    gc.collect()
+    gc.disable()
+    profiler = ImportProfiler().install()
+    try:
+        import probe_outer  # noqa: F401
+    finally:
+        profiler.uninstall()
+        gc.enable()
+        monkeypatch.delitem(sys.modules, 'probe_outer', raising=False)
+        monkeypatch.delitem(sys.modules, 'probe_inner', raising=False)
+
+    outer, inner = profiler.timings['probe_outer'], profiler.timings['probe_inner']
+    assert inner['cumulative_ms'] >= 10
+    assert outer['cumulative_ms'] >= inner['cumulative_ms']
+    assert outer['self_ms'] < inner['cumulative_ms']
+    assert profiler.report()['packages']['probe_inner'] >= 10
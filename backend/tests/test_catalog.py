@@ -0,0 +1,25 @@
+import pandas as pd
+from src.catalog import WorkoutCatalog, EQUIPMENT_MAP, LEVEL_MAP, TYPE_GROUPS
+
+def test_catalog_matches_dataframe_filtering():
+    """Index lookups return the same exercises as filtering workouts.csv per request"""
+    workouts_df = pd.read_csv('data/workouts.csv')
+    catalog = WorkoutCatalog.from_csv('data/workouts.csv')
+
+    for equipment in set(EQUIPMENT_MAP.values()):
+        for level in LEVEL_MAP.values():
+            filtered = workouts_df[
+                (workouts_df['Equipment'].str.contains(equipment, na=False)) &
+                (workouts_df['Level'] == level)
+            ]
+            for group, types in TYPE_GROUPS.items():
+                expected = filtered[filtered['Type'].isin(types)].sort_values('Rating', ascending=False)
+                names = [ex['name'] for ex in catalog.exercises(equipment, level, group)]
+                assert names == [str(title) for title in expected['Title']]
+                assert len(catalog.exercises(equipment, level, group, limit=3)) == min(3, len(expected))
+
+def test_catalog_resolve_defaults():
+    """Unknown form values fall back to bodyweight / intermediate"""
+    catalog = WorkoutCatalog.from_csv('data/workouts.csv')
+    assert catalog.resolve('Dumbbell', 3) == ('Dumbbell', 'Expert')
+    assert catalog.resolve('trampoline', 7) == ('Body Only', 'Intermediate')
@@ -0,0 +1,38 @@
+from src import resources
+
+def test_user_names_are_read_in_one_deduplicated_batch(db, store, client_for):
+    """One get_all for the distinct users, projected to user_name; missing users are 'Unknown'"""
+    plans = {f'plan-{i}': {'user_id': f'user-{i % 3}', 'status': 'requested', 'user_data': {'exercise_type': 1}}
+             for i in range(9)}
+    plans['plan-9'] = {'user_id': 'gone', 'status': 'requested', 'user_data': {}}
+    plans['plan-10'] = {'user_id': 'user-0', 'status': 'approved', 'user_data': {}}
+    db.collection('plans').docs.update(plans)
+    db.collection('users').docs.update({f'user-{i}': {'user_name': f'Name {i}', 'email': f'{i}@example.com'}
+                                        for i in range(3)})
+    client = client_for(user_id='coach-1', user_type='coach')
+
+    response = client.get('/coach_dashboard')
+    assert response.status_code == 200
+    by_id = {plan['id']: plan for plan in response.get_json()['plans']}
+    assert 'plan-10' not in by_id
+    assert by_id['plan-4']['user_name'] == 'Name 1'
+    assert by_id['plan-4']['fitness_goal'] == 'Muscle Gain'
+    assert by_id['plan-9']['user_name'] == 'Unknown'
+    assert db.batched_reads == [(['user-0', 'user-1', 'user-2', 'gone'], ['user_name'])]
+    assert db.document_reads == 0
+
+    # A second request within the TTL is served from the shared cache
+    client.get('/coach_dashboard')
+    assert len(db.batched_reads) == 1
+
+def test_expiring_cache_drops_old_entries(monkeypatch):
+    """Entries expire after the TTL and the oldest go first when the cache is full"""
+    clock = [100.0]
+    monkeypatch.setattr(resources.time, 'monotonic', lambda: clock[0])
+    cache = resources.ExpiringCache(ttl=10, maxsize=2)
+    cache.set_many({'a': 1, 'b': 2})
+    clock[0] += 5
+    cache.set_many({'a': 1, 'c': 3})
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+    clock[0] += 11
+    assert cache.get_many(['a', 'c']) == {}
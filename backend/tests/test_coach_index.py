@@ -0,0 +1,101 @@
+import pytest
+from src import app as app_module
+from src import coach_index
+from benchmarks.standins import FakeFirestore
+
+class CountingFirestore(FakeFirestore):
+    """FakeFirestore that counts queries on users"""
+
+    def __init__(self):
+        super().__init__()
+        self.user_queries = 0
+
+    def collection(self, name):
+        collection = super().collection(name)
+        if name == 'users' and not hasattr(collection, 'counted'):
+            where = collection.where
+
+            def counted_where(*args):
+                self.user_queries += 1
+                return where(*args)
+            collection.where = counted_where
+            collection.counted = True
+        return collection
+
+class FakeAuth:
+    class User:
+        def __init__(self, uid):
+            self.uid = uid
+
+    def __init__(self):
+        self.updated = []
+
+    def create_user(self, email, password):
+        return self.User(f"uid-{email.split('@')[0]}")
+
+    def update_user(self, uid, email):
+        self.updated.append((uid, email))
+
+@pytest.fixture
+def db():
+    return CountingFirestore()
+
+@pytest.fixture
+def auth(monkeypatch):
+    auth = FakeAuth()
+    monkeypatch.setattr(app_module, 'get_auth', lambda: auth)
+    monkeypatch.setattr(app_module, 'server_timestamp', lambda: 'now')
+    return auth
+
+@pytest.fixture
+def admin(store, auth, client_for):
+    return client_for(is_admin=True)
+
+def register(client, email):
+    return client.post('/admin/register_coach', data={
+        'email': email, 'password': 'secret', 'coach_name': email.split('@')[0],
+        'specialization': 'Strength', 'profile_pic_url': 'http://pic', 'services': ['plans']})
+
+def test_coach_routes_use_the_index_instead_of_queries(db, auth, admin):
+    """Register, get, edit and delete keep the index in sync without querying users"""
+    client = admin
+
+    assert register(client, 'Ann@example.com').status_code == 200
+    assert db.collection('coach_emails').docs == {'ann@example.com': {'uid': 'uid-Ann', 'email': 'Ann@example.com'}}
+
+    coach = client.get('/admin/get_coach/ann@example.com').get_json()
+    assert coach['uid'] == 'uid-Ann' and coach['username'] == 'Ann'
+
+    response = client.post('/admin/edit_coach/Ann@example.com', data={
+        'email': 'ann.new@example.com', 'coach_name': 'Ann B', 'specialization': 'Yoga', 'profile_pic_url': 'http://pic'})
+    assert response.status_code == 200
+    assert auth.updated == [('uid-Ann', 'ann.new@example.com')]
+    assert set(db.collection('coach_emails').docs) == {'ann.new@example.com'}
+    assert client.get('/admin/get_coach/ann.new@example.com').get_json()['username'] == 'Ann B'
+
+    assert client.post('/admin/delete_coach/ann.new@example.com').status_code == 200
+    assert db.collection('users').docs == {} and db.collection('coach_emails').docs == {}
+    assert db.user_queries == 0
+
+def test_unindexed_coaches_are_found_once_and_indexed(db, store):
+    """Coaches registered before the index fall back to one query, then become reads"""
+    db.collection('users').document('old-coach').set({'user_type': 'coach', 'email': 'old@example.com', 'username': 'Old'})
+    db.collection('users').document('customer').set({'user_type': 'customer', 'email': 'cust@example.com'})
+
+    assert coach_index.coach_uid(store, 'old@example.com') == 'old-coach'
+    assert coach_index.coach_uid(store, 'old@example.com') == 'old-coach'
+    assert coach_index.coach_uid(store, 'cust@example.com') is None
+    assert db.user_queries == 2  # old@ once, cust@ (not a coach) once
+
+def test_bulk_delete_reads_the_index_once(db, admin):
+    """Bulk delete removes every indexed coach with a single get_all and reports unknown emails"""
+    client = admin
+    for name in ('a', 'b', 'c'):
+        register(client, f'{name}@example.com')
+    del db.batched_reads[:]
+
+    body = client.post('/admin/delete_coaches', json={'emails': ['a@example.com', 'c@example.com']}).get_json()
+    assert body['deleted'] == ['a@example.com', 'c@example.com'] and body['not_found'] == []
+    assert [len(ids) for ids, _ in db.batched_reads] == [2]
+    assert set(db.collection('users').docs) == {'uid-b'}
+    assert set(db.collection('coach_emails').docs) == {'b@example.com'}
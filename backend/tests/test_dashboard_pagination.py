@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+def fill(db):
+    start = datetime(2026, 1, 1)
+    plans = {f'plan-{i:02d}': {
+        'user_id': 'alice' if i % 2 == 0 else 'bob', 'created_at': start + timedelta(days=i),
+        'status': 'new', 'cluster': i, 'coach_comment': '', 'user_data': {'weight': 70},
+        'workout_plan': {'1': {'type': 'Rest', 'exercises': []}}, 'nutrition_plan': {'daily_targets': {}}
+    } for i in range(25)}
+    users = {'alice': {'user_name': 'Alice', 'user_type': 'customer'}, 'bob': {'user_name': 'Bob', 'user_type': 'customer'}}
+    users.update({f'coach-{i}': {'user_type': 'coach', 'email': f'coach{i}@example.com', 'username': f'Coach {i}',
+                                 'password': 'hash', 'specialization': 'Strength', 'profile_pic_url': '', 'services': []}
+                  for i in range(5)})
+    db.collection('plans').docs.update(plans)
+    db.collection('users').docs.update(users)
+
+def test_customer_dashboard_pages_summaries_newest_first(db, store, client_for):
+    """Pages follow next_cursor to the end and carry only the summary fields"""
+    fill(db)
+    client = client_for(user_id='alice', user_type='customer')
+
+    pages, cursor = [], None
+    while True:
+        response = client.get('/customer_dashboard', query_string={'limit': 5, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.get_json()
+        pages.append(body['plans'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert body['user_name'] == 'Alice'
+    assert [len(page) for page in pages] == [5, 5, 3]
+    ids = [plan['id'] for page in pages for plan in page]
+    assert ids == [f'plan-{i:02d}' for i in range(24, -1, -2)]
+    assert set(pages[0][0]) == {'id', 'status', 'created_at', 'cluster', 'coach_comment'}
+    assert client.get('/customer_dashboard?cursor=missing').status_code == 400
+
+def test_full_plan_loads_on_demand_for_owner_only(db, store, client_for):
+    """/plan/<id> returns the full plan to its owner and refuses other customers"""
+    fill(db)
+    client = client_for(user_id='alice', user_type='customer')
+    plan = client.get('/plan/plan-04').get_json()
+    assert plan['id'] == 'plan-04' and plan['workout_plan']['1']['type'] == 'Rest'
+    assert client.get('/plan/plan-03').status_code == 401
+    assert client.get('/plan/nope').status_code == 404
+
+def test_admin_dashboard_pages_coaches_without_passwords(db, store, client_for):
+    """Coaches are paged by document id and the password hash is not projected"""
+    fill(db)
+    client = client_for(is_admin=True)
+    first = client.get('/admin/dashboard?limit=3').get_json()
+    second = client.get('/admin/dashboard', query_string={'limit': 3, 'cursor': first['next_cursor']}).get_json()
+
+    assert [coach['id'] for coach in first['coaches'] + second['coaches']] == [f'coach-{i}' for i in range(5)]
+    assert second['next_cursor'] is None
+    assert all('password' not in coach for coach in first['coaches'])
+
+def test_missing_index_is_reported_as_unavailable(db, store, client_for, monkeypatch):
+    """Before the composite index exists, Firestore's FAILED_PRECONDITION becomes a 503"""
+    from google.api_core.exceptions import FailedPrecondition
+    from benchmarks.standins import FakeQuery
+
+    def stream(query):
+        raise FailedPrecondition('The query requires an index')
+        yield
+    fill(db)
+    monkeypatch.setattr(FakeQuery, 'stream', stream)
+    response = client_for(user_id='alice', user_type='customer').get('/customer_dashboard')
+    assert response.status_code == 503 and 'index' not in response.get_json()['error']
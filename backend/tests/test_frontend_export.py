@@ -0,0 +1,73 @@
+import json
+import numpy as np
+import pandas as pd
+from src.frontend_export import (STAMP_NAME, shard_name, workout_shards, export_workouts, model_data,
+                                 unpack_float32)
+
+
+def write_workouts(path):
+    pd.DataFrame({
+        'Unnamed: 0': range(6),
+        'Title': ['Band row', 'Curl', 'Push-up', 'Bench press', 'Band curl', 'Plank'],
+        'Desc': ['a', 'b', 'c', None, 'e', 'f'],
+        'Type': ['Strength', 'Strength', 'Strength', 'Strength', 'Cardio', 'Stretching'],
+        'BodyPart': ['Back'] * 6,
+        'Equipment': ['Bands', 'Dumbbell', 'Body Only', 'Barbell', 'Bands', None],
+        'Level': ['Intermediate', 'Beginner', 'Intermediate', 'Expert', 'Intermediate', 'Intermediate'],
+        'Rating': [8.1, np.nan, 7.0, 9.0, 0.0, 5.5],
+        'RatingDesc': [None] * 6
+    }).to_csv(path, index=False)
+
+
+def test_shards_hold_the_rows_the_generator_filters_to(tmp_path):
+    """Every shard has exactly the rows matching its equipment (substring) and level"""
+    path = tmp_path / 'workouts.csv'
+    write_workouts(path)
+    shards = workout_shards(pd.read_csv(path))
+
+    assert len(shards) == 9 * 3
+    assert [row['Title'] for row in shards[shard_name('Bands', 'Intermediate')]] == ['Band row', 'Band curl']
+    assert shards[shard_name('Dumbbell', 'Beginner')] == [
+        {'Title': 'Curl', 'Desc': 'b', 'Type': 'Strength', 'Equipment': 'Dumbbell', 'Level': 'Beginner', 'Rating': None}
+    ]
+    assert shards[shard_name('Body Only', 'Expert')] == []
+    assert shard_name('Medicine Ball', 'Expert') == 'medicine-ball--expert'
+
+
+def test_export_is_minified_and_skipped_when_source_is_unchanged(tmp_path):
+    """A second export with the same CSV writes nothing; a changed CSV rebuilds"""
+    source = tmp_path / 'workouts.csv'
+    output = tmp_path / 'shards'
+    write_workouts(source)
+
+    sizes = export_workouts(str(source), str(output))
+    assert sizes[shard_name('Bands', 'Intermediate')] == 2
+    text = (output / f"{shard_name('Bands', 'Intermediate')}.json").read_text()
+    assert '\n' not in text and '": ' not in text
+    assert json.loads((output / STAMP_NAME).read_text())['outputs'][0].endswith('.json')
+
+    assert export_workouts(str(source), str(output)) is None
+
+    stale = output / 'old-shard.json'
+    stale.write_text('[]')
+    write_workouts(source)
+    with open(source, 'a') as f:
+        f.write('6,Squat,g,Strength,Legs,Barbell,Beginner,6.0,\n')
+    sizes = export_workouts(str(source), str(output))
+    assert sizes[shard_name('Barbell', 'Beginner')] == 1
+    assert not stale.exists()
+
+
+def test_packed_centers_round_trip_and_keep_predictions():
+    """float32 centers decode to the same shape and assign the same clusters"""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(25, 14))
+    data = model_data(centers, rng.normal(size=14), rng.uniform(1, 2, 14), [f'f{i}' for i in range(14)])
+    unpacked = unpack_float32(data['cluster_centers_f32'], (data['n_clusters'], data['n_features']))
+
+    np.testing.assert_allclose(unpacked, centers, rtol=1e-6, atol=1e-6)
+    points = rng.normal(size=(5000, 14))
+    exact = ((points[:, None, :] - centers[None]) ** 2).sum(axis=2).argmin(axis=1)
+    packed = ((points[:, None, :] - unpacked[None]) ** 2).sum(axis=2).argmin(axis=1)
+    assert (exact == packed).all()
+    assert data['scaler']['feature_names'][0] == 'f0'
@@ -0,0 +1,49 @@
+import json
+import logging
+from src import log_setup
+
+def test_records_are_written_as_json_by_the_listener(tmp_path, monkeypatch):
+    """Lines are JSON with extra fields; payload records are kept at the sampling rate"""
+    monkeypatch.setenv('FITGEN_LOG_CONSOLE', '0')
+    monkeypatch.setenv('FITGEN_LOG_PAYLOAD_SAMPLE', '0')
+    logger = logging.getLogger('log_setup_test')
+    logger.propagate = False
+    listener = log_setup.configure(logger, log_dir=str(tmp_path))
+    try:
+        assert log_setup.configure(logger, log_dir=str(tmp_path)) is listener
+        payload = {'weight': 70.0}
+        logger.info("Plan generated", extra={'plan_id': 'p1'})
+        logger.info("Processed form data", extra={'payload': payload})
+        logger.handlers[0].filters[0].rate = 1.0
+        logger.info("Features for prediction", extra={'payload': payload})
+        payload['weight'] = 0  # serialized when logged, not when written
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logger.exception("Failed")
+    finally:
+        listener.stop()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        for handler in listener.handlers:
+            handler.close()
+
+    lines = [json.loads(line) for line in (tmp_path / 'workout_app.log').read_text().splitlines()]
+    assert [line['message'] for line in lines] == ["Plan generated", "Features for prediction", "Failed"]
+    assert lines[0]['plan_id'] == 'p1' and lines[0]['level'] == 'INFO' and lines[0]['logger'] == 'log_setup_test'
+    assert lines[1]['payload'] == {'weight': 70.0}
+    assert 'ValueError: boom' in lines[2]['exception']
+
+def test_full_queue_drops_instead_of_blocking():
+    """With no listener draining it, records beyond the queue size are counted and dropped"""
+    import queue
+    handler = log_setup.DroppingQueueHandler(queue.Queue(2))
+    logger = logging.getLogger('log_setup_drop_test')
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning(f"record {i}")
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 2 and handler.dropped == 3
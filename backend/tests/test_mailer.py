@@ -0,0 +1,103 @@
+import os
+import smtplib
+from email.mime.text import MIMEText
+from src import resources
+from src import app as app_module
+from src.mailer import SMTPPool, Outbox
+from benchmarks.smtp_server import LocalSMTPServer
+
+def message(to_email):
+    msg = MIMEText('hello')
+    msg['Subject'], msg['From'], msg['To'] = 'Hi', 'app@example.com', to_email
+    return msg
+
+def test_pool_reuses_one_session_and_replaces_dropped_ones():
+    """Consecutive sends share one login; a session the server closed is reconnected"""
+    server = LocalSMTPServer().start()
+    try:
+        pool = SMTPPool('127.0.0.1', server.port, 'app@example.com', 'secret', starttls=False, timeout=5)
+        for i in range(3):
+            pool.send(message(f'user{i}@example.com'))
+        assert pool.connects == 1 and server.logins == ['app@example.com']
+        assert [recipients for _, recipients, _ in server.messages] == [[f'user{i}@example.com'] for i in range(3)]
+
+        pool._idle[0][0].close()  # the next command raises SMTPServerDisconnected, as after a server timeout
+        pool.send(message('late@example.com'))
+        assert pool.connects == 2 and len(server.messages) == 4
+        pool.close()
+    finally:
+        server.stop()
+
+class FlakyPool:
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, msg):
+        if self.failures:
+            self.failures -= 1
+            raise smtplib.SMTPServerDisconnected('gone')
+        self.sent.append(msg['To'])
+
+    def close(self):
+        pass
+
+def test_outbox_retries_then_gives_up(tmp_path):
+    """Failed sends are rescheduled with backoff and moved to failed/ after max_attempts"""
+    pool = FlakyPool(failures=1)
+    outbox = Outbox(str(tmp_path), pool, 'app@example.com', rate=1000, max_attempts=2, retry_delay=0)
+    outbox._threads = [None]  # no background senders, process() is called directly
+    outbox.enqueue('a@example.com', 'Hi', 'body')
+    outbox.enqueue('b@example.com', 'Hi', 'body')
+
+    assert outbox.process() == 2
+    assert pool.sent == ['b@example.com'] and len(os.listdir(tmp_path / 'new')) == 1
+    assert outbox.process() == 1
+    assert pool.sent == ['b@example.com', 'a@example.com'] and os.listdir(tmp_path / 'new') == []
+
+    pool.failures = 2
+    outbox.enqueue('c@example.com', 'Hi', 'body')
+    outbox.process()
+    outbox.process()
+    assert len(os.listdir(tmp_path / 'failed')) == 1 and os.listdir(tmp_path / 'cur') == []
+
+def test_forgot_password_returns_before_the_email_is_sent(monkeypatch, tmp_path):
+    """The route only queues the email; the background sender delivers it to the SMTP stand-in"""
+    server = LocalSMTPServer().start()
+    try:
+        pool = SMTPPool('127.0.0.1', server.port, 'app@example.com', 'secret', starttls=False, timeout=5)
+        outbox = Outbox(str(tmp_path), pool, 'app@example.com', rate=1000, poll_interval=0.05)
+        monkeypatch.setattr(resources, 'outbox', resources.Lazy('outbox', lambda: outbox))
+        monkeypatch.setenv('SMTP_EMAIL', 'app@example.com')
+        monkeypatch.setenv('SMTP_PASSWORD', 'secret')
+
+        class FakeAuth:
+            UserNotFoundError = LookupError
+
+            def get_user_by_email(self, email):
+                return object()
+
+            def generate_password_reset_link(self, email):
+                return 'https://reset/link'
+        monkeypatch.setattr(app_module, 'get_auth', lambda: FakeAuth())
+
+        client = app_module.create_app({'TESTING': True}).test_client()
+        assert client.post('/forgot_password', json={'email': 'ann@example.com'}).status_code == 200
+        outbox.close()
+        assert len(server.messages) == 1
+        sender, recipients, text = server.messages[0]
+        assert (sender, recipients) == ('app@example.com', ['ann@example.com'])
+        assert 'https://reset/link' in text and outbox.sent == 1
+    finally:
+        server.stop()
+
+def test_forgot_password_reports_auth_failures_as_json(monkeypatch):
+    """If auth cannot be initialized the route still answers with its JSON 500"""
+    def missing_credentials():
+        raise ValueError('no Firebase credentials')
+    monkeypatch.setattr(app_module, 'get_auth', missing_credentials)
+
+    client = app_module.create_app({'TESTING': True}).test_client()
+    response = client.post('/forgot_password', json={'email': 'ann@example.com'})
+    assert response.status_code == 500
+    assert response.get_json() == {'error': "Failed to send reset email. Please try again later."}
@@ -0,0 +1,103 @@
+import json
+from datetime import datetime, timedelta
+import numpy as np
+from src import online_update
+from src.registry import publish_version, current_version_id, ModelVersion
+
+FEATURES = ['weight', 'height', 'calories']
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data)
+
+class FakePlans:
+    """Just enough of a Firestore collection query for fetch_plan_features"""
+
+    def __init__(self, docs, cursor=None, page_size=None):
+        self.docs = docs  # doc id -> data, in created_at order
+        self.cursor = cursor
+        self.page_size = page_size
+
+    def order_by(self, field):
+        return self
+
+    def select(self, fields):
+        return self
+
+    def limit(self, page_size):
+        return FakePlans(self.docs, self.cursor, page_size)
+
+    def start_after(self, cursor):
+        return FakePlans(self.docs, cursor, self.page_size)
+
+    def document(self, doc_id):
+        return type('Ref', (), {'get': lambda _: FakeSnapshot(doc_id, self.docs.get(doc_id))})()
+
+    def stream(self):
+        after = self.cursor['created_at'] if isinstance(self.cursor, dict) else \
+            self.cursor.to_dict()['created_at'] if self.cursor is not None else None
+        docs = [FakeSnapshot(doc_id, data) for doc_id, data in self.docs.items()
+                if after is None or data['created_at'] > after]
+        return iter(docs[:self.page_size])
+
+class FakeDb:
+    def __init__(self, docs):
+        self.plans = FakePlans(docs)
+
+    def collection(self, name):
+        assert name == 'plans'
+        return self.plans
+
+def make_docs(rows, start):
+    return {f'plan-{start + i}': {
+        'created_at': datetime(2026, 1, 1) + timedelta(seconds=start + i),
+        'user_data': dict(zip(FEATURES, row))
+    } for i, row in enumerate(rows)}
+
+def test_scaler_update_matches_full_data():
+    """Running mean/variance updates equal the statistics of all rows at once"""
+    rng = np.random.default_rng(0)
+    first, second = rng.normal(size=(50, 3)), rng.normal(loc=2, size=(30, 3))
+    mean, var, n = online_update.update_scaler(first.mean(axis=0), first.var(axis=0), 50, second)
+    both = np.vstack([first, second])
+    assert n == 80
+    assert np.allclose(mean, both.mean(axis=0))
+    assert np.allclose(var, both.var(axis=0))
+
+def test_online_update_publishes_from_checkpoint(tmp_path):
+    """Only plans after the checkpoint are folded in, across pages, and a new version is activated"""
+    rng = np.random.default_rng(1)
+    history = rng.normal(size=(200, 3)) * [10, 0.1, 400] + [70, 1.7, 2000]
+    mean, var = history.mean(axis=0), history.var(axis=0)
+    centers = (history[:4] - mean) / np.sqrt(var)
+    registry_dir = str(tmp_path / 'registry')
+    parent = publish_version(centers, mean, np.sqrt(var), FEATURES, {'total_samples': 200}, registry_dir,
+                             stats={'n_samples_seen': 200, 'scaler_var': var.tolist(), 'cluster_counts': [50] * 4})
+
+    old_rows, new_rows = history[:5], rng.normal(size=(7, 3)) * [10, 0.1, 400] + [90, 1.8, 2600]
+    docs = make_docs(old_rows, 0)
+    docs.update(make_docs(new_rows, 5))
+    docs['plan-12'] = {'created_at': datetime(2026, 1, 2), 'user_data': {'weight': 80}}  # missing features
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    online_update.save_checkpoint({'last_plan_id': 'plan-4', 'last_created_at': docs['plan-4']['created_at'].isoformat()},
+                                  checkpoint_path)
+    version_id = online_update.run_online_update(FakeDb(docs), registry_dir, checkpoint_path, page_size=3)
+
+    assert version_id != parent and current_version_id(registry_dir) == version_id
+    version = ModelVersion.load(version_id, registry_dir)
+    both = np.vstack([history, new_rows])
+    assert np.allclose(version.scaler_mean, both.mean(axis=0))
+    assert np.allclose(version.scaler_scale, both.std(axis=0))
+    assert version.manifest['stats']['n_samples_seen'] == 207
+    assert sum(version.manifest['stats']['cluster_counts']) == 207
+    assert version.manifest['summary']['online_update']['skipped'] == 1
+    with open(checkpoint_path) as f:
+        assert json.load(f)['last_plan_id'] == 'plan-12'
+
+    # Nothing new since the checkpoint: no version is published
+    assert online_update.run_online_update(FakeDb(docs), registry_dir, checkpoint_path, page_size=3) is None
@@ -0,0 +1,59 @@
+from src import app as app_module
+from src.catalog import WorkoutCatalog, ArrayWorkoutCatalog
+from src.planner import REST
+from src.plan_codec import (PLAN_FORMAT, encode_workout_plan, encode_nutrition_plan, hydrate_plan,
+                            hydrate_workout_plan, hydrate_nutrition_plan, workout_overview)
+
+def test_compact_plan_hydrates_full_bodies():
+    """Compact documents expand to full exercise text and per-meal targets"""
+    catalog = WorkoutCatalog.from_csv('data/workouts.csv')
+    days = [REST, 0, 1, 2] * 7 + [1, REST]
+    compact = {
+        'plan_format': PLAN_FORMAT, 'status': 'new',
+        'workout_plan': encode_workout_plan(days, 'Dumbbell', 'Intermediate', 2, catalog),
+        'nutrition_plan': encode_nutrition_plan(
+            {'calories': 2000.0, 'protein': 150.0, 'carbs': 200.0, 'fat': 66.0, 'fiber': 28.0}, 4, 'balanced', 'balanced'
+        )
+    }
+    plan = hydrate_plan(compact, catalog)
+
+    assert plan['status'] == 'new'
+    assert plan['workout_plan']['1']['type'] == 'Rest'
+    strength = plan['workout_plan']['3']
+    assert strength['type'] == 'Strength'
+    assert [ex['name'] for ex in strength['exercises']] == \
+           [ex['name'] for ex in catalog.exercises('Dumbbell', 'Intermediate', 'Strength', limit=3)]
+    assert strength['exercises'][0]['desc']
+    assert len(plan['nutrition_plan']['meals']) == 4
+    assert plan['nutrition_plan']['meals']['Lunch']['calories'] == 500.0
+    assert workout_overview(compact['workout_plan']) == {'total_days': 30, 'workout_days': 22, 'rest_days': 8}
+
+def test_full_documents_pass_through():
+    """Plans stored before the compact format are returned unchanged"""
+    legacy = {'workout_plan': {'1': {'type': 'Rest'}}, 'nutrition_plan': {}}
+    assert hydrate_plan(legacy, None) is legacy
+
+def test_plans_from_another_catalog_select_exercises_again():
+    """Row ids encoded against another catalog version are not trusted; exercises are selected again"""
+    catalog = WorkoutCatalog.from_csv('data/workouts.csv')
+    assert ArrayWorkoutCatalog(*catalog.to_arrays()).version == catalog.version
+    compact = encode_workout_plan([0, 1, 2], 'Dumbbell', 'Intermediate', 2, catalog)
+    assert compact['catalog_version'] == catalog.version
+
+    stale = dict(compact, catalog_version='old', exercise_ids={key: [10 ** 9] for key in compact['exercise_ids']})
+    assert hydrate_workout_plan(stale, catalog) == hydrate_workout_plan(compact, catalog)
+
+def test_plans_are_stored_in_full_unless_compact_storage_is_enabled(monkeypatch):
+    """The Next.js dashboards read stored plans directly, so compact bodies need FITGEN_COMPACT_PLANS"""
+    catalog = WorkoutCatalog.from_csv('data/workouts.csv')
+    workout = encode_workout_plan([0, REST], 'Dumbbell', 'Intermediate', 2, catalog)
+    nutrition = encode_nutrition_plan({'calories': 2000.0, 'protein': 150.0, 'carbs': 200.0, 'fat': 66.0,
+                                       'fiber': 28.0}, 4, 'balanced', 'balanced')
+
+    monkeypatch.delenv('FITGEN_COMPACT_PLANS', raising=False)
+    assert app_module.stored_plan_bodies(workout, nutrition, catalog) == {
+        'workout_plan': hydrate_workout_plan(workout, catalog), 'nutrition_plan': hydrate_nutrition_plan(nutrition)}
+
+    monkeypatch.setenv('FITGEN_COMPACT_PLANS', '1')
+    assert app_module.stored_plan_bodies(workout, nutrition, catalog) == {
+        'plan_format': PLAN_FORMAT, 'workout_plan': workout, 'nutrition_plan': nutrition}
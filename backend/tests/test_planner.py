@@ -0,0 +1,26 @@
+import numpy as np
+from src.planner import REST, TOTAL_DAYS, rest_day_counts, schedule_days, draw_uniforms, seeded_uniforms, nutrition_targets
+
+def test_schedule_days_rest_counts():
+    """Each user gets exactly the rest days implied by days_per_week and fitness level"""
+    days_per_week = np.array([3, 4, 5, 6, 7, 4])
+    fitness_level = np.array([1, 2, 3, 1, 3, 2])
+    codes = schedule_days(days_per_week, fitness_level, draw_uniforms(np.random.default_rng(0), len(days_per_week)))
+
+    assert codes.shape == (len(days_per_week), TOTAL_DAYS)
+    expected = rest_day_counts(days_per_week, fitness_level)
+    assert ((codes == REST).sum(axis=1) == expected).all()
+    assert set(np.unique(codes)) <= {REST, 0, 1, 2}
+
+def test_nutrition_targets_vectorized():
+    """Array targets follow the per-user calorie and macro formulas"""
+    targets = nutrition_targets([2000, 2400], ['balanced', 'low_carb'], ['balanced', 'high_carb'])
+    assert np.allclose(targets['protein'], [2000 * 0.3 / 4, 2400 * 0.5 / 4])
+    assert np.allclose(targets['fat'], [2000 * 0.3 / 9, 2400 * 0.4 / 9])
+    assert np.allclose(targets['fiber'], [2000 * 0.014, 2400 * 0.016])
+
+def test_seeded_uniforms_reproducible_per_seed():
+    """A row depends only on its own seed, whether drawn alone or in a batch"""
+    batch = seeded_uniforms([11, 22, 33])
+    assert np.array_equal(batch[1:2], seeded_uniforms([22]))
+    assert not np.array_equal(batch[0], batch[2])
@@ -0,0 +1,18 @@
+import joblib
+import numpy as np
+import pandas as pd
+from src.predictor import CentroidPredictor
+
+def test_predictor_matches_sklearn_path():
+    """Folded centroids give the same clusters as scaler.transform + KMeans.predict"""
+    model = joblib.load('models/model.pkl')
+    scaler = joblib.load('models/scaler.pkl')
+    predictor = CentroidPredictor.from_sklearn(model, scaler)
+
+    rng = np.random.default_rng(42)
+    rows = rng.normal(scaler.mean_, scaler.scale_ * 1.5 + 0.1, size=(2000, len(scaler.mean_)))
+    expected = model.predict(scaler.transform(pd.DataFrame(rows, columns=scaler.feature_names_in_)))
+
+    assert (predictor.predict(rows) == expected).all()
+    assert predictor.predict_one(rows[0].tolist()) == expected[0]
+    assert predictor.feature_names == scaler.feature_names_in_.tolist()
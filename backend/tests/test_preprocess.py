@@ -0,0 +1,75 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# preprocess.py is imported flat by train.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from preprocess import extract_numeric, parse_quantities, normalize_nutrition_data
+
+CELLS = ['9.2g', '0mg', '12 mg', '1,200 mg', '-5', '-5.5 g', '+.5g', '.75', '3.', 'abc', '', ' 42kcal',
+         'sodium 9.00 mg', 'x\n5g', '12gx', '7 MG', '1e3', np.nan, None, 3, 4.5, True]
+
+def test_parse_quantities_matches_extract_numeric():
+    """The vectorized parser gives extract_numeric's value for every kind of cell"""
+    series = pd.Series(CELLS, dtype=object)
+    values, units = parse_quantities(series)
+    expected = series.apply(extract_numeric)
+    pd.testing.assert_series_equal(values, expected.astype(float), check_names=False)
+    assert units == {'g': 5, 'mg': 4, 'kcal': 1}
+
+def test_parse_quantities_repeated_cells():
+    """Repeated strings are parsed once and mapped back to every row"""
+    series = pd.Series(['1.5g', '2mg', '1.5g', np.nan, '2mg', 'none'] * 1000)
+    values, units = parse_quantities(series)
+    pd.testing.assert_series_equal(values, series.apply(extract_numeric).astype(float))
+    assert values[:6].fillna(-1).tolist() == [1.5, 2.0, 1.5, -1, 2.0, 0.0]
+    assert units == {'g': 2000, 'mg': 2000}
+
+def test_normalize_nutrition_data_numeric_and_missing_columns():
+    """Numeric columns keep NaN, missing columns become 0"""
+    df = pd.DataFrame({'calories': [100, 250], 'protein': [1.5, np.nan], 'total_fat': ['1g', 'n/a']})
+    result = normalize_nutrition_data(df)
+    assert result['calories'].tolist() == [100.0, 250.0]
+    assert result['protein'].isna().tolist() == [False, True]
+    assert result['total_fat'].tolist() == [1.0, 0.0]
+    assert (result['sodium'] == 0).all()
+
+def write_inputs(directory):
+    """Four small input CSVs in the layout preprocess_data expects"""
+    rng = np.random.default_rng(4)
+    n_rows = 40
+    pd.DataFrame({'Age': rng.integers(18, 70, n_rows), 'Height': rng.normal(1.7, 0.1, n_rows),
+                  'Weight': rng.normal(75, 15, n_rows)}).to_csv(directory / 'bmi.csv', index=False)
+    pd.DataFrame({'meal': ['oats'] * n_rows}).to_csv(directory / 'meals.csv', index=False)
+    pd.DataFrame({col: [f'{value:.1f}g' for value in rng.uniform(0, 50, n_rows)]
+                  for col in ['calories', 'total_fat', 'cholesterol', 'sodium', 'fiber', 'protein', 'carbohydrate']}
+                 ).to_csv(directory / 'nutrition.csv', index=False)
+    pd.DataFrame({'Type': rng.choice(['Strength', 'Cardio'], n_rows), 'Equipment': 'Bands',
+                  'Level': rng.choice(['Beginner', 'Advanced'], n_rows), 'Rating': rng.uniform(0, 9, n_rows)}
+                 ).to_csv(directory / 'workouts.csv', index=False)
+    return [str(directory / name) for name in ('bmi.csv', 'meals.csv', 'nutrition.csv', 'workouts.csv')]
+
+def test_preprocess_cache_hit_and_invalidation(tmp_path, monkeypatch):
+    """A second run loads the cached arrays; changing an input file misses the cache"""
+    import preprocess
+    paths = write_inputs(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+
+    scaled, scaler, names = preprocess.preprocess_data(*paths, cache_dir=cache_dir)
+
+    calls = []
+    monkeypatch.setattr(preprocess, '_preprocess_uncached', lambda *args: calls.append(args))
+    cached, cached_scaler, cached_names = preprocess.preprocess_data(*paths, cache_dir=cache_dir)
+    assert calls == []
+    assert isinstance(cached, np.memmap)
+    assert np.array_equal(cached, scaled)
+    assert cached_names.tolist() == names.tolist()
+    frame = pd.DataFrame(np.ones((2, len(names))), columns=names)
+    assert np.allclose(cached_scaler.transform(frame), scaler.transform(frame))
+
+    monkeypatch.undo()
+    with open(paths[1], 'a') as f:
+        f.write('rice\n')
+    preprocess.preprocess_data(*paths, cache_dir=cache_dir)
+    assert len([name for name in os.listdir(cache_dir) if not name.endswith('.json')]) == 2
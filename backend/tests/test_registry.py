@@ -0,0 +1,31 @@
+from src.predictor import CentroidPredictor
+from src.registry import ModelRegistry, publish_version, activate_version, list_versions
+
+FEATURES = ['a', 'b']
+
+def test_registry_hot_reloads_new_version(tmp_path):
+    """Activating a version swaps the served model; held versions keep working"""
+    registry_dir = str(tmp_path / 'registry')
+    first = publish_version([[0.0, 0.0], [10.0, 10.0]], [0.0, 0.0], [1.0, 1.0], FEATURES, registry_dir=registry_dir)
+    registry = ModelRegistry(registry_dir, predictor_factory=CentroidPredictor, reload_interval=0)
+
+    held = registry.active()
+    assert held.version_id == first
+    assert held.predictor.predict_one([9.0, 9.0]) == 1
+
+    second = publish_version([[10.0, 10.0], [0.0, 0.0]], [0.0, 0.0], [1.0, 1.0], FEATURES,
+                             summary={'n_clusters': 2}, registry_dir=registry_dir)
+    assert registry.active().version_id == second
+    assert registry.active().manifest['summary'] == {'n_clusters': 2}
+    assert registry.active().predictor.predict_one([9.0, 9.0]) == 0
+    assert held.predictor.predict_one([9.0, 9.0]) == 1
+
+    activate_version(first, registry_dir)
+    assert registry.active().version_id == first
+    assert list_versions(registry_dir) == sorted([first, second])
+
+def test_empty_registry_serves_fallback(tmp_path):
+    """Without published versions the fallback model is served"""
+    fallback = object()
+    registry = ModelRegistry(str(tmp_path / 'empty'), reload_interval=0, fallback=fallback)
+    assert registry.active() is fallback
@@ -0,0 +1,35 @@
+import joblib
+import numpy as np
+import pandas as pd
+from src.catalog import WorkoutCatalog, EQUIPMENT_MAP, LEVEL_MAP, TYPE_GROUPS
+from src.shared_state import build_from_artifacts, SharedState
+
+def test_attached_state_matches_loaded_artifacts(tmp_path):
+    """Memory-mapped catalog and predictions agree with the in-process objects"""
+    directory = build_from_artifacts(str(tmp_path / 'state'))
+    state = SharedState.attach(directory)
+    catalog = WorkoutCatalog.from_csv()
+
+    for equipment in set(EQUIPMENT_MAP.values()):
+        for level in LEVEL_MAP.values():
+            for group in TYPE_GROUPS:
+                shared = state.catalog.exercises(equipment, level, group)
+                loaded = catalog.exercises(equipment, level, group)
+                assert [(ex['id'], ex['name'], ex['desc']) for ex in shared] == \
+                       [(ex['id'], ex['name'], ex['desc']) for ex in loaded]
+                assert np.allclose([ex['rating'] for ex in shared], [ex['rating'] for ex in loaded], equal_nan=True)
+    assert state.catalog.record(1)['name'] == catalog.record(1)['name']
+
+    model = joblib.load('models/model.pkl')
+    scaler = joblib.load('models/scaler.pkl')
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(rng.normal(scaler.mean_, scaler.scale_ + 1, size=(500, len(scaler.mean_))),
+                            columns=scaler.feature_names_in_)
+    assert (state.predictor.predict(features.to_numpy()) == model.predict(scaler.transform(features))).all()
+
+def test_rebuild_replaces_state(tmp_path):
+    """Building over an existing directory swaps in the new files"""
+    directory = build_from_artifacts(str(tmp_path / 'state'))
+    build_from_artifacts(directory)
+    assert SharedState.attach(directory).n_clusters == 25
+    assert not [name for name in tmp_path.iterdir() if name.name.startswith('.')]
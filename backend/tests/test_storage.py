@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+import pytest
+from src import resources
+from src.storage import FirestoreStore, MemoryStore
+
+def test_memory_store_copies_and_projects():
+    """Values are copied in and out, fields project, missing ids are left out of get_many"""
+    store = MemoryStore()
+    data = {'user_name': 'Ann', 'tags': ['a']}
+    store.users.set('ann', data)
+    data['tags'].append('b')
+    assert store.users.get('ann') == {'user_name': 'Ann', 'tags': ['a']}
+    store.users.get('ann')['tags'].append('c')
+    assert store.users.get('ann', fields=['user_name']) == {'user_name': 'Ann'}
+    assert store.users.get_many(['ann', 'gone', 'ann'], fields=['user_name']) == {'ann': {'user_name': 'Ann'}}
+    assert store.users.get('gone') is None
+
+def test_memory_pages_follow_the_cursor():
+    """page() filters, orders (newest first here) and resumes after the cursor document"""
+    store = MemoryStore()
+    start = datetime(2026, 1, 1)
+    for i in range(7):
+        store.plans.set(f'plan-{i}', {'user_id': 'ann' if i % 2 == 0 else 'bob', 'created_at': start + timedelta(days=i)})
+
+    ids, cursor = [], None
+    while True:
+        rows, cursor = store.plans.page({'user_id': 'ann'}, 'created_at', descending=True, fields=['created_at'],
+                                        limit=2, cursor=cursor)
+        ids += [doc_id for doc_id, _ in rows]
+        if cursor is None:
+            break
+    assert ids == ['plan-6', 'plan-4', 'plan-2', 'plan-0']
+    with pytest.raises(ValueError):
+        store.plans.page(cursor='missing')
+
+def test_memory_batch_is_all_or_nothing():
+    """A batch whose update targets a missing document leaves every collection unchanged"""
+    store = MemoryStore()
+    store.users.set('ann', {'user_name': 'Ann'})
+    batch = store.batch()
+    batch.update(store.users, 'ann', {'user_name': 'Ann B'})
+    batch.set(store.plans, 'plan-1', {'user_id': 'ann'})
+    batch.update(store.users, 'gone', {'user_name': 'Nobody'})
+    with pytest.raises(KeyError):
+        batch.commit()
+    assert store.users.get('ann') == {'user_name': 'Ann'}
+    assert store.plans.get('plan-1') is None
+
+def test_firestore_batch_commits_in_chunks(db):
+    """More than 500 queued writes go out as several Firestore batches"""
+    batches = []
+    make_batch = db.batch
+    db.batch = lambda: batches.append(1) or make_batch()
+    store = FirestoreStore(lambda: db)
+    batch = store.batch()
+    for i in range(1200):
+        batch.set(store.plans, f'plan-{i}', {'n': i})
+    assert batch.commit() == 1200
+    assert len(batches) == 3
+    assert len(db.collection('plans').docs) == 1200
+
+def test_plan_review_flow_runs_on_the_memory_store(use_store, client_for):
+    """Customer and coach routes work unchanged against the in-memory backend"""
+    store = use_store(MemoryStore())
+    store.users.set('ann', {'user_name': 'Ann', 'user_type': 'customer'})
+    plan_id = store.plans.add({
+        'user_id': 'ann', 'created_at': store.timestamp(), 'status': 'new', 'cluster': 1, 'coach_comment': '',
+        'user_data': {'exercise_type': 1}, 'workout_plan': {'1': {'type': 'Rest', 'exercises': []}},
+        'nutrition_plan': {'daily_targets': {}}})
+    customer = client_for(user_id='ann', user_type='customer')
+    coach = client_for(user_id='coach-1', user_type='coach')
+
+    assert customer.post(f'/tell_coach/{plan_id}').status_code == 200
+    requested = coach.get('/coach_dashboard').get_json()['plans']
+    assert [(plan['id'], plan['user_name']) for plan in requested] == [(plan_id, 'Ann')]
+    assert coach.post(f'/review_plan/{plan_id}', data={'coach_comment': 'Good', 'action': 'approve'}).status_code == 200
+    body = customer.get('/customer_dashboard').get_json()
+    assert body['user_name'] == 'Ann'
+    assert [(plan['id'], plan['status'], plan['coach_comment']) for plan in body['plans']] == [(plan_id, 'approved', 'Good')]
+    assert customer.post(f'/delete_plan/{plan_id}').status_code == 200
+    assert store.plans.get(plan_id) is None
+
+def test_accounts_work_without_firebase(monkeypatch, use_store, client_for):
+    """With the memory store, registration, login and coach management use its auth stand-in"""
+    monkeypatch.setenv('FITGEN_STORAGE', 'memory')
+    store = use_store(MemoryStore())
+    client = client_for()
+    assert client.post('/register', json={'email': 'ann@example.com', 'password': 'pw', 'user_name': 'Ann',
+                                          'user_type': 'customer'}).status_code == 200
+    assert client.post('/register', json={'email': 'ann@example.com', 'password': 'pw', 'user_name': 'Ann',
+                                          'user_type': 'customer'}).status_code == 400
+    body = client.post('/login', json={'email': 'ann@example.com', 'password': 'pw'}).get_json()
+    assert body['user_type'] == 'customer'
+    assert client.get('/customer_dashboard').get_json()['user_name'] == 'Ann'
+    assert client.post('/forgot_password', json={'email': 'nobody@example.com'}).status_code == 404
+
+    admin = client_for(is_admin=True)
+    assert admin.post('/admin/register_coach', data={
+        'email': 'coach@example.com', 'password': 'pw', 'coach_name': 'Cole', 'specialization': 'Yoga',
+        'profile_pic_url': 'http://pic', 'services': ['plans']}).status_code == 200
+    uid = store.auth.get_user_by_email('coach@example.com').uid
+    assert admin.get('/admin/get_coach/coach@example.com').get_json()['uid'] == uid
+    assert not resources.firebase_app.loaded
@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import joblib
+import numpy as np
+import pandas as pd
+
+# train.py and preprocess.py are scripts with flat imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import train
+from preprocess import clean_bmi_data, normalize_nutrition_data, clean_workouts_data, combine_features, \
+    iter_feature_chunks
+
+def write_dataset(directory, n_rows=240):
+    """Small bmi/nutrition/workouts CSVs with missing values and unit strings"""
+    rng = np.random.default_rng(3)
+    bmi = pd.DataFrame({
+        'Age': rng.integers(18, 70, n_rows),
+        'Height': rng.normal(1.7, 0.1, n_rows).round(2),
+        'Weight': rng.normal(75, 15, n_rows).round(1)
+    })
+    bmi.loc[::17, 'Weight'] = np.nan  # dropped by clean_bmi_data, shifting the alignment
+    nutrition = pd.DataFrame({
+        'calories': rng.integers(50, 900, n_rows),
+        'total_fat': [f'{value:.1f}g' for value in rng.uniform(0, 40, n_rows)],
+        'cholesterol': ['0mg'] * n_rows,
+        'sodium': [f'{value}mg' for value in rng.integers(0, 900, n_rows)],
+        'fiber': [f'{value:.1f} g' for value in rng.uniform(0, 10, n_rows)],
+        'protein': rng.uniform(0, 60, n_rows).round(1),
+        'carbohydrate': [f'{value:.1f}g' for value in rng.uniform(0, 90, n_rows)]
+    })
+    nutrition.loc[::11, 'protein'] = np.nan  # filled with the column mean
+    workouts = pd.DataFrame({
+        'Title': [f'Exercise {i}' for i in range(n_rows)],
+        'Type': rng.choice(['Strength', 'Cardio', 'Stretching', 'Plyometrics'], n_rows),
+        'Equipment': rng.choice(['Bands', 'Barbell', None], n_rows),
+        'Level': rng.choice(['Beginner', 'Intermediate', 'Advanced'], n_rows),
+        'Rating': rng.choice([np.nan, 5.0, 7.5, 9.1], n_rows)
+    })
+    workouts.loc[:40, 'Type'] = 'Strength'  # early chunks miss some types
+    paths = tuple(os.path.join(directory, name) for name in ('bmi.csv', 'nutrition.csv', 'workouts.csv'))
+    for frame, path in zip((bmi, nutrition, workouts), paths):
+        frame.to_csv(path, index=False)
+    return paths
+
+def full_features(paths):
+    """Features as preprocess_data builds them from whole tables"""
+    bmi_path, nutrition_path, workouts_path = paths
+    return combine_features(clean_bmi_data(pd.read_csv(bmi_path)),
+                            normalize_nutrition_data(pd.read_csv(nutrition_path)),
+                            clean_workouts_data(pd.read_csv(workouts_path)))
+
+def test_feature_chunks_match_full_tables(tmp_path):
+    """Streamed chunks, aligned and filled with global means, equal the in-memory features"""
+    paths = write_dataset(tmp_path)
+    chunks = list(iter_feature_chunks(*paths, chunksize=37))
+    streamed = pd.concat(chunks, ignore_index=True)
+
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(streamed.fillna(streamed.mean()), full_features(paths))
+
+def test_streaming_training_writes_matching_artifacts(tmp_path):
+    """Streaming mode writes the usual artifacts with statistics equal to in-memory ones"""
+    paths = write_dataset(tmp_path)
+    model_dir = str(tmp_path / 'models')
+
+    kmeans, scaler, silhouette = train.train_model_streaming(
+        n_clusters=4, chunksize=37, epochs=2, batch_size=16, data_paths=paths, model_dir=model_dir)
+
+    features = full_features(paths)
+    scaled = scaler.transform(features)
+    assert np.allclose(scaler.mean_, features.mean().values)
+    assert np.allclose(scaled.std(axis=0)[scaled.std(axis=0) > 0], 1)
+
+    model = joblib.load(os.path.join(model_dir, 'model.pkl'))
+    labels = model.predict(scaled)
+    with open(os.path.join(model_dir, 'cluster_analysis.json')) as f:
+        analysis = json.load(f)
+    for i in range(4):
+        members = scaled[labels == i]
+        metrics = analysis[str(i)]['metrics']
+        assert analysis[str(i)]['size'] == len(members)
+        assert np.allclose(metrics['mean'], members.mean(axis=0))
+        assert np.allclose(metrics['std_dev'], members.std(axis=0))
+        assert np.allclose(metrics['median'], np.median(members, axis=0))
+
+    with open(os.path.join(model_dir, 'model_summary.json')) as f:
+        summary = json.load(f)
+    assert summary['total_samples'] == len(features)
+    assert np.isclose(summary['silhouette_score'], train.silhouette_estimate(scaled, labels, None)['score'])
+    assert np.isclose(summary['inertia'], ((scaled - model.cluster_centers_[labels]) ** 2).sum())
+    assert os.listdir(os.path.join(model_dir, 'registry'))
@@ -0,0 +1,85 @@
+import os
+import sys
+import csv
+import json
+import numpy as np
+
+# train.py is a script with flat imports (from preprocess import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import train
+
+def test_sweep_reports_every_k_and_seed(tmp_path):
+    """The sweep fits each (k, seed) pair and writes matching JSON and CSV reports"""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(scale=8, size=(4, 5))
+    features = np.vstack([center + rng.normal(size=(50, 5)) for center in centers])
+    report_path = str(tmp_path / 'sweep')
+
+    report = train.sweep_clusters(features, [2, 4, 6], seeds=(1, 2), n_init=2, max_workers=2,
+                                  report_path=report_path)
+
+    assert [(run['n_clusters'], run['seed']) for run in report['runs']] == \
+        [(2, 1), (2, 2), (4, 1), (4, 2), (6, 1), (6, 2)]
+    assert report['best_k'] == 4
+    assert report['summary']['4']['runs'] == 2
+
+    with open(f'{report_path}.json') as f:
+        assert json.load(f)['best_k'] == 4
+    with open(f'{report_path}.csv') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 6
+    assert float(rows[2]['silhouette']) == report['runs'][2]['silhouette']
+
+def test_parse_k_range():
+    """k ranges accept a single value, a span and an optional step"""
+    assert train.parse_k_range('25') == [25]
+    assert train.parse_k_range('10-13') == [10, 11, 12, 13]
+    assert train.parse_k_range('10-40:10') == [10, 20, 30, 40]
+
+def test_silhouette_estimate_exact_matches_sklearn():
+    """Without sampling the chunked estimator equals sklearn's silhouette_score"""
+    from sklearn.metrics import silhouette_score
+    rng = np.random.default_rng(1)
+    features = rng.normal(size=(300, 4))
+    labels = rng.integers(0, 5, size=300)
+    labels[0] = 7  # a singleton cluster scores 0
+
+    stats = train.silhouette_estimate(features, labels, sample_size=None, chunk_size=64)
+
+    assert stats['exact'] and stats['sample_size'] == 300
+    assert stats['ci_low'] == stats['ci_high'] == stats['score']
+    assert np.isclose(stats['score'], silhouette_score(features, labels))
+
+def test_silhouette_estimate_sampled_interval_covers_exact():
+    """A sampled estimate reports a confidence interval around the exact score"""
+    from sklearn.metrics import silhouette_score
+    rng = np.random.default_rng(2)
+    centers = rng.normal(scale=4, size=(3, 4))
+    features = np.vstack([center + rng.normal(size=(400, 4)) for center in centers])
+    labels = np.repeat(np.arange(3), 400)
+
+    stats = train.silhouette_estimate(features, labels, sample_size=300, chunk_size=100, confidence=0.99)
+
+    assert not stats['exact'] and stats['sample_size'] == 300
+    assert stats['ci_low'] < stats['score'] < stats['ci_high']
+    assert stats['ci_low'] <= silhouette_score(features, labels) <= stats['ci_high']
+
+def test_cluster_statistics_match_per_cluster_masks():
+    """Grouped statistics equal the per-cluster mask computations, empty clusters included"""
+    rng = np.random.default_rng(5)
+    features = rng.normal(size=(500, 6))
+    labels = rng.integers(0, 7, size=500)
+    labels[labels == 3] = 4  # cluster 3 is empty
+    centers = rng.normal(size=(7, 6))
+
+    stats = train.cluster_statistics(features, labels, centers)
+
+    assert len(stats) == 7
+    assert stats[3]['size'] == 0 and np.isnan(stats[3]['compactness'])
+    for i in (0, 1, 2, 4, 5, 6):
+        members = features[labels == i]
+        assert stats[i]['size'] == len(members)
+        assert np.allclose(stats[i]['mean'], members.mean(axis=0))
+        assert np.allclose(stats[i]['std_dev'], members.std(axis=0))
+        assert np.array_equal(stats[i]['median'], np.median(members, axis=0))
+        assert np.isclose(stats[i]['compactness'], np.linalg.norm(members - centers[i], axis=1).mean())
@@ -0,0 +1,73 @@
+import time
+import threading
+from src.storage import MemoryStore, MemoryBatch
+from src.write_behind import WriteBehindQueue
+
+class ControlledStore(MemoryStore):
+    """MemoryStore whose batch commits can be failed or held back"""
+
+    def __init__(self, failures=0):
+        super().__init__()
+        self.failures = failures
+        self.commits = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def batch(self):
+        store = self
+
+        class Batch(MemoryBatch):
+            def commit(self):
+                store.release.wait()
+                if store.failures:
+                    store.failures -= 1
+                    raise RuntimeError('unavailable')
+                store.commits.append(len(self.writes))
+                return super().commit()
+        return Batch(self)
+
+def test_queued_plans_are_written_in_batches():
+    """Queued documents land in batches of at most batch_size and close() drains the rest"""
+    store = ControlledStore()
+    store.release.clear()  # hold the first commit so the queue fills up
+    writer = WriteBehindQueue(store, batch_size=10, flush_interval=0.01)
+    for i in range(25):
+        assert writer.put(store.plans, f'plan-{i}', {'n': i})
+    store.release.set()
+    writer.close()
+    assert len(store.plans.docs) == 25 and writer.written == 25
+    assert max(store.commits) <= 10 and sum(store.commits) == 25
+    assert not writer.put(store.plans, 'late', {'n': 0})
+
+def test_failed_batches_are_retried():
+    """A batch that fails is retried with backoff, then dropped after max_retries"""
+    store = ControlledStore(failures=2)
+    writer = WriteBehindQueue(store, retry_delay=0)
+    writer.put(store.plans, 'plan-1', {'n': 1})
+    assert writer.flush(timeout=5)
+    assert store.plans.get('plan-1') == {'n': 1}
+
+    store.failures = 10
+    writer.max_retries = 1
+    writer.put(store.plans, 'plan-2', {'n': 2})
+    assert writer.flush(timeout=5)
+    assert store.plans.get('plan-2') is None and writer.failed == 1
+    writer.close()
+
+def test_full_queue_pushes_back_and_wait_sees_pending_writes():
+    """put() gives up after put_timeout when the store falls behind; wait() blocks until the write lands"""
+    store = ControlledStore()
+    store.release.clear()
+    writer = WriteBehindQueue(store, maxsize=2, batch_size=1, put_timeout=0.05)
+    assert writer.put(store.plans, 'plan-0', {'n': 0})
+    deadline = time.monotonic() + 5
+    while not writer._queue.empty() and time.monotonic() < deadline:  # the worker picks plan-0 up
+        time.sleep(0.001)
+    results = [writer.put(store.plans, f'plan-{i}', {'n': i}) for i in range(1, 5)]
+    assert results == [True, True, False, False]  # plan-0 in the worker, two queued
+    assert not writer.wait(store.plans, 'plan-0', timeout=0.01)
+    assert writer.wait(store.plans, 'plan-4', timeout=0.01)  # not queued, nothing to wait for
+    store.release.set()
+    assert writer.wait(store.plans, 'plan-2', timeout=5)
+    assert store.plans.get('plan-2') == {'n': 2}
+    writer.close()
@@ -2,12 +2,8 @@ import { NextRequest, NextResponse } from 'next/server';
 import { adminDb } from '@/lib/firebase-admin';
 import { getSession } from '@/lib/session';
 import { predictCluster, UserFeatures } from '@/lib/ml/predict';
-import { generateWorkoutPlan, initializeWorkoutsData } from '@/lib/workout-generator';
+import { generateWorkoutPlan, loadWorkouts } from '@/lib/workout-generator';
 import { generateNutritionPlan } from '@/lib/nutrition-generator';
-import workoutsData from '@/data/workouts.json';
-
-// Initialize workouts data
-initializeWorkoutsData(workoutsData);
 
 export async function POST(request: NextRequest) {
     try {
@@ -43,8 +39,9 @@ export async function POST(request: NextRequest) {
         // Predict cluster using ML model
         const prediction = predictCluster(features);
 
-        // Generate workout plan
-        const workoutPlan = generateWorkoutPlan(processedData);
+        // Generate workout plan from the shard for the user's equipment and level
+        const workouts = await loadWorkouts(processedData);
+        const workoutPlan = generateWorkoutPlan(processedData, workouts);
 
         // Generate nutrition plan
         const nutritionPlan = generateNutritionPlan(processedData);
@@ -9,9 +9,20 @@ const scaler = new StandardScaler(
     modelData.scaler.feature_names
 );
 
+/**
+ * Decode centers exported as base64 little-endian float32 (backend/src/frontend_export.py)
+ */
+function unpackCenters(packed: string, nClusters: number, nFeatures: number): number[][] {
+    const bytes = Uint8Array.from(atob(packed), (char) => char.charCodeAt(0));
+    const view = new DataView(bytes.buffer);
+    return Array.from({ length: nClusters }, (_, i) =>
+        Array.from({ length: nFeatures }, (_, j) => view.getFloat32((i * nFeatures + j) * 4, true))
+    );
+}
+
 // Initialize K-Means predictor with cluster centers
 const kmeansPredictor = new KMeansPredictor(
-    modelData.cluster_centers,
+    unpackCenters(modelData.cluster_centers_f32, modelData.n_clusters, modelData.n_features),
     modelData.n_clusters
 );
 
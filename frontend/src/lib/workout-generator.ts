@@ -43,17 +43,47 @@ const LEVEL_MAP: { [key: number]: string } = {
     3: 'Expert',
 };
 
-// Load workout data (will be replaced with actual JSON data)
-let workoutsData: any[] = [];
+// Workout rows are exported by backend/convert_workouts.py as one shard per
+// equipment and level (src/data/workouts/<equipment>--<level>.json), so a plan
+// only loads the rows it can use. Loaded shards are kept for later requests.
+const shardCache = new Map<string, Promise<any[]>>();
 
-export function initializeWorkoutsData(data: any[]) {
-    workoutsData = data;
+function slug(value: string): string {
+    return value.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '');
 }
 
-export function generateWorkoutPlan(userInfo: UserInfo): { [key: string]: DayWorkout } {
+/**
+ * Shard name for an equipment/level pair; matches shard_name in backend/src/frontend_export.py
+ */
+export function shardName(equipment: string, level: string): string {
+    return `${slug(equipment)}--${slug(level)}`;
+}
+
+function resolveEquipmentLevel(userInfo: UserInfo): { equipment: string; level: string } {
+    return {
+        equipment: EQUIPMENT_MAP[userInfo.equipment.toLowerCase()] || 'Body Only',
+        level: LEVEL_MAP[parseInt(userInfo.fitness_level.toString())] || 'Intermediate',
+    };
+}
+
+/**
+ * Load the workout shard for the user's equipment and fitness level
+ */
+export function loadWorkouts(userInfo: UserInfo): Promise<any[]> {
+    const { equipment, level } = resolveEquipmentLevel(userInfo);
+    const name = shardName(equipment, level);
+    let shard = shardCache.get(name);
+    if (!shard) {
+        shard = import(`@/data/workouts/${name}.json`).then((module) => module.default as any[]);
+        shard.catch(() => shardCache.delete(name));
+        shardCache.set(name, shard);
+    }
+    return shard;
+}
+
+export function generateWorkoutPlan(userInfo: UserInfo, workoutsData: any[]): { [key: string]: DayWorkout } {
     try {
-        const equipment = EQUIPMENT_MAP[userInfo.equipment.toLowerCase()] || 'Body Only';
-        const level = LEVEL_MAP[parseInt(userInfo.fitness_level.toString())] || 'Intermediate';
+        const { equipment, level } = resolveEquipmentLevel(userInfo);
         const daysPerWeek = parseInt(userInfo.days_per_week.toString()) || 5;
         const fitnessLevel = parseInt(userInfo.fitness_level.toString()) || 2;
 